@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+from typing import Iterable
+
+from .models import ArticleRecord
+from .utils import logger
+
+AGGREGATES_FILE = "aggregates.json"
+
+_FUND_SPLIT = re.compile(r"[“\"「《(（]")
+
+
+def fund_agency(fund: str) -> str:
+    """从基金条目中提取资助类别，如 '国家社会科学基金重大项目"…"(项目编号:…)' -> '国家社会科学基金重大项目'。"""
+    agency = _FUND_SPLIT.split(fund, 1)[0].strip(" ;；,，。")
+    return agency or fund.strip()
+
+
+class Aggregates:
+    """随论文入库增量维护的预计算统计，持久化在导出目录中。
+
+    仅统计 detail_crawled=True 的论文。结构:
+    {
+      "total": 1234,
+      "articles": {"期刊": {"2025": {"栏目": 12}}},
+      "keywords": {"关键词": 5},
+      "institutions": {"单位": 3},
+      "fund_agencies": {"国家社会科学基金项目": 40},
+      "source": {"path": "/abs/crawl_progress.json", "mtime_ns": 1718000000000000000, "size": 123456}
+    }
+
+    source 为写入统计时进度文件的指纹（见 progress.progress_fingerprint）。与当前进度文件
+    不一致时（合并、手工编辑、不同进度文件共用同一导出目录、写盘中途中断）视为过期，需重新计算。
+    """
+
+    COUNTERS = ("keywords", "institutions", "fund_agencies")
+
+    def __init__(self, filepath: str = AGGREGATES_FILE):
+        self._filepath = filepath
+        self.total = 0
+        self.articles: dict[str, dict[str, Counter]] = {}
+        self.keywords: Counter = Counter()
+        self.institutions: Counter = Counter()
+        self.fund_agencies: Counter = Counter()
+        self.source: dict | None = None
+        self.loaded = self._load()
+
+    def _load(self) -> bool:
+        if not os.path.exists(self._filepath):
+            return False
+        try:
+            with open(self._filepath, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            logger.warning("统计文件损坏，将重新计算: %s", self._filepath)
+            return False
+        self.total = data.get("total", 0)
+        self.articles = {
+            journal: {year: Counter(columns) for year, columns in years.items()}
+            for journal, years in data.get("articles", {}).items()
+        }
+        for name in self.COUNTERS:
+            setattr(self, name, Counter(data.get(name, {})))
+        self.source = data.get("source")
+        return True
+
+    def matches(self, source: dict | None) -> bool:
+        """已加载的统计是否由指纹为 source 的进度文件产生。"""
+        return self.loaded and self.source == source
+
+    def save(self, data: dict | None = None, source: dict | None = None) -> None:
+        """原子写入统计文件。data 为事先取得的 to_dict() 快照（后台写入时使用），
+        source 为对应进度文件的指纹。
+        """
+        data = dict(data) if data is not None else self.to_dict()
+        self.source = data["source"] = source
+        dir_name = os.path.dirname(self._filepath) or "."
+        os.makedirs(dir_name, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._filepath)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def to_dict(self) -> dict:
+        """返回与内部计数表不共享可变对象的快照。"""
+        data: dict = {
+            "total": self.total,
+            "articles": {
+                journal: {year: dict(columns) for year, columns in years.items()}
+                for journal, years in self.articles.items()
+            },
+        }
+        for name in self.COUNTERS:
+            data[name] = dict(getattr(self, name))
+        return data
+
+    def add(self, record: ArticleRecord, sign: int = 1) -> None:
+        """计入（sign=-1 时扣除）一篇论文。"""
+        if not record.detail_crawled:
+            return
+        self.total += sign
+        columns = self.articles.setdefault(record.journal, {}).setdefault(record.year, Counter())
+        _bump(columns, (record.column,), sign)
+        _bump(self.keywords, set(record.keywords), sign)
+        _bump(self.institutions, set(record.institutions), sign)
+        _bump(self.fund_agencies, {fund_agency(f) for f in record.funds}, sign)
+
+    def replace(self, old: ArticleRecord | None, new: ArticleRecord) -> None:
+        """论文记录被覆盖时：扣除旧记录，计入新记录。"""
+        if old is not None:
+            self.add(old, sign=-1)
+        self.add(new)
+
+    def top(self, name: str, n: int = 20) -> list[tuple[str, int]]:
+        """取某个计数表（keywords / institutions / fund_agencies）的前 n 项。"""
+        return getattr(self, name).most_common(n)
+
+    def rebuild(self, records: Iterable[ArticleRecord]) -> None:
+        """从全部论文记录重新计算。"""
+        self.total = 0
+        self.articles = {}
+        for name in self.COUNTERS:
+            setattr(self, name, Counter())
+        for record in records:
+            self.add(record)
+
+
+def _bump(counter: Counter, keys: Iterable[str], sign: int) -> None:
+    for key in keys:
+        counter[key] += sign
+        if counter[key] <= 0:
+            del counter[key]
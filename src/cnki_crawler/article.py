@@ -1,43 +1,91 @@
 from __future__ import annotations
 
 import re
+from typing import Iterable
 
 from bs4 import BeautifulSoup, Tag
+from bs4.element import NavigableString, PreformattedString
 
 from .models import Article
 from .utils import logger
 
+DETAIL_FIELDS = ("title", "authors", "institutions", "abstract", "keywords", "funds", "clc_code")
 
-def parse_article_detail(html: str) -> dict:
-    """解析论文详情页 HTML，返回元信息字典。
 
-    返回的字段: title, authors, institutions, abstract, keywords, funds, clc_code
-    """
-    soup = BeautifulSoup(html, "lxml")
-    result: dict = {}
+def _class_attr(name: str) -> str:
+    return rf"""(?<![\w-])class\s*=\s*["'](?:[^"']*\s)?{name}(?:\s[^"']*)?["']"""
+
+
+def _id_attr(name: str) -> str:
+    return rf"""(?<![\w-])id\s*=\s*["']{name}["']"""
+
 
-    # 标题
-    result["title"] = _parse_title(soup)
+# 页面区域 -> (标签名, 起始标签特征)，标签名为 None 时匹配任意标签。
+# 解析前只截取所需区域的 HTML 片段
+_REGIONS = {
+    "header": ("div", _class_attr("wx-tit")),
+    # CNKI 当前为 <p id="ChDivSummary">，旧版为 <span>，按 id 匹配
+    "abstract": (None, _id_attr("ChDivSummary")),
+    "keywords": ("p", _class_attr("keywords")),
+    "funds": ("p", _class_attr("funds")),
+    "clc_code": ("p", _class_attr("clc-code")),
+}
+_FIELD_REGIONS = {
+    "title": "header",
+    "authors": "header",
+    "institutions": "header",
+    "abstract": "abstract",
+    "keywords": "keywords",
+    "funds": "funds",
+    "clc_code": "clc_code",
+}
 
-    # 作者
-    result["authors"] = _parse_authors(soup)
 
-    # 单位
-    result["institutions"] = _parse_institutions(soup)
+def parse_article_detail(html: str, fields: Iterable[str] | None = None) -> dict:
+    """解析论文详情页 HTML，返回元信息字典。
+
+    返回的字段: title, authors, institutions, abstract, keywords, funds, clc_code；
+    指定 fields 时只解析并返回其中的字段。
+
+    先用正则从原始 HTML 中截取所需区域（wx-tit 标题区、摘要、关键词、基金、分类号）
+    再建树，解析开销取决于所需字段而非页面大小。基金、关键词等区域缺失时对应字段为空；
+    只有 wx-tit 标题区缺失（页面结构变化）时退回整页解析。
+    """
+    fields = DETAIL_FIELDS if fields is None else tuple(fields)
+    unknown = set(fields) - set(DETAIL_FIELDS)
+    if unknown:
+        raise ValueError(f"未知字段: {sorted(unknown)}")
+
+    fragments = []
+    for region in dict.fromkeys(_FIELD_REGIONS[f] for f in fields):
+        fragment = _slice_element(html, *_REGIONS[region])
+        if fragment is not None:
+            fragments.append(fragment)
+        elif region == "header" or _find_open_tag(html, *_REGIONS["header"]) is None:
+            logger.debug("详情页未找到 wx-tit 标题区，整页解析")
+            fragments = [html]
+            break
 
-    # 摘要
-    result["abstract"] = _parse_abstract(soup)
+    soup = BeautifulSoup("".join(fragments), "lxml")
+    return {field: _PARSERS[field](soup) for field in fields}
 
-    # 关键词
-    result["keywords"] = _parse_keywords(soup)
 
-    # 基金
-    result["funds"] = _parse_funds(soup)
+def _find_open_tag(html: str, tag: str | None, open_pattern: str) -> re.Match | None:
+    return re.search(rf"<({tag or '[a-z][a-z0-9]*'})\b[^>]*{open_pattern}[^>]*>", html, re.I)
 
-    # 分类号
-    result["clc_code"] = _parse_clc_code(soup)
 
-    return result
+def _slice_element(html: str, tag: str | None, open_pattern: str) -> str | None:
+    """截取首个匹配的元素（含同名标签嵌套）的完整 HTML，未找到时返回 None。"""
+    start = _find_open_tag(html, tag, open_pattern)
+    if not start:
+        return None
+    tag = start.group(1)
+    depth = 1
+    for m in re.compile(rf"<(/?){tag}\b[^>]*>", re.I).finditer(html, start.end()):
+        depth += -1 if m.group(1) else 1
+        if depth == 0:
+            return html[start.start():m.end()]
+    return html[start.start():]
 
 
 def _parse_title(soup: BeautifulSoup) -> str:
@@ -62,7 +110,8 @@ def _parse_authors(soup: BeautifulSoup) -> list[str]:
         # 作者名在 <a> 的直接文本中，<sup> 是单位编号
         name_parts = []
         for child in a.children:
-            if isinstance(child, str):
+            # 只取文本节点；注释等 PreformattedString 不是可见文本（与 EXTRACT_JS 的 TEXT_NODE 一致）
+            if isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
                 name_parts.append(child.strip())
             elif isinstance(child, Tag) and child.name == "sup":
                 break  # sup 之后不再有姓名
@@ -86,7 +135,7 @@ def _parse_institutions(soup: BeautifulSoup) -> list[str]:
         for a in h3.find_all("a"):
             text = a.get_text(strip=True)
             # 去掉开头的编号（如 "1." "2."）
-            text = re.sub(r"^\d+\.\s*", "", text)
+            text = re.sub(r"^[0-9]+\.\s*", "", text)
             if text:
                 institutions.append(text)
         if institutions:
@@ -137,3 +186,115 @@ def _parse_clc_code(soup: BeautifulSoup) -> str:
     if clc:
         return clc.get_text(strip=True)
     return ""
+
+
+# 页内提取脚本：在浏览器中按与上方解析函数相同的规则读取 DOM，返回 JSON 字符串
+# {"captcha": bool, "complete": bool, "detail": {与 parse_article_detail 相同的字段}}。
+# 参数: arguments[0] 为验证码 URL 特征，arguments[1] 为验证码 HTML 特征。
+# text() 对应 BeautifulSoup 的 get_text(strip=True)：逐个文本节点去除首尾空白后拼接，跳过脚本与样式。
+EXTRACT_JS = r"""
+const urlTokens = arguments[0];
+const htmlTokens = arguments[1];
+const href = location.href;
+if (urlTokens.some(t => href.includes(t))) {
+    return JSON.stringify({captcha: true, complete: false, detail: null});
+}
+const source = document.documentElement.outerHTML;
+if (htmlTokens.some(t => source.includes(t))) {
+    return JSON.stringify({captcha: true, complete: false, detail: null});
+}
+
+const HIDDEN = /display\s*:\s*none/;
+const text = (el, skip) => {
+    if (!el) return '';
+    const parts = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        const node = walker.currentNode;
+        const parent = node.parentElement;
+        if (parent && (parent.closest('script, style') || (skip && skip(parent)))) continue;
+        const t = node.nodeValue.trim();
+        if (t) parts.push(t);
+    }
+    return parts.join('');
+};
+const stripSep = s => s.replace(/[;；]+$/, '').trim();
+
+const wxTit = document.querySelector('div.wx-tit');
+const h1 = wxTit ? wxTit.querySelector('h1') : null;
+const title = text(h1, el => {
+    for (let e = el; e && e !== h1; e = e.parentElement) {
+        if (e.tagName === 'SPAN' && HIDDEN.test(e.getAttribute('style') || '')) return true;
+    }
+    return false;
+});
+
+const authors = [];
+const authorPart = document.querySelector('h3#authorpart');
+if (authorPart) {
+    for (const a of authorPart.querySelectorAll('a')) {
+        const nameParts = [];
+        for (const child of a.childNodes) {
+            if (child.nodeType === Node.TEXT_NODE) nameParts.push(child.nodeValue.trim());
+            else if (child.nodeType === Node.ELEMENT_NODE && child.tagName === 'SUP') break;
+        }
+        const name = nameParts.join('').trim();
+        if (name) authors.push(name);
+    }
+}
+
+let institutions = [];
+if (wxTit) {
+    for (const h3 of wxTit.querySelectorAll('h3.author')) {
+        if (h3.id === 'authorpart') continue;
+        const found = [];
+        for (const a of h3.querySelectorAll('a')) {
+            const t = text(a).replace(/^\d+\.\s*/, '');
+            if (t) found.push(t);
+        }
+        if (found.length) { institutions = found; break; }
+    }
+}
+
+const listOf = p => {
+    const items = [];
+    if (!p) return items;
+    for (const a of p.querySelectorAll('a')) {
+        const t = stripSep(text(a));
+        if (t) items.push(t);
+    }
+    return items;
+};
+const fundsP = document.querySelector('p.funds');
+let funds = listOf(fundsP);
+if (fundsP && !funds.length) {
+    const t = text(fundsP);
+    if (t) funds = t.split(/[;；]/).map(f => f.trim()).filter(f => f);
+}
+
+const summary = document.getElementById('ChDivSummary');
+return JSON.stringify({
+    captcha: false,
+    complete: !!(wxTit && summary),
+    detail: {
+        title: title,
+        authors: authors,
+        institutions: institutions,
+        abstract: text(summary),
+        keywords: listOf(document.querySelector('p.keywords')),
+        funds: funds,
+        clc_code: text(document.querySelector('p.clc-code')),
+    },
+});
+"""
+
+
+_PARSERS = {
+    "title": _parse_title,
+    "authors": _parse_authors,
+    "institutions": _parse_institutions,
+    "abstract": _parse_abstract,
+    "keywords": _parse_keywords,
+    "funds": _parse_funds,
+    "clc_code": _parse_clc_code,
+}
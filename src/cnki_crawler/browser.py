@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import json
 import os
 import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urlencode
 
 from DrissionPage import Chromium, ChromiumOptions
 
-from .utils import logger
+from .article import EXTRACT_JS
+from .intercept import DEFAULT_PROFILE, RESOURCE_BUFFER_JS, RESOURCE_TIMING_JS, InterceptProfile, TrafficStats
+from .proxy import ProxyPool
+from .session import SessionStore, portable_cookies
+from .utils import logger, random_delay
 
 CAPTCHA_URL_INDICATORS = ("/verify/", "captchaType")
 CAPTCHA_HTML_INDICATORS = (
@@ -18,19 +25,143 @@ CAPTCHA_HTML_INDICATORS = (
     "clickWord",
     "verify/home",
 )
-BLOCKED_URLS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm", "*.mp3"]
 
+# 资源回收默认阈值：标签页加载页面数、浏览器进程树内存、单次标签页操作硬时限
+RECYCLE_PAGES = 500
+MAX_RSS_MB = 2048
+OP_DEADLINE = 120.0
+RSS_CHECK_EVERY = 20
+
+# 页面加载策略：normal 等待全部资源；eager 等待 DOMContentLoaded；none 不等待，仅等元信息区出现
+LOAD_MODES = ("normal", "eager", "none")
+METADATA_READY_LOCATOR = "css:.wx-tit h1"
+METADATA_READY_TIMEOUT = 10.0
+# 完整性检查：缺少任一标记时等待页面加载完成后重读一次
+METADATA_REQUIRED_MARKERS = ("wx-tit", "ChDivSummary")
+# 详情提取方式：html 回传整页 HTML 由 Python 解析；js 在页面内提取字段只回传 JSON
+EXTRACT_MODES = ("html", "js")
+# 绑定代理预算用尽时，预计等待超过该秒数则改绑其他代理
+PROXY_REASSIGN_WAIT = 60.0
 
-class CnkiBrowser:
-    """基于 DrissionPage 的 CNKI 浏览器管理器。"""
 
-    def __init__(self, headless: bool = False, port: int | None = None):
+class CnkiBrowser:
+    """基于 DrissionPage 的 CNKI 浏览器管理器。
+
+    prefetch=True 时启用双缓冲预加载：额外开一个后台标签页，在处理当前论文的同时
+    加载下一篇；取用时交换前后台标签页，把页面加载时间隐藏在解析与保存之后。
+
+    escalate_captcha=True（仅无头模式有效）时，遇到验证码不再直接报错，而是把当前
+    URL 与 Cookie 交给临时启动的有头 Chromium，由人工完成验证后将通过验证的 Cookie
+    注入回无头浏览器并重新加载页面。
+
+    长时间运行时自动回收资源：标签页累计加载 recycle_pages 个页面后换新标签页；
+    浏览器进程树内存超过 max_rss_mb（需安装 psutil）时重启 Chromium 并迁移 Cookie
+    （接管模式下只换标签页）。导航与 JS 调用超过 op_deadline 秒未返回视为卡死，
+    替换该标签页并抛出 TimeoutError。
+
+    load_mode 控制详情页加载策略（见 LOAD_MODES）。元信息由服务端渲染，eager/none 模式下
+    不必等第三方脚本加载完毕：先等待标题元素出现即读取 HTML，缺少必需区域时再等待页面
+    加载完成并重读一次，避免产生不完整的记录。
+
+    传入 proxy_pool 时（仅自启动模式），以 worker_id 从代理池取得固定代理，逐次上报
+    延迟、失败与验证码；代理被隔离或预算用尽时换绑代理并重启浏览器（迁移 Cookie）。
+
+    每次导航后只通过 CDP 读取一次页面快照（URL + HTML），验证码检测与解析共用，
+    导航、换标签页或等待页面变化后失效。cdp_stats 记录快照次数、复用次数与传输字节数。
+    extract="js" 时调用方改用 extract_article()：在页面内完成提取，只回传字段 JSON
+    （cdp_stats["extractions"] 计数）。
+
+    intercept 为请求拦截配置（见 intercept.py），按主机屏蔽图片、样式表、统计脚本等资源类别，
+    腾讯验证码主机始终放行；屏蔽了验证码页依赖的资源时，人工验证前临时解除屏蔽。
+    traffic_stats=True 时在每个页面离开前读取 Resource Timing 记录，按域名与资源类型累计
+    请求数与字节数，并按导航记录累计各页面的响应、DOMContentLoaded 与 load 耗时，
+    关闭时输出汇总，用于比较不同拦截配置的带宽与加载时间开销。
+
+    指定 session_file 时（默认不启用），自启动模式下关闭时把 Cookie 与 localStorage 加密保存到
+    该文件，下次启动时恢复未过期的部分，免去重新领取 Ecp_ClientId 等客户端标识与预热。
+    快照密钥无效或无法创建时只记录警告，不做快照。
+    """
+
+    def __init__(
+        self,
+        headless: bool = False,
+        port: int | None = None,
+        prefetch: bool = False,
+        escalate_captcha: bool = False,
+        recycle_pages: int | None = RECYCLE_PAGES,
+        max_rss_mb: int | None = MAX_RSS_MB,
+        op_deadline: float | None = OP_DEADLINE,
+        session_file: str | None = None,
+        load_mode: str = "eager",
+        proxy_pool: ProxyPool | None = None,
+        worker_id: str = "main",
+        extract: str = "html",
+        intercept: InterceptProfile | None = None,
+        traffic_stats: bool = False,
+    ):
+        if load_mode not in LOAD_MODES:
+            raise ValueError(f"未知加载策略: {load_mode}")
+        if extract not in EXTRACT_MODES:
+            raise ValueError(f"未知提取方式: {extract}")
+        self._load_mode = load_mode
+        self.extract_mode = extract
         self._closed = False
         self._port_mode = port is not None
         self._headless = headless and port is None
+        self._proxy_pool = None if self._port_mode else proxy_pool
+        self._worker_id = worker_id
+        if self._proxy_pool is not None:
+            self._proxy = self._proxy_pool.acquire(worker_id)
+            if self._proxy is None:
+                raise RuntimeError("代理池中没有可用代理")
+        else:
+            if proxy_pool is not None:
+                logger.warning("接管模式下忽略代理池")
+            self._proxy = None if self._port_mode else _env_proxy()
+        self._user_agent: str | None = None
+        self._intercept = intercept or InterceptProfile.load(DEFAULT_PROFILE)
+        self.traffic: TrafficStats | None = TrafficStats() if traffic_stats else None
+        self._dom: tuple[str, str] | None = None
+        self.cdp_stats: Counter = Counter()
         self._browser = self._create_browser(headless=headless, port=port)
         self._tab = self._create_tab()
-        self._configure_tab()
+        self._configure_tab(self._tab)
+
+        self._recycle_pages = recycle_pages
+        self._max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb and _has_psutil() else None
+        if max_rss_mb and self._max_rss is None:
+            logger.info("未安装 psutil，不按内存占用回收浏览器")
+        self._op_deadline = op_deadline
+        self._op_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser-op")
+        self._page_loads = 0
+
+        self._escalate = escalate_captcha and self._headless
+        if self._escalate:
+            self._user_agent = self._mask_headless_ua()
+            logger.info("已启用验证码转交：无头模式遇到验证码时弹出有头浏览器")
+
+        # 接管模式使用用户自己的浏览器配置，不做快照
+        self._session: SessionStore | None = None
+        if session_file and not self._port_mode:
+            try:
+                self._session = SessionStore(session_file)
+            except (OSError, ValueError) as e:
+                # 密钥格式错误（Fernet 抛 ValueError）或密钥文件无法创建：不做快照，继续启动
+                logger.warning("会话快照不可用，本次不保存也不恢复: %s", e)
+            else:
+                try:
+                    self._session.restore(self._tab)
+                except Exception as e:
+                    logger.warning("恢复浏览器会话快照失败: %s", e)
+
+        self._prefetch_tab = None
+        self._prefetch_url: str | None = None
+        self._prefetch_future: Future | None = None
+        self._prefetch_executor: ThreadPoolExecutor | None = None
+        if prefetch:
+            self._prefetch_tab = self._new_tab()
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+            logger.info("已启用预加载模式")
 
     def _create_browser(self, headless: bool, port: int | None) -> Chromium:
         opts = ChromiumOptions(read_file=False)
@@ -45,17 +176,9 @@ class CnkiBrowser:
                 logger.warning("接管模式下忽略 --headless 参数")
         else:
             opts.auto_port()
-            proxy = (
-                os.environ.get("https_proxy")
-                or os.environ.get("HTTPS_PROXY")
-                or os.environ.get("all_proxy")
-                or os.environ.get("ALL_PROXY")
-                or os.environ.get("http_proxy")
-                or os.environ.get("HTTP_PROXY")
-            )
-            if proxy:
-                opts.set_proxy(proxy)
-                logger.info("自启动模式启用代理: %s", proxy)
+            if self._proxy:
+                opts.set_proxy(self._proxy)
+                logger.info("自启动模式启用代理: %s", self._proxy)
             if headless:
                 opts.headless(True)
                 logger.info("自启动模式：无头运行")
@@ -72,12 +195,60 @@ class CnkiBrowser:
         except Exception:
             return self._browser.new_tab()
 
-    def _configure_tab(self) -> None:
+    def _new_tab(self):
+        tab = self._browser.new_tab()
+        self._configure_tab(tab)
+        return tab
+
+    def _discard_tab(self, tab) -> None:
+        """通过浏览器级连接关闭标签页（卡死的标签页自身的连接可能已无响应）。"""
         try:
-            self._tab.set.blocked_urls(BLOCKED_URLS)
+            self._browser.close_tabs(tab.tab_id)
+        except Exception as e:
+            logger.debug("关闭旧标签页失败: %s", e)
+
+    def _configure_tab(self, tab) -> None:
+        self._apply_intercept(tab)
+        if self.traffic is not None:
+            try:
+                tab.run_cdp("Page.addScriptToEvaluateOnNewDocument", source=RESOURCE_BUFFER_JS)
+            except Exception as e:
+                logger.debug("设置资源计时缓冲区失败: %s", e)
+        if self._user_agent:
+            tab.set.user_agent(self._user_agent)
+        try:
+            getattr(tab.set.load_mode, self._load_mode)()
+        except Exception as e:
+            logger.debug("设置加载策略失败: %s", e)
+
+    def _apply_intercept(self, tab, enabled: bool = True) -> None:
+        try:
+            tab.set.blocked_urls(self._intercept.patterns if enabled and self._intercept.patterns else None)
         except Exception as e:
             logger.debug("设置资源屏蔽失败: %s", e)
 
+    def _account_traffic(self) -> None:
+        """读取并清空当前页面的资源计时记录，计入流量统计。"""
+        if self.traffic is None:
+            return
+        try:
+            raw = self._guarded(self._tab.run_js, RESOURCE_TIMING_JS)
+            data = json.loads(raw or "{}")
+            self.traffic.add(data.get("entries", []), data.get("timing"))
+        except Exception as e:
+            logger.debug("读取资源计时记录失败: %s", e)
+
+    def _mask_headless_ua(self) -> str | None:
+        """去掉 UA 中的 HeadlessChrome 标记，使无头与有头浏览器的 UA 一致（Cookie 可能与 UA 绑定）。"""
+        try:
+            ua = self._tab.run_js("return navigator.userAgent;") or ""
+        except Exception as e:
+            logger.debug("读取 UA 失败: %s", e)
+            return None
+        ua = ua.replace("HeadlessChrome", "Chrome")
+        self._tab.set.user_agent(ua)
+        return ua
+
     @staticmethod
     def _to_seconds(timeout_ms: int | None) -> float | None:
         if timeout_ms is None:
@@ -89,17 +260,170 @@ class CnkiBrowser:
             raise RuntimeError("浏览器已关闭")
 
     def _safe_html(self) -> str:
+        return self._snapshot()[1]
+
+    def _snapshot(self) -> tuple[str, str]:
+        """当前页面的 (URL, HTML)。同一页面只经 CDP 序列化一次 DOM，失效后重新读取。"""
+        if self._dom is not None:
+            self.cdp_stats["snapshot_hits"] += 1
+            return self._dom
+        tab = self._tab
+        try:
+            url = self._guarded(lambda: tab.url)
+        except Exception:
+            url = ""
         try:
-            return self._tab.html
+            html = self._guarded(lambda: tab.html)
         except Exception:
-            return ""
+            html = ""
+        self.cdp_stats["snapshots"] += 1
+        self.cdp_stats["html_bytes"] += len(html.encode("utf-8"))
+        self._dom = (url, html)
+        return self._dom
+
+    def _invalidate(self) -> None:
+        """页面已变化（导航、换标签页、等待加载），丢弃快照。"""
+        self._dom = None
+
+    # ── 资源回收与看门狗 ──
+
+    def _guarded(self, fn, *args, **kwargs):
+        """在工作线程中执行标签页操作；超过 op_deadline 视为卡死，替换标签页后抛出 TimeoutError。"""
+        if self._op_deadline is None:
+            return fn(*args, **kwargs)
+        future = self._op_executor.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self._op_deadline)
+        except TimeoutError:
+            logger.warning("标签页操作超过 %.0f 秒未返回，替换标签页", self._op_deadline)
+            # 卡住的工作线程无法中断，弃用旧执行器
+            self._op_executor.shutdown(wait=False, cancel_futures=True)
+            self._op_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser-op")
+            old, self._tab = self._tab, self._new_tab()
+            self._discard_tab(old)
+            self._invalidate()
+            raise TimeoutError(f"标签页操作超时（{self._op_deadline:.0f} 秒）") from None
+
+    def _before_page_load(self) -> None:
+        """每次加载新页面前调用：计数，并在超过阈值时回收标签页或重启浏览器。"""
+        self._account_traffic()
+        self._page_loads += 1
+        if self._proxy_pool is not None and self._check_proxy():
+            return
+        if self._max_rss and not self._port_mode and self._page_loads % RSS_CHECK_EVERY == 0:
+            rss = self._browser_rss()
+            if rss is not None and rss > self._max_rss:
+                logger.info("浏览器内存占用 %.0f MB 超过阈值，重启浏览器", rss / 1024 / 1024)
+                self._relaunch()
+                return
+        if self._recycle_pages and self._page_loads >= self._recycle_pages:
+            logger.info("标签页已加载 %d 个页面，更换标签页", self._page_loads)
+            self._recycle_tabs()
+
+    def _check_proxy(self) -> bool:
+        """绑定代理被隔离时换绑；预算用尽时换绑或等待。发生换绑（浏览器已重启）时返回 True。"""
+        pool = self._proxy_pool
+        if not pool.healthy(self._proxy):
+            self._switch_proxy(pool.acquire(self._worker_id))
+            return True
+        wait = pool.budget_wait(self._proxy)
+        if wait <= 0:
+            return False
+        other = pool.reassign(self._worker_id) if wait > PROXY_REASSIGN_WAIT else None
+        if other is not None:
+            self._switch_proxy(other)
+            return True
+        logger.info("代理 %s 请求预算已用尽，等待 %.0f 秒", self._proxy, wait)
+        time.sleep(wait)
+        return False
+
+    def _switch_proxy(self, proxy: str | None) -> None:
+        if proxy is None:
+            raise RuntimeError("代理池中没有可用代理")
+        if proxy == self._proxy:
+            return
+        logger.info("切换代理 %s -> %s", self._proxy, proxy)
+        self._proxy = proxy
+        self._relaunch()
+
+    def _record_proxy(self, latency: float | None = None, error: bool = False, requests: int = 1) -> None:
+        if self._proxy_pool is not None:
+            self._proxy_pool.record(self._proxy, latency=latency, error=error, requests=requests)
+
+    def _run_fetch(self, script: str, *args, requests: int = 1):
+        """执行发起 fetch 的脚本；启用代理池时上报延迟与失败，请求数计入代理预算。"""
+        started = time.monotonic()
+        try:
+            result = self._guarded(self._tab.run_js, script, *args)
+        except Exception:
+            self._record_proxy(error=True, requests=requests)
+            raise
+        self._record_proxy(latency=time.monotonic() - started, requests=requests)
+        return result
+
+    def _load(self, url: str, timeout: int) -> bool | None:
+        """在当前标签页导航；启用代理池时上报延迟与失败。"""
+        self._invalidate()
+        self.cdp_stats["navigations"] += 1
+        started = time.monotonic()
+        try:
+            ok = self._guarded(self._tab.get, url, timeout=self._to_seconds(timeout), show_errmsg=False)
+        except Exception:
+            self._record_proxy(error=True)
+            raise
+        self._record_proxy(latency=time.monotonic() - started, error=ok is False)
+        return ok
+
+    def _browser_rss(self) -> int | None:
+        """浏览器主进程及全部子进程（渲染进程等）的 RSS 之和。"""
+        import psutil
+
+        try:
+            proc = psutil.Process(self._browser.process_id)
+            return sum(p.memory_info().rss for p in (proc, *proc.children(recursive=True)))
+        except (psutil.Error, TypeError, ValueError) as e:
+            logger.debug("读取浏览器内存占用失败: %s", e)
+            return None
+
+    def _recycle_tabs(self) -> None:
+        """换用新标签页（Cookie 由浏览器共享，无需迁移）。调用时不应有未完成的预加载。"""
+        old, self._tab = self._tab, self._new_tab()
+        self._discard_tab(old)
+        self._invalidate()
+        if self._prefetch_tab is not None:
+            old, self._prefetch_tab = self._prefetch_tab, self._new_tab()
+            self._discard_tab(old)
+        self._page_loads = 0
+
+    def _relaunch(self) -> None:
+        """重启 Chromium 并迁移 Cookie。调用时不应有未完成的预加载。"""
+        cookies = portable_cookies(self._guarded(self._tab.cookies, all_domains=True, all_info=True))
+        try:
+            self._browser.quit()
+        except Exception:
+            pass
+        self._browser = self._create_browser(headless=self._headless, port=None)
+        self._tab = self._create_tab()
+        self._configure_tab(self._tab)
+        self._invalidate()
+        if self._prefetch_tab is not None:
+            self._prefetch_tab = self._new_tab()
+        if cookies:
+            self._tab.set.cookies(cookies)
+        self._page_loads = 0
+        logger.info("浏览器已重启，迁移 %d 个 Cookie", len(cookies))
 
     def navigate(self, url: str, timeout: int = 30000) -> str:
         """导航到指定 URL，检测并处理验证码。返回页面 HTML。"""
         self._ensure_alive()
-        ok = self._tab.get(url, timeout=self._to_seconds(timeout), show_errmsg=False)
+        self._before_page_load()
+        ok = self._load(url, timeout)
         if ok is False:
             logger.warning("导航返回非成功状态，可能触发风控或重定向: %s", url)
+        if self._load_mode == "none":
+            # 期刊页的时间戳等隐藏字段需完整文档，导航页不走目标元素等待
+            self._guarded(self._tab.wait.doc_loaded, timeout=self._to_seconds(timeout), raise_err=False)
+            self._invalidate()
         self._handle_captcha()
         return self._safe_html()
 
@@ -121,9 +445,30 @@ return fetch(url, {
     body: body,
 }).then(resp => resp.text());
 """
-        result = self._tab.run_js(script, url, body)
+        result = self._run_fetch(script, url, body)
         return result or ""
 
+    def post_ajax_many(self, url: str, data_list: list[dict | str]) -> list[str]:
+        """在一次 run_js 中并发执行多个 fetch POST 请求，按输入顺序返回响应文本。"""
+        self._ensure_alive()
+        bodies = [urlencode(d) if isinstance(d, dict) else d for d in data_list]
+        script = """
+const url = arguments[0];
+const bodies = arguments[1];
+return Promise.all(bodies.map(body => fetch(url, {
+    method: 'POST',
+    headers: {
+        'Content-Type': 'application/x-www-form-urlencoded',
+        'X-Requested-With': 'XMLHttpRequest',
+        'language': 'CHS',
+        'uniplatform': 'NZKPT',
+    },
+    body: body,
+}).then(resp => resp.text()).catch(() => '')));
+"""
+        result = self._run_fetch(script, url, bodies, requests=len(bodies))
+        return list(result or [""] * len(bodies))
+
     def get_ajax(self, url: str) -> str:
         """在浏览器 JS 上下文中执行 AJAX（接口要求 POST 空 body）。"""
         self._ensure_alive()
@@ -139,7 +484,7 @@ return fetch(url, {
     body: '',
 }).then(resp => resp.text());
 """
-        result = self._tab.run_js(script, url)
+        result = self._run_fetch(script, url)
         return result or ""
 
     @property
@@ -152,32 +497,194 @@ return fetch(url, {
         except Exception:
             return False
 
+    def is_prefetched(self, url: str) -> bool:
+        """该 URL 是否已在后台标签页预加载（此时请求间隔已在后台等待过）。"""
+        return self._prefetch_future is not None and self._prefetch_url == url
+
+    def prefetch(
+        self,
+        url: str,
+        delay: tuple[float, float] = (3.0, 6.0),
+        timeout: int = 30000,
+    ) -> None:
+        """在后台标签页中预加载 URL：先等待随机间隔，再导航。未启用预加载时不做任何事。"""
+        if self._prefetch_executor is None or self._closed:
+            return
+        try:
+            self._wait_prefetch()
+        except Exception as e:
+            logger.debug("丢弃失败的预加载: %s", e)
+        self._before_page_load()
+        self._prefetch_url = url
+        self._prefetch_future = self._prefetch_executor.submit(
+            self._load_in_background, self._prefetch_tab, url, delay, self._to_seconds(timeout),
+        )
+
+    @staticmethod
+    def _load_in_background(tab, url: str, delay: tuple[float, float], timeout: float | None):
+        random_delay(*delay)
+        started = time.monotonic()
+        return tab.get(url, timeout=timeout, show_errmsg=False), time.monotonic() - started
+
+    def _wait_prefetch(self):
+        """等待未完成的预加载结束并清除状态，返回其导航结果。启用代理池时上报延迟与失败。"""
+        future = self._prefetch_future
+        self._prefetch_future = None
+        self._prefetch_url = None
+        if future is None:
+            return None
+        try:
+            ok, latency = future.result(timeout=self._op_deadline)
+        except TimeoutError:
+            self._record_proxy(error=True)
+            logger.warning("预加载超过 %.0f 秒未返回，替换后台标签页", self._op_deadline)
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+            old, self._prefetch_tab = self._prefetch_tab, self._new_tab()
+            self._discard_tab(old)
+            raise
+        except Exception:
+            self._record_proxy(error=True)
+            raise
+        self._record_proxy(latency=latency, error=ok is False)
+        return ok
+
+    def _take_prefetched(self):
+        """取用预加载结果：交换前后台标签页，返回导航结果。"""
+        ok = self._wait_prefetch()
+        self._account_traffic()
+        self._tab, self._prefetch_tab = self._prefetch_tab, self._tab
+        self._invalidate()
+        self.cdp_stats["navigations"] += 1
+        if not self._headless:
+            try:
+                self._tab.set.activate()
+            except Exception:
+                pass
+        return ok
+
     def get_article_html(self, url: str, timeout: int = 30000) -> tuple[str, bool]:
-        """获取论文详情页 HTML。自动处理验证码。返回 (html, is_captcha)。"""
-        self._ensure_alive()
-        ok = self._tab.get(url, timeout=self._to_seconds(timeout), show_errmsg=False)
-        if ok is False:
-            logger.warning("详情页返回非成功状态，继续检测验证码: %s", url)
+        """获取论文详情页 HTML。自动处理验证码。返回 (html, is_captcha)。
+
+        若该 URL 已预加载，直接取用后台标签页，无需再次导航。
+        """
+        self._open_article(url, timeout)
         self._handle_captcha()
 
         html = self._safe_html()
-        if self._is_captcha(html):
+        if self._is_captcha():
             return html, True
 
+        if self._load_mode != "normal" and not all(m in html for m in METADATA_REQUIRED_MARKERS):
+            logger.debug("元信息区不完整，等待页面加载完成后重读: %s", url)
+            self._guarded(self._tab.wait.doc_loaded, timeout=self._to_seconds(timeout), raise_err=False)
+            self._invalidate()
+            html = self._safe_html()
+
         return html, False
 
+    def extract_article(self, url: str, timeout: int = 30000) -> tuple[dict | None, bool]:
+        """在页面内运行提取脚本，直接取得与 parse_article_detail 相同的字段。返回 (detail, is_captcha)。
+
+        验证码检测与字段提取在同一次 run_js 中完成，只回传 JSON，不序列化整页 HTML。
+        导航、预加载、验证码处理与完整性重读与 get_article_html 相同。
+        """
+        self._open_article(url, timeout)
+        result = self._run_extractor()
+        if result["captcha"]:
+            self._handle_captcha()
+            result = self._run_extractor()
+            if result["captcha"]:
+                return None, True
+
+        if self._load_mode != "normal" and not result["complete"]:
+            logger.debug("元信息区不完整，等待页面加载完成后重新提取: %s", url)
+            self._guarded(self._tab.wait.doc_loaded, timeout=self._to_seconds(timeout), raise_err=False)
+            self._invalidate()
+            result = self._run_extractor()
+
+        return result["detail"], False
+
+    def _open_article(self, url: str, timeout: int) -> None:
+        """打开详情页（优先取用预加载标签页）并等待元信息区出现。"""
+        self._ensure_alive()
+        if self.is_prefetched(url):
+            ok = self._take_prefetched()
+        else:
+            try:
+                self._wait_prefetch()
+            except Exception as e:
+                logger.debug("丢弃失败的预加载: %s", e)
+            self._before_page_load()
+            ok = self._load(url, timeout)
+        if ok is False:
+            logger.warning("详情页返回非成功状态，继续检测验证码: %s", url)
+        self._wait_for_metadata()
+
+    def _run_extractor(self) -> dict:
+        raw = self._guarded(
+            self._tab.run_js, EXTRACT_JS,
+            list(CAPTCHA_URL_INDICATORS), list(CAPTCHA_HTML_INDICATORS),
+        )
+        self.cdp_stats["extractions"] += 1
+        self.cdp_stats["extract_bytes"] += len(raw.encode("utf-8"))
+        return json.loads(raw)
+
+    def _wait_for_metadata(self) -> None:
+        """eager/none 模式下等待标题元素出现（验证码页没有该元素，超时后交由验证码检测处理）。"""
+        if self._load_mode == "normal":
+            return
+        self._guarded(
+            self._tab.wait.eles_loaded, METADATA_READY_LOCATOR,
+            timeout=METADATA_READY_TIMEOUT, raise_err=False,
+        )
+        self._invalidate()
+
     def close(self) -> None:
         """关闭浏览器资源。"""
         if self._closed:
             return
         self._closed = True
 
-        if self._port_mode:
-            # 接管模式只关闭当前新建标签页，不关闭用户浏览器
+        stats = self.cdp_stats
+        if stats["navigations"]:
+            logger.info(
+                "页面快照统计：导航 %d 次，DOM 序列化 %d 次（复用 %d 次），页内提取 %d 次，传输 %.1f MB",
+                stats["navigations"], stats["snapshots"], stats["snapshot_hits"], stats["extractions"],
+                (stats["html_bytes"] + stats["extract_bytes"]) / 1024 / 1024,
+            )
+        if self.traffic is not None:
+            self._account_traffic()
+            total = sum(self.traffic.bytes.values())
+            logger.info(
+                "流量统计（拦截配置 %s）：%d 个请求，%.1f MB",
+                self._intercept.name, sum(self.traffic.requests.values()), total / 1024 / 1024,
+            )
+            for line in self.traffic.summary():
+                logger.info("  %s", line)
+            timing = self.traffic.timing_summary()
+            if timing:
+                logger.info("页面平均加载耗时（拦截配置 %s）：%s", self._intercept.name, timing)
+
+        if self._session is not None:
             try:
-                self._tab.close()
-            except Exception:
-                pass
+                self._guarded(self._session.save, self._tab)
+            except Exception as e:
+                logger.warning("保存浏览器会话快照失败: %s", e)
+
+        self._op_executor.shutdown(wait=False, cancel_futures=True)
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+        if self._port_mode:
+            # 接管模式只关闭本程序新建的标签页，不关闭用户浏览器
+            for tab in (self._tab, self._prefetch_tab):
+                if tab is None:
+                    continue
+                try:
+                    tab.close()
+                except Exception:
+                    pass
             return
 
         try:
@@ -185,47 +692,140 @@ return fetch(url, {
         except Exception:
             pass
 
-    def _is_captcha(self, html: str | None = None) -> bool:
-        """检测当前页面是否为验证码页面。"""
-        try:
-            current_url = self._tab.url
-        except Exception:
-            current_url = ""
-        if any(token in current_url for token in CAPTCHA_URL_INDICATORS):
-            return True
-
-        content = html if html is not None else self._safe_html()
-        return any(indicator in content for indicator in CAPTCHA_HTML_INDICATORS)
+    def _is_captcha(self) -> bool:
+        """检测当前页面是否为验证码页面（使用页面快照）。"""
+        return _page_is_captcha(*self._snapshot())
 
     def _handle_captcha(self) -> None:
         """检测验证码并暂停等待用户手动解决。"""
         if not self._is_captcha():
             return
+        if self._proxy_pool is not None:
+            # 该页面的加载已在 _load / _wait_prefetch 中记录，改记为触发验证码而非新增样本
+            self._proxy_pool.flag_captcha(self._proxy)
+
+        if self._escalate:
+            self._escalate_captcha()
+            return
 
         if self._headless:
-            raise RuntimeError("headless 模式触发验证码，无法手动完成，请改用有头模式或 --port 接管浏览器")
+            raise RuntimeError(
+                "headless 模式触发验证码，无法手动完成，请改用有头模式、--escalate-captcha 或 --port 接管浏览器"
+            )
+
+        relax = self._intercept.relax_on_captcha
+        if relax:
+            # 验证码页的图片与脚本可能被拦截配置屏蔽，解除屏蔽后重新加载
+            self._apply_intercept(self._tab, enabled=False)
+            try:
+                self._tab.refresh()
+            except Exception as e:
+                logger.debug("重新加载验证码页失败: %s", e)
 
         logger.warning("=" * 50)
         logger.warning("检测到验证码！请在浏览器窗口中手动完成验证")
         logger.warning("完成后程序将自动继续...")
         logger.warning("=" * 50)
 
-        while True:
-            time.sleep(2)
-            self._ensure_alive()
-            if self._is_captcha():
-                continue
-            break
+        try:
+            while True:
+                time.sleep(2)
+                self._ensure_alive()
+                self._invalidate()
+                if self._is_captcha():
+                    continue
+                break
+        finally:
+            if relax:
+                self._apply_intercept(self._tab)
 
         try:
             self._tab.wait.doc_loaded(timeout=15, raise_err=False)
         except Exception:
             time.sleep(1)
+        self._invalidate()
 
         logger.info("验证码已通过，继续执行")
 
+    def _escalate_captcha(self) -> None:
+        """把验证码页交给临时有头浏览器：同步 Cookie 与 UA、等待人工验证、回写 Cookie 后重新加载。"""
+        url = self._snapshot()[0]
+        cookies = self._tab.cookies(all_domains=True, all_info=True)
+
+        opts = ChromiumOptions(read_file=False)
+        opts.auto_port()
+        opts.set_timeouts(base=10, page_load=30, script=30)
+        opts.set_argument("--disable-blink-features", "AutomationControlled")
+        if self._proxy:
+            # 验证结果可能与出口 IP 绑定，有头浏览器须走同一代理
+            opts.set_proxy(self._proxy)
+        if self._user_agent:
+            opts.set_user_agent(self._user_agent)
+
+        logger.warning("=" * 50)
+        logger.warning("无头模式检测到验证码，已打开有头浏览器，请在新窗口中完成验证")
+        logger.warning("完成后程序将自动继续...")
+        logger.warning("=" * 50)
+
+        helper = Chromium(opts)
+        try:
+            tab = helper.latest_tab
+            if cookies:
+                tab.set.cookies(portable_cookies(cookies))
+            tab.get(url, show_errmsg=False)
+            while True:
+                time.sleep(2)
+                if not (helper.states.is_alive and tab.states.is_alive):
+                    raise RuntimeError("验证码窗口已关闭，验证未完成")
+                if not _page_is_captcha(tab.url, tab.html):
+                    break
+            try:
+                tab.wait.doc_loaded(timeout=15, raise_err=False)
+            except Exception:
+                time.sleep(1)
+            cleared = tab.cookies(all_domains=True, all_info=True)
+            target = tab.url
+        finally:
+            try:
+                helper.quit()
+            except Exception:
+                pass
+
+        # 同一浏览器的标签页共享 Cookie，预加载标签页无需单独注入
+        self._tab.set.cookies(portable_cookies(cleared))
+        self._tab.get(target or url, show_errmsg=False)
+        self._invalidate()
+        if self._is_captcha():
+            raise RuntimeError("回写 Cookie 后仍为验证码页面")
+        logger.info("验证码已在有头浏览器中通过，已回写 %d 个 Cookie，继续无头执行", len(cleared))
+
     def __enter__(self) -> CnkiBrowser:
         return self
 
     def __exit__(self, *args) -> None:
         self.close()
+
+
+def _has_psutil() -> bool:
+    try:
+        import psutil  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _env_proxy() -> str | None:
+    return (
+        os.environ.get("https_proxy")
+        or os.environ.get("HTTPS_PROXY")
+        or os.environ.get("all_proxy")
+        or os.environ.get("ALL_PROXY")
+        or os.environ.get("http_proxy")
+        or os.environ.get("HTTP_PROXY")
+    )
+
+
+def _page_is_captcha(url: str, html: str) -> bool:
+    if any(token in url for token in CAPTCHA_URL_INDICATORS):
+        return True
+    return any(indicator in html for indicator in CAPTCHA_HTML_INDICATORS)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+# 瘦客户端：仅依赖标准库，不得导入 browser / journal / article 等重模块。
+
+# wait() 默认最长等待时间（秒）
+WAIT_TIMEOUT = 24 * 3600
+
+
+class DaemonClient:
+    """守护进程 HTTP 接口客户端。"""
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout
+
+    def _request(self, method: str, path: str, payload: dict | None = None) -> dict:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else None
+        req = Request(
+            self._base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+        )
+        try:
+            with urlopen(req, timeout=self._timeout) as resp:
+                return json.loads(resp.read().decode("utf-8"))
+        except HTTPError as e:
+            detail = e.read().decode("utf-8", errors="replace")
+            raise RuntimeError(f"守护进程返回错误 {e.code}: {detail}") from e
+
+    def submit(self, payload: dict) -> dict:
+        """提交任务，返回任务信息（含 id）。"""
+        return self._request("POST", "/jobs", payload)
+
+    def get(self, job_id: str) -> dict:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def wait(self, job_id: str, poll_interval: float = 2.0, timeout: float | None = WAIT_TIMEOUT) -> dict:
+        """轮询直到任务结束（done / failed），返回最终任务信息。超过 timeout 秒时抛出 TimeoutError。"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            job = self.get(job_id)
+            if job["status"] in ("done", "failed"):
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"等待任务 {job_id} 超时（状态: {job['status']}）")
+            time.sleep(poll_interval)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import itertools
+import json
+import queue
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .browser import CnkiBrowser
+from .intercept import InterceptProfile
+from .progress import PROGRESS_FILE
+from .proxy import ProxyPool
+from .retry import DEAD_LETTER_FILE, RetryQueue
+from .scheduler import parse_duration
+from .utils import logger
+
+DEFAULT_LISTEN = "127.0.0.1:8765"
+WARMUP_URL = "https://navi.cnki.net/knavi/"
+
+
+class CrawlDaemon:
+    """常驻浏览器守护进程。
+
+    浏览器只在工作线程中创建和使用，首个任务开始时启动并预热，在任务之间保持会话（Cookie）；
+    启动失败时该任务记为失败，下一个任务重新尝试启动。
+    任务通过本地 HTTP 接口提交，按提交顺序串行执行：
+
+    - POST /jobs          提交任务，body 为 JSON:
+                          {"years": "2025", "journal": "...", "journals_csv": "...",
+                           "output_dir": "...", "progress_file": "...",
+                           "registry_file": "...", "pykm_cache": "...",
+                           "failed_file": "...", "max_attempts": 3, "retry_delay": 60,
+                           "order": "newest", "budget": "3h",
+                           "depth": "list", "enrich": false, "normalized": "gzip"}
+    - GET  /jobs          列出所有任务
+    - GET  /jobs/{id}     查询任务状态（queued / running / done / failed）
+    - GET  /health        存活检查（启用代理池时附带各代理健康状态）
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        headless: bool = False,
+        browser_port: int | None = None,
+        prefetch: bool = False,
+        escalate_captcha: bool = False,
+        load_mode: str = "eager",
+        proxy_pool: ProxyPool | None = None,
+        extract: str = "html",
+        intercept: InterceptProfile | None = None,
+        traffic_stats: bool = False,
+        session_file: str | None = None,
+    ):
+        self._host = host
+        self._port = port
+        self._headless = headless
+        self._browser_port = browser_port
+        self._prefetch = prefetch
+        self._escalate_captcha = escalate_captcha
+        self._load_mode = load_mode
+        self._extract = extract
+        self._intercept = intercept
+        self._traffic_stats = traffic_stats
+        self._session_file = session_file
+        self._proxy_pool = proxy_pool
+        self._browser: CnkiBrowser | None = None
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._worker = threading.Thread(target=self._run_worker, name="crawl-worker", daemon=True)
+
+    # ── 任务管理 ──
+
+    def submit(self, payload: dict) -> dict:
+        if not payload.get("years"):
+            raise ValueError("缺少 years 参数")
+        if payload.get("budget"):
+            parse_duration(payload["budget"])
+        with self._lock:
+            job_id = f"job-{next(self._ids)}"
+            queued_ahead = sum(1 for j in self._jobs.values() if j["status"] in ("queued", "running"))
+            job = {
+                "id": job_id,
+                "status": "queued",
+                "payload": payload,
+                "submitted_at": datetime.now().isoformat(),
+                "queued_ahead": queued_ahead,
+            }
+            self._jobs[job_id] = job
+        self._queue.put(job_id)
+        logger.info("收到任务 %s: %s", job_id, payload)
+        return dict(job)
+
+    def get_job(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self) -> list[dict]:
+        with self._lock:
+            return [dict(j) for j in self._jobs.values()]
+
+    def _update_job(self, job_id: str, **fields) -> None:
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    # ── 工作线程 ──
+
+    def _ensure_browser(self) -> CnkiBrowser:
+        if self._browser is not None and self._browser.is_alive:
+            return self._browser
+        if self._browser is not None:
+            logger.warning("浏览器已失效，重新启动")
+            self._browser.close()
+        self._browser = CnkiBrowser(
+            headless=self._headless, port=self._browser_port,
+            prefetch=self._prefetch, escalate_captcha=self._escalate_captcha,
+            load_mode=self._load_mode, proxy_pool=self._proxy_pool, worker_id="daemon",
+            extract=self._extract, intercept=self._intercept, traffic_stats=self._traffic_stats,
+            session_file=self._session_file,
+        )
+        try:
+            self._browser.navigate(WARMUP_URL)
+            logger.info("浏览器已预热: %s", WARMUP_URL)
+        except Exception as e:
+            logger.warning("浏览器预热失败: %s", e)
+        return self._browser
+
+    def _run_worker(self) -> None:
+        # 浏览器在任务内（_run_job -> _ensure_browser）按需启动，启动失败只影响当前任务
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                break
+            self._update_job(job_id, status="running", started_at=datetime.now().isoformat())
+            try:
+                self._run_job(self._jobs[job_id]["payload"])
+            except Exception as e:
+                logger.error("任务 %s 失败: %s", job_id, e)
+                self._update_job(job_id, status="failed", error=str(e),
+                                 finished_at=datetime.now().isoformat())
+            else:
+                logger.info("任务 %s 完成", job_id)
+                self._update_job(job_id, status="done", finished_at=datetime.now().isoformat())
+
+        if self._browser is not None:
+            self._browser.close()
+
+    def _run_job(self, payload: dict) -> None:
+        from .main import PYKM_CACHE_FILE, crawl, load_journals, parse_years
+        from .registry import REGISTRY_FILE
+
+        journals = load_journals(
+            payload.get("journals_csv") or "journals.csv",
+            registry_path=payload.get("registry_file") or REGISTRY_FILE,
+            pykm_cache=payload.get("pykm_cache") or PYKM_CACHE_FILE,
+        )
+        name_filter = payload.get("journal")
+        if name_filter:
+            journals = [j for j in journals if name_filter in j.name]
+            if not journals:
+                raise ValueError(f"未找到匹配的期刊: {name_filter}")
+
+        crawl(
+            journals,
+            parse_years(payload["years"]),
+            output_dir=payload.get("output_dir") or "output",
+            browser=self._ensure_browser(),
+            progress_file=payload.get("progress_file") or PROGRESS_FILE,
+            order=payload.get("order") or "sequential",
+            budget=parse_duration(payload["budget"]) if payload.get("budget") else None,
+            depth=payload.get("depth") or "detail",
+            enrich=bool(payload.get("enrich")),
+            normalized=payload.get("normalized"),
+            retry_queue=RetryQueue(
+                max_attempts=int(payload.get("max_attempts") or 3),
+                base_delay=float(payload.get("retry_delay") or 60.0),
+                dead_letter_path=payload.get("failed_file") or DEAD_LETTER_FILE,
+            ),
+        )
+
+    # ── HTTP 服务 ──
+
+    def serve_forever(self) -> None:
+        server = ThreadingHTTPServer((self._host, self._port), _make_handler(self))
+        self._worker.start()
+        logger.info("守护进程已启动: http://%s:%d", self._host, self._port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("收到中断信号，停止守护进程")
+        finally:
+            server.server_close()
+            self._queue.put(None)
+            self._worker.join(timeout=30)
+
+
+def _make_handler(daemon: CrawlDaemon) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, data) -> None:
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                health: dict = {"ok": True}
+                if daemon._proxy_pool is not None:
+                    health["proxies"] = daemon._proxy_pool.stats()
+                self._send_json(200, health)
+            elif self.path == "/jobs":
+                self._send_json(200, daemon.list_jobs())
+            elif self.path.startswith("/jobs/"):
+                job = daemon.get_job(self.path[len("/jobs/"):])
+                if job is None:
+                    self._send_json(404, {"error": "任务不存在"})
+                else:
+                    self._send_json(200, job)
+            else:
+                self._send_json(404, {"error": "未知路径"})
+
+        def do_POST(self) -> None:
+            if self.path != "/jobs":
+                self._send_json(404, {"error": "未知路径"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                job = daemon.submit(payload)
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            self._send_json(202, job)
+
+        def log_message(self, format: str, *args) -> None:
+            logger.debug("HTTP %s", format % args)
+
+    return Handler
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
 import csv
+import gzip
 import json
 import os
 from datetime import datetime
+from typing import Iterator, Sequence
 
-from .models import Article
+from .models import ARTICLE_FIELDS, Article, ArticleRecord
 from .utils import logger
 
 
+def _article_dict(article: Article | ArticleRecord) -> dict:
+    """提取导出字段。Article 与 ArticleRecord 均可直接导出，无需先复制为 Article。"""
+    row = {}
+    for name in ARTICLE_FIELDS:
+        value = getattr(article, name)
+        row[name] = list(value) if isinstance(value, tuple) else value
+    return row
+
+
 def export_json(
-    articles: list[Article],
+    articles: Sequence[Article | ArticleRecord],
     journal_name: str,
     pykm: str,
     year: str,
@@ -27,7 +38,7 @@ def export_json(
         "year": year,
         "crawl_time": datetime.now().isoformat(),
         "total_articles": len(articles),
-        "articles": [a.to_dict() for a in articles],
+        "articles": [_article_dict(a) for a in articles],
     }
 
     with open(filepath, "w", encoding="utf-8") as f:
@@ -38,7 +49,7 @@ def export_json(
 
 
 def export_csv(
-    all_articles: list[Article],
+    all_articles: Sequence[Article | ArticleRecord],
     output_dir: str = "output",
     filename: str = "all_articles.csv",
 ) -> str:
@@ -46,16 +57,13 @@ def export_csv(
     os.makedirs(output_dir, exist_ok=True)
     filepath = os.path.join(output_dir, filename)
 
-    fieldnames = [
-        "journal", "year", "issue", "title", "authors", "institutions",
-        "abstract", "keywords", "funds", "clc_code", "url",
-    ]
+    fieldnames = list(ARTICLE_FIELDS)
 
     with open(filepath, "w", encoding="utf-8-sig", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         for a in all_articles:
-            row = a.to_dict()
+            row = _article_dict(a)
             # 列表字段用分号连接
             for key in ("authors", "institutions", "keywords", "funds"):
                 if isinstance(row[key], list):
@@ -66,6 +74,127 @@ def export_csv(
     return filepath
 
 
+# 规范化导出：实体字典（期刊、作者、单位、关键词、基金）首次出现时写出一行并分配整数 ID，
+# 论文行按 NORMALIZED_COLUMNS 顺序写出紧凑数组，实体字段为 ID 或 ID 列表
+NORMALIZED_FORMAT = "cnki-normalized"
+NORMALIZED_VERSION = 1
+NORMALIZED_ENTITIES = {
+    "journal": "j",
+    "authors": "au",
+    "institutions": "in",
+    "keywords": "kw",
+    "funds": "fu",
+}
+NORMALIZED_COLUMNS = (
+    "journal", "year", "issue", "title", "authors", "institutions",
+    "abstract", "keywords", "funds", "clc_code", "url", "column", "pages",
+)
+
+
+def export_normalized(
+    all_articles: Sequence[Article | ArticleRecord],
+    output_dir: str = "output",
+    filename: str = "all_articles.ndjson",
+    compress: bool = False,
+) -> str:
+    """导出所有论文为规范化 NDJSON（compress=True 时为 gzip）。返回文件路径。
+
+    每行一个 JSON 值:
+      首行   {"format": "cnki-normalized", "version": 1, "crawl_time": ..., "columns": [...]}
+      实体行 ["kw", 3, "数字人文"]   类型标记 j / au / in / kw / fu，ID 在各类型内从 0 递增
+      论文行 ["a", 0, "2025", "01", "标题", [0, 1], [0], "摘要", [2, 3], [], "G250", "https://...", "研究论文", "4-12"]
+
+    实体行总在首次引用它的论文行之前写出，可单遍流式读取（见 load_normalized）。
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if compress and not filename.endswith(".gz"):
+        filename += ".gz"
+    filepath = os.path.join(output_dir, filename)
+
+    ids: dict[str, dict[str, int]] = {tag: {} for tag in NORMALIZED_ENTITIES.values()}
+    opener = gzip.open if compress else open
+    with opener(filepath, "wt", encoding="utf-8") as f:
+        def encode(tag: str, value: str) -> int:
+            table = ids[tag]
+            entity_id = table.get(value)
+            if entity_id is None:
+                entity_id = table[value] = len(table)
+                f.write(_ndjson([tag, entity_id, value]))
+            return entity_id
+
+        f.write(_ndjson({
+            "format": NORMALIZED_FORMAT,
+            "version": NORMALIZED_VERSION,
+            "crawl_time": datetime.now().isoformat(),
+            "columns": list(NORMALIZED_COLUMNS),
+        }))
+        for a in all_articles:
+            row: list = ["a"]
+            for name in NORMALIZED_COLUMNS:
+                value = getattr(a, name)
+                tag = NORMALIZED_ENTITIES.get(name)
+                if tag is None:
+                    row.append(value)
+                elif name == "journal":
+                    row.append(encode(tag, value))
+                else:
+                    row.append([encode(tag, v) for v in value])
+            f.write(_ndjson(row))
+
+    logger.info(
+        "已导出规范化 NDJSON: %s (%d 篇，%s)", filepath, len(all_articles),
+        "，".join(f"{tag} {len(table)}" for tag, table in ids.items()),
+    )
+    return filepath
+
+
+def load_normalized(filepath: str) -> Iterator[Article]:
+    """逐行读取规范化导出文件（自动识别 gzip），惰性生成 Article。
+
+    同一实体在所有 Article 中共享同一字符串对象。
+    """
+    with open(filepath, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    opener = gzip.open if compressed else open
+    with opener(filepath, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != NORMALIZED_FORMAT:
+            raise ValueError(f"不是规范化导出文件: {filepath}")
+        if header.get("version", 0) > NORMALIZED_VERSION:
+            raise ValueError(f"不支持的规范化导出版本: {header.get('version')}")
+        columns = header["columns"]
+        tables: dict[str, list[str]] = {tag: [] for tag in NORMALIZED_ENTITIES.values()}
+
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            tag = item[0]
+            if tag == "a":
+                fields = {}
+                for name, value in zip(columns, item[1:]):
+                    entity = NORMALIZED_ENTITIES.get(name)
+                    if name not in _ARTICLE_ATTRS:
+                        continue  # 新版本增加的列
+                    if entity is None:
+                        fields[name] = value
+                    elif name == "journal":
+                        fields[name] = tables[entity][value]
+                    else:
+                        fields[name] = [tables[entity][i] for i in value]
+                yield Article(**fields)
+            elif tag in tables:
+                # ID 按出现顺序递增，与列表下标一致
+                tables[tag].append(item[2])
+
+
+_ARTICLE_ATTRS = frozenset(Article.__dataclass_fields__)
+
+
+def _ndjson(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
 def save_failed_items(failed: list[dict], filepath: str = "failed_items.json") -> None:
     """保存爬取失败的条目。"""
     with open(filepath, "w", encoding="utf-8") as f:
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from urllib.parse import urlsplit
+
+from .utils import logger
+
+# 资源类别 -> 扩展名；"*" 表示屏蔽该主机的全部请求
+RESOURCE_CLASSES = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp"),
+    "stylesheet": ("css",),
+    "script": ("js",),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "mp3", "m4a"),
+}
+ALL_RESOURCES = "*"
+# 会影响验证码页显示的类别：屏蔽这些类别时，人工处理验证码前临时解除屏蔽
+CAPTCHA_SENSITIVE = {"image", "stylesheet", "script", ALL_RESOURCES}
+
+# 腾讯验证码资源所在主机，始终放行（与其重叠的屏蔽规则会被忽略）
+CAPTCHA_HOSTS = (
+    "turing.captcha.qcloud.com",
+    "*.captcha.qcloud.com",
+    "captcha.gtimg.com",
+    "captcha.qq.com",
+    "*.captcha.qq.com",
+)
+ANALYTICS_HOSTS = (
+    "hm.baidu.com",
+    "*.cnzz.com",
+    "*.51.la",
+    "*.google-analytics.com",
+    "*.googletagmanager.com",
+    "*.growingio.com",
+)
+
+# 内置配置：主机模式 -> 屏蔽的资源类别
+PROFILES: dict[str, dict[str, list[str]]] = {
+    "off": {},
+    # 默认：只屏蔽字体与音视频
+    "minimal": {"*.cnki.net": ["font", "media"]},
+    # 元信息由服务端渲染，CNKI 的图片与样式表、第三方统计脚本都不需要
+    "lean": {
+        "*.cnki.net": ["image", "stylesheet", "font", "media"],
+        **{host: [ALL_RESOURCES] for host in ANALYTICS_HOSTS},
+    },
+}
+DEFAULT_PROFILE = "minimal"
+
+# 读取并清空当前页面的 Resource Timing 记录；文档本身的记录与导航计时每个页面只计一次。
+# 跨域资源未返回 Timing-Allow-Origin 时 transferSize 为 0，字节数只计得到可见部分。
+# 导航计时为相对导航开始的毫秒数，尚未发生的阶段为 0（如 eager 模式下 load 事件前已离开页面）。
+RESOURCE_TIMING_JS = """
+const entries = [];
+let timing = null;
+if (!window.__cnkiTrafficCounted) {
+    window.__cnkiTrafficCounted = true;
+    for (const e of performance.getEntriesByType('navigation')) {
+        entries.push([e.name, 'document', e.transferSize || 0]);
+        timing = [e.responseEnd, e.domContentLoadedEventEnd, e.loadEventEnd];
+    }
+}
+for (const e of performance.getEntriesByType('resource')) {
+    entries.push([e.name, e.initiatorType || 'other', e.transferSize || 0]);
+}
+performance.clearResourceTimings();
+return JSON.stringify({entries: entries, timing: timing});
+"""
+# 导航计时的阶段名，与 RESOURCE_TIMING_JS 返回的 timing 数组顺序一致
+NAVIGATION_PHASES = ("response", "domcontentloaded", "load")
+# 默认缓冲区只保留 250 条，资源较多的页面会丢记录
+RESOURCE_BUFFER_JS = "performance.setResourceTimingBufferSize(2000);"
+
+
+@dataclass
+class InterceptProfile:
+    """按主机屏蔽资源类别的请求拦截配置，生成 Network.setBlockedURLs 所用的 URL 模式。
+
+    配置文件为 JSON，可在 allow 中追加放行的主机（腾讯验证码主机始终放行）:
+
+        {
+          "block": {"*.cnki.net": ["image", "stylesheet"], "hm.baidu.com": ["*"]},
+          "allow": ["static.example.com"]
+        }
+
+    与放行主机重叠的规则（如主机模式 "*"）会被忽略，保证验证码资源可以加载。
+    """
+
+    name: str
+    rules: dict[str, list[str]]
+    allow: tuple[str, ...] = CAPTCHA_HOSTS
+    patterns: list[str] = field(init=False)
+
+    def __post_init__(self):
+        for host, classes in self.rules.items():
+            unknown = set(classes) - set(RESOURCE_CLASSES) - {ALL_RESOURCES}
+            if unknown:
+                raise ValueError(f"未知资源类别 ({host}): {sorted(unknown)}")
+        self.patterns = self._build_patterns()
+
+    @classmethod
+    def load(cls, spec: str) -> InterceptProfile:
+        """按名称取内置配置，或从 JSON 文件读取。"""
+        if spec in PROFILES:
+            return cls(spec, PROFILES[spec])
+        if not os.path.exists(spec):
+            raise ValueError(f"未知拦截配置: {spec}（内置: {', '.join(PROFILES)}，或 JSON 文件路径）")
+        with open(spec, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(os.path.basename(spec), data.get("block", {}), CAPTCHA_HOSTS + tuple(data.get("allow", ())))
+
+    @property
+    def relax_on_captcha(self) -> bool:
+        """是否屏蔽了验证码页可能依赖的资源（人工验证前需临时解除屏蔽）。"""
+        return any(CAPTCHA_SENSITIVE & set(classes) for classes in self.rules.values())
+
+    def _build_patterns(self) -> list[str]:
+        patterns = []
+        for host, classes in self.rules.items():
+            overlap = [a for a in self.allow if fnmatch(a, host) or fnmatch(host, a)]
+            if overlap:
+                logger.warning("拦截规则 %s 覆盖放行主机 %s，已忽略", host, ", ".join(overlap))
+                continue
+            if ALL_RESOURCES in classes:
+                patterns.append(f"*://{host}/*")
+                continue
+            for name in classes:
+                for ext in RESOURCE_CLASSES[name]:
+                    patterns.append(f"*://{host}/*.{ext}")
+                    patterns.append(f"*://{host}/*.{ext}?*")
+        return patterns
+
+
+class TrafficStats:
+    """按域名与资源类型累计请求数与传输字节数，并累计各页面的导航计时（来自 Resource Timing 记录）。"""
+
+    def __init__(self):
+        self.requests: Counter = Counter()
+        self.bytes: Counter = Counter()
+        # 阶段 -> 累计毫秒数 / 页面数（只计已发生的阶段）
+        self.timing_ms: Counter = Counter()
+        self.timing_pages: Counter = Counter()
+
+    def add(self, entries: list, timing: list | None = None) -> None:
+        for url, kind, size in entries:
+            host = urlsplit(url).hostname or ""
+            self.requests[host, kind] += 1
+            self.bytes[host, kind] += int(size)
+        for phase, ms in zip(NAVIGATION_PHASES, timing or ()):
+            if ms and ms > 0:
+                self.timing_ms[phase] += ms
+                self.timing_pages[phase] += 1
+
+    def timing_summary(self) -> str | None:
+        """各导航阶段的平均耗时，没有导航计时记录时返回 None。"""
+        if not self.timing_pages:
+            return None
+        return "，".join(
+            f"{phase} {self.timing_ms[phase] / self.timing_pages[phase]:.0f} ms"
+            f"（{self.timing_pages[phase]} 个页面）"
+            for phase in NAVIGATION_PHASES
+            if self.timing_pages[phase]
+        )
+
+    def summary(self, top: int = 10) -> list[str]:
+        """按域名汇总，字节数从高到低取前 top 个域名，每行一个域名。"""
+        hosts: dict[str, Counter] = {}
+        for (host, kind), n in self.requests.items():
+            hosts.setdefault(host, Counter())[kind] += n
+        host_bytes = Counter()
+        for (host, _), size in self.bytes.items():
+            host_bytes[host] += size
+        lines = []
+        for host in sorted(hosts, key=lambda h: (-host_bytes[h], h))[:top]:
+            kinds = "，".join(f"{k} {n}" for k, n in hosts[host].most_common())
+            lines.append(
+                f"{host or '(无主机)'}: {sum(hosts[host].values())} 个请求，"
+                f"{host_bytes[host] / 1024:.0f} KB（{kinds}）"
+            )
+        return lines
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import math
 import re
 from urllib.parse import quote
@@ -10,6 +11,15 @@ from .browser import CnkiBrowser
 from .utils import logger, random_delay
 
 BASE_NAVI = "https://navi.cnki.net"
+SEARCH_URL = f"{BASE_NAVI}/knavi/all/searchbaseinfo"
+
+# 检索结果中可推断 pykm 的位置：期刊路径、封面图、RSS 链接
+_PYKM_PATTERNS = (
+    re.compile(r"/knavi/journals/([A-Za-z0-9]+)/"),
+    re.compile(r"/cjfd/small/([A-Za-z0-9]+)\.jpg"),
+    re.compile(r"/knavi/rss/([A-Za-z0-9]+)"),
+    re.compile(r"pykm=([A-Za-z0-9]+)"),
+)
 
 
 def get_all_year_issues(
@@ -90,7 +100,9 @@ def get_papers_list(
 ) -> list[dict]:
     """获取某一刊期的所有论文基础信息。
 
-    返回: [{"title": "...", "url": "...", "authors_preview": "...", "pages": "...", "column": "..."}, ...]
+    返回: [{"title": "...", "url": "...", "filename": "...", "authors_preview": "...", "pages": "...", "column": "..."}, ...]
+
+    filename 为 CNKI 文章编号（如 ZGTS202506001），跨会话稳定；url 中的 v= 参数每次会话不同。
     """
     html = _fetch_papers(browser, pykm, year_issue_value, page_idx=0)
     return _parse_papers_html(html)
@@ -133,6 +145,9 @@ def _parse_papers_html(html: str) -> list[dict]:
             title = a_tag.get_text(strip=True)
             url = a_tag.get("href", "")
 
+            encrypt_b = name_span.find("b", attrs={"name": "encrypt"})
+            filename = encrypt_b.get("id", "").strip() if encrypt_b else ""
+
             author_span = element.find("span", class_="author")
             authors_preview = author_span.get("title", "") if author_span else ""
 
@@ -142,9 +157,128 @@ def _parse_papers_html(html: str) -> list[dict]:
             results.append({
                 "title": title,
                 "url": url,
+                "filename": filename,
                 "authors_preview": authors_preview,
                 "pages": pages,
                 "column": current_column,
             })
 
     return results
+
+
+def search_journals(
+    browser: CnkiBrowser, names: list[str], batch_size: int = 10,
+) -> dict[str, tuple[str, str]]:
+    """按刊名批量检索 pykm（searchbaseinfo 接口，每批在浏览器中并发请求）。
+
+    返回: {"刊名": ("PYKM", "检索结果中的刊名")}，未能解析的刊名不在结果中；
+    两个刊名不一致时为模糊匹配，需人工确认。
+    浏览器当前页面需位于 navi.cnki.net 域名下。
+    """
+    resolved: dict[str, tuple[str, str]] = {}
+    for start in range(0, len(names), batch_size):
+        batch = names[start:start + batch_size]
+        if start:
+            random_delay(1.0, 2.0)
+        responses = browser.post_ajax_many(SEARCH_URL, [_build_search_form(n) for n in batch])
+        for name, html in zip(batch, responses):
+            pykm, matched = _match_search_result(name, _parse_search_results(html))
+            if pykm and matched == name:
+                resolved[name] = (pykm, matched)
+                logger.info("  %s -> %s", name, pykm)
+            elif pykm:
+                resolved[name] = (pykm, matched)
+                logger.warning("  %s 无完全匹配，唯一检索结果为「%s」(%s)，未确认", name, matched, pykm)
+            else:
+                logger.warning("  未检索到期刊: %s", name)
+    return resolved
+
+
+def _build_search_form(name: str) -> dict:
+    """构造 searchbaseinfo 请求体（结构见 CNKI_crawl_analysis.md §1.3）。"""
+    state = {
+        "StateID": "",
+        "Platfrom": "",
+        "QueryTime": "",
+        "Account": "knavi",
+        "ClientToken": "",
+        "Language": "",
+        "CNode": {"PCode": "9R5HMN1M", "SMode": "", "OperateT": ""},
+        "QNode": {
+            "SelectT": "",
+            "Select_Fields": "",
+            "S_DBCodes": "",
+            "Subscribed": "",
+            "QGroup": [{
+                "Key": "subject",
+                "Logic": 1,
+                "Items": [],
+                "ChildItems": [{
+                    "Key": "txt",
+                    "Logic": 1,
+                    "Items": [{
+                        "Key": "txt_1",
+                        "Title": "",
+                        "Logic": 1,
+                        "Name": "LY",
+                        "Operate": "%",
+                        "Value": f"'{name}'",
+                        "ExtendType": 0,
+                        "ExtendValue": "",
+                        "Value2": "",
+                    }],
+                    "ChildItems": [],
+                }],
+            }],
+            "OrderBy": "",
+            "GroupBy": "",
+            "Additon": "",
+        },
+    }
+    return {
+        "searchStateJson": json.dumps(state, ensure_ascii=False),
+        "displaymode": "1",
+        "pageindex": "1",
+        "pagecount": "10",
+        "index": "UXTGKYC2",
+        "searchType": "来源名称",
+        "parentcode": "BTBKQV4X",
+        "clickName": "",
+        "switchdata": "search",
+    }
+
+
+def _parse_search_results(html: str) -> list[dict]:
+    """从检索结果 HTML 中解析期刊条目。
+
+    返回: [{"name": "...", "pykm": "..."}, ...]，pykm 从条目内的期刊路径、封面图或 RSS 链接推断。
+    """
+    soup = BeautifulSoup(html, "lxml")
+    results = []
+    seen: set[str] = set()
+    for a in soup.find_all("a", href=re.compile(r"/knavi/(detail|journals/)")):
+        name = (a.get("title") or a.get_text(strip=True)).strip()
+        if not name or name in seen:
+            continue
+        container = a.find_parent(["li", "dd", "tr"]) or a
+        pykm = ""
+        text = str(container)
+        for pattern in _PYKM_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                pykm = match.group(1).upper()
+                break
+        seen.add(name)
+        results.append({"name": name, "pykm": pykm})
+    return results
+
+
+def _match_search_result(name: str, results: list[dict]) -> tuple[str, str]:
+    """返回 (pykm, 条目刊名)。优先取刊名完全一致的条目；否则仅有一个结果时作为候选返回。"""
+    for r in results:
+        if r["name"] == name and r["pykm"]:
+            return r["pykm"], r["name"]
+    with_pykm = [r for r in results if r["pykm"]]
+    if len(with_pykm) == 1:
+        return with_pykm[0]["pykm"], with_pykm[0]["name"]
+    return "", ""
@@ -4,18 +4,33 @@ import argparse
 import csv
 import json
 import os
+import re
 import sys
-
-from .article import parse_article_detail
-from .browser import CnkiBrowser
-from .exporter import export_csv, export_json
-from .journal import get_all_year_issues, get_papers_list
-from .models import Article, JournalInfo
-from .progress import CrawlProgress
+import time
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+from .aggregates import AGGREGATES_FILE, Aggregates
+from .exporter import export_csv, export_json, export_normalized
+from .intercept import DEFAULT_PROFILE, PROFILES, InterceptProfile
+from .models import ArticleRecord, JournalInfo
+from .progress import MAX_STALENESS, PROGRESS_FILE, CrawlProgress, progress_fingerprint
+from .proxy import ProxyPool
+from .registry import REGISTRY_FILE, STABLE_DETAIL_TEMPLATE, JournalRegistry
+from .retry import DEAD_LETTER_FILE, RetryItem, RetryQueue, load_dead_letters
+from .scheduler import DEFAULT_ISSUE_SIZE, ORDERS, CrawlScheduler, WorkUnit, parse_duration
+from .session import SESSION_FILE
 from .utils import logger, random_delay, setup_logging
 
+if TYPE_CHECKING:
+    from .browser import CnkiBrowser
+
+# 注意：browser / journal / article 依赖 DrissionPage 与 bs4，均在使用处延迟导入，
+# 保证 --daemon 客户端、merge 等轻量子命令启动时不加载这些重依赖。
+
 SIGNED_DETAIL_FLAG = "/knavi/detail?p="
-FALLBACK_DETAIL_TEMPLATE = "https://navi.cnki.net/knavi/journals/{pykm}/detail?uniplatform=NZKPT&language=CHS"
+FALLBACK_DETAIL_TEMPLATE = STABLE_DETAIL_TEMPLATE
+PYKM_CACHE_FILE = "paper_urls.json"
 
 
 def parse_years(year_str: str) -> set[str]:
@@ -27,9 +42,16 @@ def parse_years(year_str: str) -> set[str]:
     return {year_str}
 
 
-def load_journals(csv_path: str) -> list[JournalInfo]:
-    """从 CSV 文件加载期刊列表。"""
-    pykm_fallback = _load_pykm_fallback()
+def load_journals(
+    csv_path: str, registry_path: str = REGISTRY_FILE, pykm_cache: str = PYKM_CACHE_FILE,
+) -> list[JournalInfo]:
+    """从 CSV 文件加载期刊列表。
+
+    优先使用期刊注册表中的 pykm 与稳定详情页 URL（见 resolve 子命令）；
+    未登记且 CSV 中为签名详情页 URL 时，回退到 paper_urls.json 中的历史映射。
+    """
+    registry = JournalRegistry(registry_path)
+    pykm_fallback = _load_pykm_fallback(pykm_cache)
     journals = []
     with open(csv_path, "r", encoding="utf-8-sig") as f:
         reader = csv.DictReader(f)
@@ -37,7 +59,16 @@ def load_journals(csv_path: str) -> list[JournalInfo]:
             name = row["source"].strip()
             url = row["url"].strip()
             pykm = ""
-            if SIGNED_DETAIL_FLAG in url:
+            entry = registry.get(name)
+            if entry is None and registry.unverified(name):
+                logger.warning(
+                    "期刊 %s 在注册表中未确认（候选「%s」），不使用其 pykm",
+                    name, registry.unverified(name).get("candidate", ""),
+                )
+            if entry:
+                pykm = entry["pykm"]
+                url = entry["url"]
+            elif SIGNED_DETAIL_FLAG in url:
                 pykm = pykm_fallback.get(name, "")
                 if pykm:
                     url = FALLBACK_DETAIL_TEMPLATE.format(pykm=pykm)
@@ -50,7 +81,49 @@ def load_journals(csv_path: str) -> list[JournalInfo]:
     return journals
 
 
-def _load_pykm_fallback(cache_path: str = "paper_urls.json") -> dict[str, str]:
+def resolve_journals(
+    names: list[str],
+    registry_path: str = REGISTRY_FILE,
+    force: bool = False,
+    batch_size: int = 10,
+    headless: bool = False,
+    port: int | None = None,
+    escalate_captcha: bool = False,
+) -> JournalRegistry:
+    """批量检索刊名对应的 pykm 并写入期刊注册表。默认只检索尚未登记的刊名。"""
+    registry = JournalRegistry(registry_path)
+    todo = list(names) if force else registry.missing(names)
+    if not todo:
+        logger.info("所有期刊均已登记 (%d 个)", len(names))
+        return registry
+
+    from .browser import CnkiBrowser
+    from .journal import BASE_NAVI, search_journals
+
+    logger.info("检索 %d 个期刊的 pykm...", len(todo))
+    with CnkiBrowser(headless=headless, port=port, escalate_captcha=escalate_captcha) as browser:
+        # searchbaseinfo 接口需在 navi.cnki.net 页面上下文中请求
+        browser.navigate(f"{BASE_NAVI}/knavi/")
+        resolved = search_journals(browser, todo, batch_size=batch_size)
+
+    verified = 0
+    for name, (pykm, matched) in resolved.items():
+        if matched == name:
+            registry.update(name, pykm)
+            verified += 1
+        else:
+            registry.update_unverified(name, pykm, matched)
+    registry.save()
+    logger.info("已登记 %d/%d 个期刊，注册表: %s", verified, len(todo), registry_path)
+    if verified < len(resolved):
+        logger.warning(
+            "%d 个期刊仅有模糊匹配，已登记为未确认（不用于爬取）；请核对刊名后重新运行 resolve",
+            len(resolved) - verified,
+        )
+    return registry
+
+
+def _load_pykm_fallback(cache_path: str = PYKM_CACHE_FILE) -> dict[str, str]:
     """从历史 paper_urls.json 提取 journal -> pykm 映射，用于失效详情页回退。"""
     if not os.path.exists(cache_path):
         return {}
@@ -72,32 +145,219 @@ def _load_pykm_fallback(cache_path: str = "paper_urls.json") -> dict[str, str]:
 # ── 单阶段爬取 ──────────────────────────────────────────────
 
 
+def _open_progress(progress_file: str, output_dir: str, save_interval: float = 0) -> CrawlProgress:
+    """打开进度文件，并挂载导出目录下的统计汇聚（论文入库时增量更新）。
+
+    save_interval > 0 时由后台线程写盘，变更最多延迟 save_interval 秒；调用方负责 close()。
+    """
+    aggregates = Aggregates(os.path.join(output_dir, AGGREGATES_FILE))
+    return CrawlProgress(
+        progress_file, aggregates=aggregates,
+        background=save_interval > 0, max_staleness=save_interval,
+    )
+
+
 def crawl(
     journals: list[JournalInfo],
     target_years: set[str],
     headless: bool = False,
     output_dir: str = "output",
     port: int | None = None,
+    browser: CnkiBrowser | None = None,
+    progress_file: str = PROGRESS_FILE,
+    prefetch: bool = False,
+    retry_queue: RetryQueue | None = None,
+    order: str = "sequential",
+    budget: float | None = None,
+    escalate_captcha: bool = False,
+    load_mode: str = "eager",
+    proxy_pool: ProxyPool | None = None,
+    save_interval: float = MAX_STALENESS,
+    depth: str = "detail",
+    enrich: bool = False,
+    extract: str = "html",
+    intercept: InterceptProfile | None = None,
+    traffic_stats: bool = False,
+    normalized: str | None = None,
+    session_file: str | None = None,
 ) -> None:
-    """单阶段爬取：获取论文列表后立即爬取详情页。"""
-    progress = CrawlProgress()
+    """单阶段爬取：获取论文列表后立即爬取详情页。
+
+    order="sequential"（默认）时逐个期刊识别刊期后随即爬取；其他策略先识别所有期刊的
+    待爬刊期，再由 CrawlScheduler 按 order 排序执行；
+    设定 budget（秒）时在预算耗尽前于刊期边界停止。
+
+    depth="list" 时每个刊期只请求一次论文列表，写入列表级记录（标题、作者预览、页码、
+    栏目）并导出，不访问详情页；enrich=True 时只处理已列出但未完成的刊期，补爬详情
+    （顺序与预算同样由 CrawlScheduler 控制，可随时中断后续跑）。
+
+    传入 browser 时复用该浏览器会话（守护进程模式），结束后不关闭。
+    失败的论文进入重试队列，在后续刊期之间按退避时间穿插重试，全部期刊结束后
+    清空队列；最终仍失败的写入死信文件，可用 --retry-failed 单独处理。
+    """
+    progress = _open_progress(progress_file, output_dir, save_interval)
     progress.set_target_years(target_years)
+    # RetryQueue 定义了 __len__，空队列为假值，不能用 or 取默认
+    if retry_queue is None:
+        retry_queue = RetryQueue()
+
+    started = time.monotonic()
+
+    def discover(active: CnkiBrowser, journal: JournalInfo, seq_start: int) -> list[WorkUnit]:
+        found = _discover_units(active, journal, target_years, progress, seq_start)
+        if depth == "list":
+            found = [u for u in found if not progress.is_issue_listed(u.pykm, u.issue_key)]
+            for u in found:
+                u.expected = 0  # 列表模式每刊期只有一次列表请求
+        elif enrich:
+            found = [u for u in found if progress.is_issue_listed(u.pykm, u.issue_key)]
+        return found
+
+    def execute(active: CnkiBrowser, scheduler: CrawlScheduler) -> bool:
+        """执行调度器中尚未执行的单元。浏览器已关闭时返回 False。"""
+        for unit in scheduler:
+            if not active.is_alive:
+                logger.error("浏览器已关闭，终止爬取")
+                return False
+            unit_started = time.monotonic()
+            if depth == "list":
+                fetched = _list_issue(active, unit, progress)
+            else:
+                fetched = _crawl_issue(active, unit, progress, retry_queue)
+            if fetched is None:
+                return False
+            # 代价模型只计本刊期耗时，不含随后穿插的重试
+            scheduler.record(unit, time.monotonic() - unit_started, fetched)
+
+            # 刊期之间穿插处理已到重试时间的失败论文（预算将尽时留给死信文件）
+            deadline = scheduler.retry_deadline
+            if deadline is None or time.monotonic() < deadline:
+                for item in retry_queue.pop_due():
+                    _retry_article(active, progress, retry_queue, item)
+        return True
+
+    def run(active: CnkiBrowser) -> None:
+        try:
+            # sequential 逐个期刊识别后随即爬取；其他策略需先识别全部期刊再统一排序
+            lazy = order == "sequential"
+            # 预算自 crawl 开始计时（含刊期识别阶段）
+            scheduler = CrawlScheduler([], order=order, budget=budget, started=started)
+            units: list[WorkUnit] = []
+            for journal in journals:
+                if budget is not None and time.monotonic() - started >= budget:
+                    logger.warning("时间预算已用尽，停止识别后续期刊")
+                    break
+                found = discover(active, journal, len(units))
+                units.extend(found)
+                if lazy:
+                    scheduler.extend(found)
+                    if not execute(active, scheduler):
+                        return
+                    if scheduler.stopped_by_budget:
+                        break
+
+            if not lazy:
+                scheduler = CrawlScheduler(units, order=order, budget=budget, started=started)
+                logger.info("共 %d 个待爬刊期，排序策略: %s", len(units), order)
+                if not execute(active, scheduler):
+                    return
 
-    with CnkiBrowser(headless=headless, port=port) as browser:
-        for journal in journals:
-            _crawl_journal(browser, journal, target_years, progress)
+            if scheduler.stopped_by_budget:
+                logger.warning("时间预算已用尽，剩余 %d 篇待重试论文写入死信文件", len(retry_queue))
+            else:
+                _drain_retries(active, progress, retry_queue, scheduler.retry_deadline)
+        finally:
+            retry_queue.flush_dead_letters()
+
+    try:
+        if browser is not None:
+            run(browser)
+        else:
+            from .browser import CnkiBrowser
+
+            with CnkiBrowser(
+                headless=headless, port=port, prefetch=prefetch,
+                escalate_captcha=escalate_captcha, load_mode=load_mode, proxy_pool=proxy_pool,
+                extract=extract, intercept=intercept, traffic_stats=traffic_stats,
+                session_file=session_file,
+            ) as own_browser:
+                run(own_browser)
+    finally:
+        # 含 Ctrl+C：写出后台线程尚未落盘的进度
+        progress.close()
 
     # 导出结果
-    _export_results(progress, output_dir)
+    _export_results(progress, output_dir, normalized)
+
+
+def retry_failed(
+    dead_letter_path: str = DEAD_LETTER_FILE,
+    headless: bool = False,
+    output_dir: str = "output",
+    port: int | None = None,
+    progress_file: str = PROGRESS_FILE,
+    max_attempts: int = 3,
+    retry_delay: float = 60.0,
+    escalate_captcha: bool = False,
+    load_mode: str = "eager",
+    proxy_pool: ProxyPool | None = None,
+    save_interval: float = MAX_STALENESS,
+    extract: str = "html",
+    intercept: InterceptProfile | None = None,
+    traffic_stats: bool = False,
+    normalized: str | None = None,
+    session_file: str | None = None,
+) -> None:
+    """仅处理死信文件中的论文，不重新扫描期刊与进度。仍失败的条目写回死信文件。"""
+    items = load_dead_letters(dead_letter_path)
+    if not items:
+        logger.info("死信文件为空或不存在: %s", dead_letter_path)
+        return
+    logger.info("从 %s 读取 %d 篇待重试论文", dead_letter_path, len(items))
+
+    from .browser import CnkiBrowser
+
+    progress = _open_progress(progress_file, output_dir, save_interval)
+    queue = RetryQueue(max_attempts=max_attempts, base_delay=retry_delay, dead_letter_path=dead_letter_path)
+    # 浏览器启动后才改写死信文件：启动失败时原文件保持不变
+    browser_started = False
+    try:
+        with CnkiBrowser(
+            headless=headless, port=port, escalate_captcha=escalate_captcha,
+            load_mode=load_mode, proxy_pool=proxy_pool, extract=extract,
+            intercept=intercept, traffic_stats=traffic_stats, session_file=session_file,
+        ) as browser:
+            browser_started = True
+            for item in items:
+                if not browser.is_alive:
+                    logger.error("浏览器已关闭，终止爬取")
+                    queue.push(item, "浏览器已关闭")
+                    continue
+                progress.ensure_journal(item.pykm, item.journal)
+                _retry_article(browser, progress, queue, item)
+            _drain_retries(browser, progress, queue)
+    finally:
+        progress.close()
+        if browser_started:
+            # 未成功爬取的条目（含中断时尚未处理或正在处理的）全部写回，成功的从死信文件移除
+            unhandled = [i for i in items if not progress.is_article_crawled(i.pykm, i.key)]
+            queue.flush_dead_letters(replace=True, pending=unhandled)
+
+    _export_results(progress, output_dir, normalized)
 
 
-def _crawl_journal(
+def _discover_units(
     browser: CnkiBrowser,
     journal: JournalInfo,
     target_years: set[str],
     progress: CrawlProgress,
-) -> None:
-    """爬取单个期刊的所有目标刊期。"""
+    seq_start: int = 0,
+) -> list[WorkUnit]:
+    """识别单个期刊在目标年份中尚未完成的刊期，估计各刊期待爬论文数。"""
+    from bs4 import BeautifulSoup
+
+    from .journal import get_all_year_issues
+
     logger.info("=" * 60)
     logger.info("期刊: %s", journal.name)
 
@@ -106,9 +366,8 @@ def _crawl_journal(
         html = browser.navigate(journal.url)
     except Exception as e:
         logger.error("访问期刊详情页失败: %s", e)
-        return
+        return []
 
-    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html, "lxml")
 
     time_input = soup.find("input", id="time")
@@ -117,10 +376,10 @@ def _crawl_journal(
         logger.warning("未找到 time 令牌")
 
     pykm_input = soup.find("input", id="pykm")
-    pykm = pykm_input["value"] if pykm_input and pykm_input.get("value") else ""
+    pykm = pykm_input["value"] if pykm_input and pykm_input.get("value") else journal.pykm
     if not pykm:
         logger.error("无法获取 pykm，跳过期刊 %s", journal.name)
-        return
+        return []
 
     journal.pykm = pykm
     logger.info("pykm=%s, time_token长度=%d", pykm, len(time_token))
@@ -132,102 +391,267 @@ def _crawl_journal(
         year_issues = get_all_year_issues(browser, pykm, time_token, target_years)
     except Exception as e:
         logger.error("获取年份列表失败: %s", e)
-        return
+        return []
+
+    # 预计篇数：已有记录的刊期按「记录数 - 已爬取数」，否则取该刊历史平均每期篇数
+    counts = progress.issue_article_counts(pykm)
+    sizes = [total for total, _ in counts.values()]
+    avg_size = sum(sizes) / len(sizes) if sizes else DEFAULT_ISSUE_SIZE
 
-    # 遍历每个刊期
+    units = []
     for yi in year_issues:
-        year, issue, value = yi["year"], yi["issue"], yi["value"]
-        issue_key = f"{year}_{issue}"
+        unit = WorkUnit(
+            journal=journal,
+            pykm=pykm,
+            year=yi["year"],
+            issue=yi["issue"],
+            issue_id=yi.get("issue_id", ""),
+            value=yi["value"],
+            seq=seq_start + len(units),
+        )
+        if progress.is_issue_completed(pykm, unit.issue_key):
+            logger.info("  跳过已完成: %s", unit.issue_key)
+            continue
+        if unit.issue_key in counts:
+            total, crawled = counts[unit.issue_key]
+            unit.expected = max(total, avg_size) - crawled
+        else:
+            unit.expected = avg_size
+        units.append(unit)
+    return units
+
 
+def _list_issue(browser: CnkiBrowser, unit: WorkUnit, progress: CrawlProgress) -> int | None:
+    """列表模式：只获取刊期论文列表并写入列表级记录。返回新增记录数；浏览器已关闭时返回 None。"""
+    journal, pykm = unit.journal, unit.pykm
+
+    logger.info("  获取 %s %s 论文列表...", journal.name, unit.issue_key)
+    try:
+        random_delay(1.0, 2.0)
+        papers = _get_papers_with_retry(browser, journal.url, pykm, unit.value)
+    except Exception as e:
+        logger.error("  获取论文列表失败: %s", e)
         if not browser.is_alive:
             logger.error("浏览器已关闭，终止爬取")
-            return
+            return None
+        return 0
+
+    progress.backfill_filenames(pykm, unit.year, unit.issue, papers)
+    records = [
+        ArticleRecord.from_dict({
+            "journal": journal.name,
+            "pykm": pykm,
+            "year": unit.year,
+            "issue": unit.issue,
+            "title": paper["title"],
+            "url": paper["url"],
+            "filename": paper.get("filename", ""),
+            "authors": [a.strip() for a in re.split(r"[;；]", paper.get("authors_preview", "")) if a.strip()],
+            "column": paper.get("column", ""),
+            "pages": paper.get("pages", ""),
+        })
+        for paper in papers
+        if paper["url"]
+    ]
+    added = progress.add_listed_articles(pykm, records)
+    progress.mark_issue_listed(pykm, unit.issue_key)
+    logger.info("  该期共 %d 篇论文，新增列表级记录 %d 条", len(papers), added)
+    return added
+
+
+def _crawl_issue(
+    browser: CnkiBrowser,
+    unit: WorkUnit,
+    progress: CrawlProgress,
+    retry_queue: RetryQueue,
+) -> int | None:
+    """爬取单个刊期。返回本次成功爬取的论文数；浏览器已关闭时返回 None。"""
+    journal, pykm, year, issue = unit.journal, unit.pykm, unit.year, unit.issue
+    issue_key = unit.issue_key
+
+    logger.info("  获取 %s %s 论文列表...", journal.name, issue_key)
+    try:
+        random_delay(1.0, 2.0)
+        papers = _get_papers_with_retry(browser, journal.url, pykm, unit.value)
+    except Exception as e:
+        logger.error("  获取论文列表失败: %s", e)
+        if not browser.is_alive:
+            logger.error("浏览器已关闭，终止爬取")
+            return None
+        return 0
+
+    logger.info("  该期共 %d 篇论文", len(papers))
+    progress.backfill_filenames(pykm, year, issue, papers)
 
-        if progress.is_issue_completed(pykm, issue_key):
-            logger.info("  跳过已完成: %s", issue_key)
+    # 立即逐篇爬取详情
+    pending = []
+    for idx, paper in enumerate(papers):
+        if not paper["url"]:
             continue
+        if progress.is_article_crawled(pykm, paper.get("filename") or paper["url"]):
+            logger.debug("  跳过已爬取: %s", paper["title"][:40])
+            continue
+        pending.append((idx, paper))
+
+    all_success = True
+    fetched = 0
+    for n, (idx, paper) in enumerate(pending):
+        url = paper["url"]
+        title = paper["title"]
+
+        if not browser.is_alive:
+            logger.error("浏览器已关闭，终止爬取")
+            return None
+
+        logger.info("  [%d/%d] %s", idx + 1, len(papers), title[:50])
+        if not browser.is_prefetched(url):
+            random_delay(3.0, 6.0)
 
-        logger.info("  获取 %s 论文列表...", issue_key)
+        next_url = pending[n + 1][1]["url"] if n + 1 < len(pending) else None
         try:
-            random_delay(1.0, 2.0)
-            papers = _get_papers_with_retry(browser, journal.url, pykm, value)
+            article_data = _fetch_article(browser, journal.name, pykm, year, issue, paper, next_url)
         except Exception as e:
-            logger.error("  获取论文列表失败: %s", e)
+            logger.error("  爬取失败: %s", e)
+            all_success = False
             if not browser.is_alive:
                 logger.error("浏览器已关闭，终止爬取")
-                return
+                return None
+            # 记录失败并进入重试队列，不阻塞后续
+            _record_failure(progress, retry_queue, RetryItem(
+                journal=journal.name,
+                pykm=pykm,
+                year=year,
+                issue=issue,
+                title=title,
+                url=url,
+                filename=paper.get("filename", ""),
+                column=paper.get("column", ""),
+                pages=paper.get("pages", ""),
+            ), str(e))
             continue
 
-        logger.info("  该期共 %d 篇论文", len(papers))
+        progress.add_article(pykm, article_data)
+        fetched += 1
 
-        # 立即逐篇爬取详情
-        all_success = True
-        for idx, paper in enumerate(papers):
-            url = paper["url"]
-            title = paper["title"]
+    if all_success:
+        progress.mark_issue_completed(pykm, issue_key)
+    else:
+        retry_queue.defer_issue(pykm, issue_key)
 
-            if not url:
-                continue
+    return fetched
 
-            if not browser.is_alive:
-                logger.error("浏览器已关闭，终止爬取")
-                return
 
-            if progress.is_article_crawled(pykm, url):
-                logger.debug("  跳过已爬取: %s", title[:40])
-                continue
+def _fetch_article(
+    browser: CnkiBrowser,
+    journal_name: str,
+    pykm: str,
+    year: str,
+    issue: str,
+    paper: dict,
+    next_url: str | None = None,
+) -> dict:
+    """爬取并解析单篇论文详情，返回进度记录。失败（含验证码未解决）时抛出异常。"""
+    from .article import parse_article_detail
+
+    if browser.extract_mode == "js":
+        detail, is_captcha = browser.extract_article(paper["url"])
+    else:
+        html, is_captcha = browser.get_article_html(paper["url"])
+
+    # 当前页内容已取到，后台标签页开始加载下一篇（预加载模式下生效）
+    if next_url:
+        browser.prefetch(next_url)
+
+    if is_captcha:
+        raise RuntimeError("验证码未能解决")
+
+    if browser.extract_mode != "js":
+        detail = parse_article_detail(html)
+    record = {
+        "journal": journal_name,
+        "pykm": pykm,
+        "year": year,
+        "issue": issue,
+        "title": detail.get("title") or paper["title"],
+        "url": paper["url"],
+        "filename": paper.get("filename", ""),
+        "authors": detail.get("authors", []),
+        "institutions": detail.get("institutions", []),
+        "abstract": detail.get("abstract", ""),
+        "keywords": detail.get("keywords", []),
+        "funds": detail.get("funds", []),
+        "clc_code": detail.get("clc_code", ""),
+        "column": paper.get("column", ""),
+        "pages": paper.get("pages", ""),
+        "detail_crawled": True,
+    }
+    return record
+
+
+def _record_failure(progress: CrawlProgress, retry_queue: RetryQueue, item: RetryItem, error: str) -> None:
+    """记录失败原因并入重试队列。已有记录（如列表级记录的作者、页码）保留，只更新错误信息。"""
+    existing = progress.get_article(item.pykm, item.filename) or progress.get_article(item.pykm, item.url)
+    if existing is not None:
+        record = replace(existing, crawl_error=error, updated_at="")
+    else:
+        record = ArticleRecord(
+            journal=item.journal,
+            pykm=item.pykm,
+            year=item.year,
+            issue=item.issue,
+            title=item.title,
+            url=item.url,
+            filename=item.filename,
+            column=item.column,
+            pages=item.pages,
+            crawl_error=error,
+        )
+    progress.add_article(item.pykm, record)
+    retry_queue.push(item, error)
+
+
+def _retry_article(browser: CnkiBrowser, progress: CrawlProgress, retry_queue: RetryQueue, item: RetryItem) -> None:
+    """重试单篇论文（已在其他运行中爬取成功的跳过）；成功后若所属刊期已无失败条目则标记完成。"""
+    if progress.is_article_crawled(item.pykm, item.key):
+        logger.info("  [跳过] 已爬取: %s", item.title[:50])
+    else:
+        logger.info("  [重试] %s", item.title[:50])
+        random_delay(3.0, 6.0)
+        try:
+            article_data = _fetch_article(browser, item.journal, item.pykm, item.year, item.issue, item.to_paper())
+        except Exception as e:
+            logger.error("  重试失败: %s", e)
+            _record_failure(progress, retry_queue, item, str(e))
+            return
+        progress.add_article(item.pykm, article_data)
 
-            logger.info("  [%d/%d] %s", idx + 1, len(papers), title[:50])
-            random_delay(3.0, 6.0)
+    if retry_queue.settle_issue(item.pykm, item.issue_key):
+        progress.mark_issue_completed(item.pykm, item.issue_key)
 
-            try:
-                html, is_captcha = browser.get_article_html(url)
 
-                if is_captcha:
-                    logger.error("  验证码未能解决，跳过此论文")
-                    all_success = False
-                    continue
+def _drain_retries(
+    browser: CnkiBrowser,
+    progress: CrawlProgress,
+    retry_queue: RetryQueue,
+    deadline: float | None = None,
+) -> None:
+    """等待并处理重试队列中的全部条目。
 
-                detail = parse_article_detail(html)
-
-                article_data = {
-                    "journal": journal.name,
-                    "pykm": pykm,
-                    "year": year,
-                    "issue": issue,
-                    "title": detail.get("title") or title,
-                    "url": url,
-                    "authors": detail.get("authors", []),
-                    "institutions": detail.get("institutions", []),
-                    "abstract": detail.get("abstract", ""),
-                    "keywords": detail.get("keywords", []),
-                    "funds": detail.get("funds", []),
-                    "clc_code": detail.get("clc_code", ""),
-                    "column": paper.get("column", ""),
-                    "detail_crawled": True,
-                }
-                progress.add_article(pykm, article_data)
-
-            except Exception as e:
-                logger.error("  爬取失败: %s", e)
-                all_success = False
-                if not browser.is_alive:
-                    logger.error("浏览器已关闭，终止爬取")
-                    return
-                # 记录失败但不阻塞后续
-                progress.add_article(pykm, {
-                    "journal": journal.name,
-                    "pykm": pykm,
-                    "year": year,
-                    "issue": issue,
-                    "title": title,
-                    "url": url,
-                    "detail_crawled": False,
-                    "crawl_error": str(e),
-                })
-
-        if all_success:
-            progress.mark_issue_completed(pykm, issue_key)
+    设定 deadline（time.monotonic()，见 CrawlScheduler.retry_deadline）时，到期或下一篇的
+    重试时间晚于 deadline 即停止，剩余条目留在队列中，由调用方写入死信文件。
+    """
+    while len(retry_queue):
+        if not browser.is_alive:
+            logger.error("浏览器已关闭，剩余 %d 篇写入死信文件", len(retry_queue))
+            return
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.warning("时间预算已用尽，剩余 %d 篇待重试论文写入死信文件", len(retry_queue))
+            return
+        item = retry_queue.pop_next(deadline)
+        if item is None:
+            logger.warning("剩余 %d 篇待重试论文的重试时间超出预算，写入死信文件", len(retry_queue))
+            return
+        _retry_article(browser, progress, retry_queue, item)
 
 
 def _get_papers_with_retry(
@@ -241,6 +665,8 @@ def _get_papers_with_retry(
     详情页在 kns 域名，论文列表接口在 navi 域名。若当前页面已切到详情页，
     run_js(fetch) 可能触发跨域失败，因此重回期刊页后再试。
     """
+    from .journal import get_papers_list
+
     try:
         return get_papers_list(browser, pykm, year_issue_value)
     except Exception as err:
@@ -252,46 +678,35 @@ def _get_papers_with_retry(
         return get_papers_list(browser, pykm, year_issue_value)
 
 
-def _export_results(progress: CrawlProgress, output_dir: str) -> None:
-    """将已爬取的论文导出为 JSON 和 CSV。"""
+def _export_results(progress: CrawlProgress, output_dir: str, normalized: str | None = None) -> None:
+    """将已爬取的论文导出为 JSON 和 CSV。列表模式列出的刊期中，尚未补爬详情的论文以列表级记录导出。
+
+    normalized 为 "ndjson" 或 "gzip" 时另导出规范化 NDJSON（实体字典 + 论文行）。
+    """
     all_data = progress.get_all_articles()
-    crawled = [p for p in all_data if p.get("detail_crawled")]
-    if not crawled:
+    if progress.has_listed_issues():
+        articles = [r for r in all_data if r.detail_crawled or progress.is_listed_record(r)]
+    else:
+        articles = [r for r in all_data if r.detail_crawled]
+    if not articles:
         logger.info("没有已完成的论文可导出")
         return
 
-    articles = []
-    for p in crawled:
-        articles.append(Article(
-            journal=p["journal"],
-            year=p["year"],
-            issue=p["issue"],
-            title=p["title"],
-            authors=p.get("authors", []),
-            institutions=p.get("institutions", []),
-            abstract=p.get("abstract", ""),
-            keywords=p.get("keywords", []),
-            funds=p.get("funds", []),
-            clc_code=p.get("clc_code", ""),
-            url=p["url"],
-        ))
-
-    # 按期刊+年份分组导出 JSON
-    journal_year_groups: dict[str, list[Article]] = {}
+    # 按期刊+年份分组导出 JSON（直接导出进度中的紧凑记录，不再复制为 Article）
+    journal_year_groups: dict[tuple[str, str], list[ArticleRecord]] = {}
     for a in articles:
-        jy_key = f"{a.journal}_{a.year}"
-        journal_year_groups.setdefault(jy_key, []).append(a)
+        journal_year_groups.setdefault((a.journal, a.year), []).append(a)
 
-    pykm_map = {p["journal"]: p.get("pykm", "") for p in all_data}
+    pykm_map = {r.journal: r.pykm for r in all_data}
 
-    for jy_key, arts in journal_year_groups.items():
-        j_name = arts[0].journal
-        y = arts[0].year
+    for (j_name, y), arts in journal_year_groups.items():
         pykm = pykm_map.get(j_name, "UNKNOWN")
         export_json(arts, j_name, pykm, y, output_dir)
 
     # 导出汇总 CSV
     export_csv(articles, output_dir)
+    if normalized:
+        export_normalized(articles, output_dir, compress=normalized == "gzip")
 
     stats = progress.get_stats()
     logger.info("导出完成: %d 篇已爬取, %d 篇剩余", stats["crawled"], stats["remaining"])
@@ -300,7 +715,270 @@ def _export_results(progress: CrawlProgress, output_dir: str) -> None:
 # ── CLI 入口 ────────────────────────────────────────────────
 
 
+def _main_merge(argv: list[str]) -> None:
+    """merge 子命令：合并多个进度文件。"""
+    parser = argparse.ArgumentParser(
+        prog="cnki_crawler merge",
+        description="合并多个分片/并行运行产生的进度文件（按论文去重，合并已完成刊期）",
+    )
+    parser.add_argument("sources", nargs="+", help="待合并的进度文件路径")
+    parser.add_argument(
+        "-o", "--output", type=str, default=PROGRESS_FILE,
+        help=f"合并结果输出路径 (默认: {PROGRESS_FILE})",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="显示详细日志",
+    )
+
+    args = parser.parse_args(argv)
+    setup_logging(args.verbose)
+
+    missing = [p for p in args.sources if not os.path.exists(p)]
+    if missing:
+        parser.error(f"进度文件不存在: {', '.join(missing)}")
+
+    from .merge import merge_progress
+
+    merge_progress(args.sources, args.output)
+
+
+def _main_daemon(argv: list[str]) -> None:
+    """daemon 子命令：启动常驻浏览器守护进程，接收爬取任务。"""
+    from .daemon import DEFAULT_LISTEN
+
+    parser = argparse.ArgumentParser(
+        prog="cnki_crawler daemon",
+        description="启动常驻浏览器守护进程，通过本地 HTTP 接口排队执行爬取任务",
+    )
+    parser.add_argument(
+        "--listen", type=str, default=DEFAULT_LISTEN,
+        help=f"监听地址 host:port (默认: {DEFAULT_LISTEN})",
+    )
+    parser.add_argument(
+        "--port", type=int, default=None,
+        help="接管已运行 Chrome 的调试端口（如 9222）",
+    )
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="无头模式（无浏览器窗口）",
+    )
+    parser.add_argument(
+        "--escalate-captcha", action="store_true",
+        help="配合 --headless：遇到验证码时弹出有头浏览器人工验证，完成后回写 Cookie 继续无头爬取",
+    )
+    parser.add_argument(
+        "--prefetch", action="store_true",
+        help="预加载模式：处理当前论文时在后台标签页加载下一篇",
+    )
+    parser.add_argument(
+        "--load-mode", type=str, choices=("eager", "none", "normal"), default="eager",
+        help="详情页加载策略：eager（默认，DOM 就绪即读取）、none（元信息出现即读取）、normal（等待全部资源）",
+    )
+    parser.add_argument(
+        "--extract", type=str, choices=("html", "js"), default="html",
+        help="详情提取方式：html（默认，回传整页 HTML 由 Python 解析）、js（页面内提取，只回传字段 JSON）",
+    )
+    parser.add_argument(
+        "--intercept", type=str, default=DEFAULT_PROFILE,
+        help=f"请求拦截配置：{'、'.join(PROFILES)}（默认 {DEFAULT_PROFILE}），或 JSON 配置文件路径",
+    )
+    parser.add_argument(
+        "--traffic-stats", action="store_true",
+        help="按域名与资源类型统计请求数与传输字节数、页面平均加载耗时，结束时输出",
+    )
+    parser.add_argument(
+        "--session-file", type=str, nargs="?", const=SESSION_FILE, default=None,
+        help=f"启用浏览器会话快照：退出时加密保存 Cookie 与 localStorage，下次启动时恢复"
+             f"（不带路径时为 {SESSION_FILE}；默认不启用）",
+    )
+    parser.add_argument(
+        "--proxy-file", type=str, default=None,
+        help="代理池文件（每行一个代理，可选第二列为每小时请求预算）；按健康分自动轮换",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="显示详细日志",
+    )
+
+    args = parser.parse_args(argv)
+    setup_logging(args.verbose)
+
+    from .daemon import CrawlDaemon
+
+    host, _, listen_port = args.listen.rpartition(":")
+    daemon = CrawlDaemon(
+        host or "127.0.0.1", int(listen_port),
+        headless=args.headless, browser_port=args.port, prefetch=args.prefetch,
+        escalate_captcha=args.escalate_captcha, load_mode=args.load_mode, extract=args.extract,
+        intercept=_load_intercept(parser, args.intercept), traffic_stats=args.traffic_stats,
+        session_file=args.session_file,
+        proxy_pool=ProxyPool.from_file(args.proxy_file) if args.proxy_file else None,
+    )
+    daemon.serve_forever()
+
+
+def _load_intercept(parser: argparse.ArgumentParser, spec: str) -> InterceptProfile:
+    try:
+        return InterceptProfile.load(spec)
+    except (ValueError, IOError) as e:
+        parser.error(str(e))
+
+
+def _submit_to_daemon(args: argparse.Namespace) -> None:
+    """将爬取任务提交给守护进程（瘦客户端，不加载浏览器相关依赖）。"""
+    from .client import DaemonClient
+
+    client = DaemonClient(args.daemon)
+    job = client.submit({
+        "years": args.year,
+        "journal": args.journal,
+        "journals_csv": os.path.abspath(args.journals_csv),
+        "output_dir": os.path.abspath(args.output_dir),
+        "progress_file": os.path.abspath(PROGRESS_FILE),
+        "registry_file": os.path.abspath(REGISTRY_FILE),
+        "pykm_cache": os.path.abspath(PYKM_CACHE_FILE),
+        "failed_file": os.path.abspath(args.failed_file),
+        "max_attempts": args.max_attempts,
+        "retry_delay": args.retry_delay,
+        "order": args.order,
+        "budget": args.budget,
+        "depth": args.depth,
+        "enrich": args.enrich,
+        "normalized": args.normalized,
+    })
+    logger.info("任务已提交: %s（队列中前方 %d 个任务）", job["id"], job.get("queued_ahead", 0))
+    if args.detach:
+        return
+
+    try:
+        job = client.wait(job["id"], timeout=args.wait_timeout)
+    except TimeoutError as e:
+        logger.error("%s；任务仍在守护进程中，可用 GET /jobs/%s 查询", e, job["id"])
+        sys.exit(1)
+    if job["status"] != "done":
+        logger.error("任务失败: %s", job.get("error", ""))
+        sys.exit(1)
+    logger.info("任务完成: %s", job["id"])
+
+
+def _main_resolve(argv: list[str]) -> None:
+    """resolve 子命令：按刊名批量检索 pykm，写入期刊注册表。"""
+    parser = argparse.ArgumentParser(
+        prog="cnki_crawler resolve",
+        description="按刊名批量检索 pykm（searchbaseinfo 接口），写入期刊注册表",
+    )
+    parser.add_argument(
+        "names", nargs="*",
+        help="待检索的刊名；省略时使用 --journals-csv 中的全部期刊",
+    )
+    parser.add_argument(
+        "--journals-csv", type=str, default="journals.csv",
+        help="期刊列表 CSV 文件路径 (默认: journals.csv)",
+    )
+    parser.add_argument(
+        "--registry", type=str, default=REGISTRY_FILE,
+        help=f"期刊注册表路径 (默认: {REGISTRY_FILE})",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=10,
+        help="每批并发检索的刊名数 (默认: 10)",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="重新检索已登记的期刊（刷新验证时间）",
+    )
+    parser.add_argument(
+        "--port", type=int, default=None,
+        help="接管已运行 Chrome 的调试端口（如 9222）",
+    )
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="无头模式（无浏览器窗口）",
+    )
+    parser.add_argument(
+        "--escalate-captcha", action="store_true",
+        help="配合 --headless：遇到验证码时弹出有头浏览器人工验证，完成后回写 Cookie 继续无头爬取",
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="显示详细日志",
+    )
+
+    args = parser.parse_args(argv)
+    setup_logging(args.verbose)
+
+    names = args.names
+    if not names:
+        with open(args.journals_csv, "r", encoding="utf-8-sig") as f:
+            names = [row["source"].strip() for row in csv.DictReader(f)]
+
+    resolve_journals(
+        names, args.registry, force=args.force, batch_size=args.batch_size,
+        headless=args.headless, port=args.port, escalate_captcha=args.escalate_captcha,
+    )
+
+
+def _main_stats(argv: list[str]) -> None:
+    """stats 子命令：读取预计算统计文件并输出。"""
+    parser = argparse.ArgumentParser(
+        prog="cnki_crawler stats",
+        description="输出预计算统计（期刊/年份/栏目篇数、高频关键词、机构、基金类别）",
+    )
+    parser.add_argument(
+        "--output-dir", type=str, default="output",
+        help="统计文件所在的输出目录 (默认: output)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=20,
+        help="关键词/机构/基金类别各显示前 N 项 (默认: 20)",
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="强制从进度文件重新计算统计（进度文件变化时会自动重新计算）",
+    )
+    parser.add_argument(
+        "--json", action="store_true",
+        help="以 JSON 输出完整统计",
+    )
+
+    args = parser.parse_args(argv)
+    setup_logging(False)
+
+    aggregates = Aggregates(os.path.join(args.output_dir, AGGREGATES_FILE))
+    if args.rebuild or not aggregates.matches(progress_fingerprint(PROGRESS_FILE)):
+        aggregates.rebuild(CrawlProgress(PROGRESS_FILE).get_all_articles())
+        aggregates.save(source=progress_fingerprint(PROGRESS_FILE))
+
+    if args.json:
+        print(json.dumps(aggregates.to_dict(), ensure_ascii=False, indent=2))
+        return
+
+    print(f"已爬取论文: {aggregates.total}")
+    print("\n期刊 / 年份 篇数:")
+    for journal, years in sorted(aggregates.articles.items()):
+        for year, columns in sorted(years.items()):
+            print(f"  {journal}  {year}  {sum(columns.values())}")
+    for name, label in (("keywords", "高频关键词"), ("institutions", "机构发文"), ("fund_agencies", "基金类别")):
+        print(f"\n{label} (前 {args.top}):")
+        for key, count in aggregates.top(name, args.top):
+            print(f"  {count:>6}  {key}")
+
+
+SUBCOMMANDS = {
+    "merge": _main_merge,
+    "daemon": _main_daemon,
+    "resolve": _main_resolve,
+    "stats": _main_stats,
+}
+
+
 def main() -> None:
+    argv = sys.argv[1:]
+    if argv and argv[0] in SUBCOMMANDS:
+        SUBCOMMANDS[argv[0]](argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         description="CNKI 期刊论文元信息爬虫（单阶段执行）",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -318,14 +996,33 @@ def main() -> None:
   # 接管已运行的 Chrome
   uv run python -m cnki_crawler --year 2025 --port 9222
 
+  # 3 小时维护窗口内，最新刊期优先
+  uv run python -m cnki_crawler --year 2020-2025 --order newest --budget 3h
+
   # 仅导出（不爬取）
   uv run python -m cnki_crawler --export-only
 
   # 无头模式
   uv run python -m cnki_crawler --year 2025 --headless
 
+  # 仅重试死信文件（failed_items.json）中的论文
+  uv run python -m cnki_crawler --retry-failed
+
   # 显示详细日志
   uv run python -m cnki_crawler --year 2025 -v
+
+  # 启动守护进程，并将任务提交给它（复用已预热的浏览器）
+  uv run python -m cnki_crawler daemon
+  uv run python -m cnki_crawler --year 2025 --daemon http://127.0.0.1:8765
+
+  # 批量检索期刊 pykm，写入期刊注册表（之后启动无需逐刊识别）
+  uv run python -m cnki_crawler resolve
+
+  # 查看预计算统计
+  uv run python -m cnki_crawler stats --top 30
+
+  # 合并多个进度文件
+  uv run python -m cnki_crawler merge a/crawl_progress.json b/crawl_progress.json
         """,
     )
     parser.add_argument(
@@ -352,26 +1049,140 @@ def main() -> None:
         "--headless", action="store_true",
         help="无头模式（无浏览器窗口）",
     )
+    parser.add_argument(
+        "--escalate-captcha", action="store_true",
+        help="配合 --headless：遇到验证码时弹出有头浏览器人工验证，完成后回写 Cookie 继续无头爬取",
+    )
+    parser.add_argument(
+        "--prefetch", action="store_true",
+        help="预加载模式：处理当前论文时在后台标签页加载下一篇",
+    )
+    parser.add_argument(
+        "--load-mode", type=str, choices=("eager", "none", "normal"), default="eager",
+        help="详情页加载策略：eager（默认，DOM 就绪即读取）、none（元信息出现即读取）、normal（等待全部资源）",
+    )
+    parser.add_argument(
+        "--extract", type=str, choices=("html", "js"), default="html",
+        help="详情提取方式：html（默认，回传整页 HTML 由 Python 解析）、js（页面内提取，只回传字段 JSON）",
+    )
+    parser.add_argument(
+        "--intercept", type=str, default=DEFAULT_PROFILE,
+        help=f"请求拦截配置：{'、'.join(PROFILES)}（默认 {DEFAULT_PROFILE}），或 JSON 配置文件路径",
+    )
+    parser.add_argument(
+        "--traffic-stats", action="store_true",
+        help="按域名与资源类型统计请求数与传输字节数、页面平均加载耗时，结束时输出",
+    )
+    parser.add_argument(
+        "--session-file", type=str, nargs="?", const=SESSION_FILE, default=None,
+        help=f"启用浏览器会话快照：退出时加密保存 Cookie 与 localStorage，下次启动时恢复"
+             f"（不带路径时为 {SESSION_FILE}；默认不启用）",
+    )
+    parser.add_argument(
+        "--proxy-file", type=str, default=None,
+        help="代理池文件（每行一个代理，可选第二列为每小时请求预算）；按健康分自动轮换",
+    )
+    parser.add_argument(
+        "--save-interval", type=float, default=MAX_STALENESS,
+        help=f"进度由后台线程写盘，变更最多延迟的秒数；0 为每次变更同步写盘 (默认: {MAX_STALENESS:g})",
+    )
+    parser.add_argument(
+        "--order", type=str, choices=ORDERS, default="sequential",
+        help="刊期调度顺序：sequential（默认，按 CSV 与刊期列表顺序）、newest（最新刊期优先）、"
+             "yield（预计篇数多的刊期优先）、round-robin（各期刊轮流）",
+    )
+    parser.add_argument(
+        "--budget", type=str, default=None,
+        help="时间预算，如 3h、90m、1h30m；预算不足时在刊期边界停止",
+    )
+    parser.add_argument(
+        "--depth", type=str, choices=("detail", "list"), default="detail",
+        help="爬取深度：detail（默认，逐篇爬取详情页）、list（每刊期一次列表请求，只记录列表级信息）",
+    )
+    parser.add_argument(
+        "--enrich", action="store_true",
+        help="补爬详情：只处理 --depth list 已列出但未完成的刊期（可中断续跑，顺序由 --order 决定）",
+    )
     parser.add_argument(
         "--export-only", action="store_true",
         help="仅导出已有进度，不执行爬取",
     )
+    parser.add_argument(
+        "--normalized", type=str, choices=("ndjson", "gzip"), default=None,
+        help="另导出规范化 NDJSON：作者、单位、关键词、基金以整数 ID 编码（gzip 为压缩版）",
+    )
+    parser.add_argument(
+        "--retry-failed", action="store_true",
+        help="仅重试死信文件中的论文，不重新扫描期刊",
+    )
+    parser.add_argument(
+        "--failed-file", type=str, default=DEAD_LETTER_FILE,
+        help=f"死信文件路径 (默认: {DEAD_LETTER_FILE})",
+    )
+    parser.add_argument(
+        "--max-attempts", type=int, default=3,
+        help="单篇论文最大尝试次数，超过后写入死信文件 (默认: 3)",
+    )
+    parser.add_argument(
+        "--retry-delay", type=float, default=60.0,
+        help="首次重试前等待秒数，之后每次翻倍 (默认: 60)",
+    )
+    parser.add_argument(
+        "--daemon", type=str, default=os.environ.get("CNKI_CRAWLER_DAEMON"),
+        help="提交任务到守护进程而非本地启动浏览器，如 http://127.0.0.1:8765"
+             "（默认读取环境变量 CNKI_CRAWLER_DAEMON）",
+    )
+    parser.add_argument(
+        "--detach", action="store_true",
+        help="配合 --daemon：提交后立即返回，不等待任务完成",
+    )
+    parser.add_argument(
+        "--wait-timeout", type=str, default="24h",
+        help="配合 --daemon：最长等待任务完成的时间，如 90m、6h（默认 24h）",
+    )
     parser.add_argument(
         "-v", "--verbose", action="store_true",
         help="显示详细日志",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     setup_logging(args.verbose)
 
     if args.export_only:
-        progress = CrawlProgress()
-        _export_results(progress, args.output_dir)
+        progress = _open_progress(PROGRESS_FILE, args.output_dir)
+        _export_results(progress, args.output_dir, args.normalized)
+        return
+
+    proxy_pool = ProxyPool.from_file(args.proxy_file) if args.proxy_file else None
+    intercept = _load_intercept(parser, args.intercept)
+
+    if args.retry_failed:
+        retry_failed(
+            args.failed_file, headless=args.headless, output_dir=args.output_dir, port=args.port,
+            max_attempts=args.max_attempts, retry_delay=args.retry_delay,
+            escalate_captcha=args.escalate_captcha, load_mode=args.load_mode, proxy_pool=proxy_pool,
+            save_interval=args.save_interval, extract=args.extract,
+            intercept=intercept, traffic_stats=args.traffic_stats, normalized=args.normalized,
+            session_file=args.session_file,
+        )
         return
 
+    if args.enrich and args.depth == "list":
+        parser.error("--enrich 与 --depth list 不能同时使用")
+
     if not args.year:
         parser.error("请指定 --year 参数（如 --year 2025 或 --year 2020-2025）")
 
+    if args.daemon:
+        try:
+            args.wait_timeout = parse_duration(args.wait_timeout)
+            if args.budget:
+                parse_duration(args.budget)
+        except ValueError as e:
+            parser.error(str(e))
+        _submit_to_daemon(args)
+        return
+
     journals = load_journals(args.journals_csv)
     logger.info("已加载 %d 个期刊", len(journals))
 
@@ -385,7 +1196,27 @@ def main() -> None:
     target_years = parse_years(args.year)
     logger.info("目标年份: %s", sorted(target_years))
 
-    crawl(journals, target_years, headless=args.headless, output_dir=args.output_dir, port=args.port)
+    budget = None
+    if args.budget:
+        try:
+            budget = parse_duration(args.budget)
+        except ValueError as e:
+            parser.error(str(e))
+
+    retry_queue = RetryQueue(
+        max_attempts=args.max_attempts,
+        base_delay=args.retry_delay,
+        dead_letter_path=args.failed_file,
+    )
+    crawl(
+        journals, target_years, headless=args.headless, output_dir=args.output_dir,
+        port=args.port, prefetch=args.prefetch, retry_queue=retry_queue,
+        order=args.order, budget=budget, escalate_captcha=args.escalate_captcha,
+        load_mode=args.load_mode, proxy_pool=proxy_pool, save_interval=args.save_interval,
+        depth=args.depth, enrich=args.enrich, extract=args.extract,
+        intercept=intercept, traffic_stats=args.traffic_stats, normalized=args.normalized,
+        session_file=args.session_file,
+    )
 
 
 if __name__ == "__main__":
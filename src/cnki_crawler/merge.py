@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from typing import Iterator
+
+from .models import ArticleRecord
+from .utils import logger
+
+_CHUNK = 1 << 16
+_WS = " \t\r\n"
+
+
+def merge_progress(sources: list[str], dest: str) -> dict:
+    """合并多个进度文件为一个，返回统计信息。
+
+    分两遍处理，内存占用与单个期刊的论文数成正比，而非与语料总量成正比：
+    1. 逐个源文件流式读取，论文记录按期刊追加写入临时分片文件，内存中只保留
+       期刊名与刊期列表；
+    2. 逐个期刊读取分片、去重并流式写出，写完即删除分片。
+
+    同一论文（按 ArticleRecord.key 去重）优先保留 detail_crawled=True 的记录，
+    其次保留 updated_at 最新的记录，仍相同时以后给出的源文件为准。
+    completed_issues 与 listed_issues 取并集。
+    """
+    dir_name = os.path.dirname(dest) or "."
+    os.makedirs(dir_name, exist_ok=True)
+    target_years: set[str] = set()
+    # pykm -> {"name": str, "completed_issues" / "listed_issues": dict(有序集合), "spills": [分片路径]}
+    journals: dict[str, dict] = {}
+    total_in = 0
+
+    with tempfile.TemporaryDirectory(dir=dir_name, prefix=".merge-") as spill_dir:
+        for order, path in enumerate(sources):
+            try:
+                total_in += _spill_source(path, order, spill_dir, journals, target_years)
+            except (OSError, ValueError) as e:
+                logger.warning("跳过无法读取的进度文件 %s: %s", path, e)
+                continue
+            logger.info("已读取进度文件: %s", path)
+
+        total_out = _write_store(dest, target_years, journals)
+
+    stats = {
+        "sources": len(sources),
+        "journals": len(journals),
+        "articles_in": total_in,
+        "articles_out": total_out,
+        "duplicates": total_in - total_out,
+    }
+    logger.info(
+        "合并完成: %d 个文件, %d 个期刊, %d 条记录 -> %d 条 (去重 %d)",
+        stats["sources"], stats["journals"], total_in, total_out, stats["duplicates"],
+    )
+    return stats
+
+
+def _rank(art: ArticleRecord, order: int) -> tuple:
+    return (art.detail_crawled, art.updated_at, order)
+
+
+def _spill_source(
+    path: str,
+    order: int,
+    spill_dir: str,
+    journals: dict[str, dict],
+    target_years: set[str],
+) -> int:
+    """流式读取一个源文件：论文按期刊写入该源文件自己的分片，读完后合并期刊元信息。
+
+    源文件损坏时删除其分片并抛出 ValueError，已读到的部分不参与合并。返回论文条数。
+    """
+    # 本源文件的期刊元信息与分片，读取成功后才并入 journals
+    staged: dict[str, dict] = {}
+    files: dict[str, object] = {}
+    years: list[str] = []
+    count = 0
+    try:
+        for event in _iter_progress(path):
+            if event[0] == "target_years":
+                years = event[1]
+                continue
+            _, pykm, key, value = event
+            entry = staged.setdefault(pykm, {"name": "", "completed_issues": [], "listed_issues": []})
+            if key == "article":
+                spill = files.get(pykm)
+                if spill is None:
+                    spill_path = os.path.join(spill_dir, f"{order}-{len(files)}.ndjson")
+                    spill = files[pykm] = open(spill_path, "w", encoding="utf-8")
+                    entry["spill"] = spill_path
+                spill.write(json.dumps([order, value], ensure_ascii=False))
+                spill.write("\n")
+                count += 1
+            elif key in entry:
+                entry[key] = value
+    except Exception:
+        for f in files.values():
+            f.close()
+            os.unlink(f.name)
+        raise
+    for f in files.values():
+        f.close()
+
+    target_years.update(years)
+    for pykm, entry in staged.items():
+        merged = journals.setdefault(pykm, {
+            "name": "",
+            "completed_issues": {},
+            "listed_issues": {},
+            "spills": [],
+        })
+        merged["name"] = merged["name"] or entry["name"]
+        for key in ("completed_issues", "listed_issues"):
+            for issue_key in entry[key]:
+                merged[key][issue_key] = None
+        if "spill" in entry:
+            merged["spills"].append(entry["spill"])
+    return count
+
+
+def _iter_progress(path: str) -> Iterator[tuple]:
+    """逐条产出进度文件内容，不整体加载:
+
+        ("target_years", [...])
+        ("journal", pykm, 字段名, 值)       name / completed_issues / listed_issues 等
+        ("journal", pykm, "article", 论文字典)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        stream.expect("{")
+        for key in stream.members():
+            if key != "journals":
+                value = stream.value()
+                if key == "target_years":
+                    yield "target_years", value
+                continue
+            stream.expect("{")
+            for pykm in stream.members():
+                stream.expect("{")
+                for field in stream.members():
+                    if field != "articles":
+                        yield "journal", pykm, field, stream.value()
+                        continue
+                    stream.expect("[")
+                    for _ in stream.items():
+                        yield "journal", pykm, "article", stream.value()
+
+
+class _JsonStream:
+    """按块读取 JSON 文本的游标：容器结构逐层遍历，叶子值（含单篇论文对象）用 raw_decode 解析。"""
+
+    def __init__(self, f):
+        self._f = f
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int | None = None) -> bool:
+        if self._eof:
+            return False
+        chunk = self._f.read(size or _CHUNK)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WS:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("进度文件意外结束")
+
+    def expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"进度文件格式错误：位置 {self._pos} 处应为 {char!r}")
+        self._pos += 1
+
+    def value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                end = None
+            # 数字等值在缓冲区末尾可能被截断，读到更多内容后重新解析
+            if end is not None and (end < len(self._buf) or self._eof):
+                self._pos = end
+                return value
+            if not self._fill(max(_CHUNK, len(self._buf) - self._pos)):
+                if end is not None:
+                    self._pos = end
+                    return value
+                raise ValueError(f"进度文件格式错误：位置 {self._pos} 处无法解析")
+
+    def members(self) -> Iterator[str]:
+        """遍历对象成员（已读过 "{"），产出键名；调用方需在下一次迭代前读完对应的值。"""
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            sep = self._peek()
+            self._pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"进度文件格式错误：位置 {self._pos} 处应为 ',' 或 '}}'")
+
+    def items(self) -> Iterator[None]:
+        """遍历数组元素（已读过 "["）；调用方需在下一次迭代前读完元素。"""
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            sep = self._peek()
+            self._pos += 1
+            if sep == "]":
+                return
+            if sep != ",":
+                raise ValueError(f"进度文件格式错误：位置 {self._pos} 处应为 ',' 或 ']'")
+
+
+def _dedupe(spill_paths: list[str]) -> dict[str, tuple[tuple, ArticleRecord]]:
+    """按源文件顺序读取一个期刊的分片并去重，读完即删除分片。"""
+    articles: dict[str, tuple[tuple, ArticleRecord]] = {}
+    for spill_path in spill_paths:
+        with open(spill_path, "r", encoding="utf-8") as f:
+            for line in f:
+                order, data = json.loads(line)
+                art = ArticleRecord.from_dict(data)
+                key = art.key
+                if not key:
+                    continue
+                rank = _rank(art, order)
+                current = articles.get(key)
+                if current is None or rank > current[0]:
+                    articles[key] = (rank, art)
+        os.unlink(spill_path)
+    return articles
+
+
+def _write_store(dest: str, target_years: set[str], journals: dict[str, dict]) -> int:
+    """逐个期刊去重并流式写出合并结果，原子替换目标文件。返回写出的论文数。"""
+    dir_name = os.path.dirname(dest) or "."
+    total = 0
+    fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write('{\n  "target_years": ')
+            f.write(json.dumps(sorted(target_years), ensure_ascii=False))
+            f.write(',\n  "journals": {')
+            for j_idx, (pykm, entry) in enumerate(journals.items()):
+                articles = _dedupe(entry["spills"])
+                total += len(articles)
+                f.write("," if j_idx else "")
+                f.write(f"\n    {json.dumps(pykm, ensure_ascii=False)}: {{")
+                f.write(f'\n      "name": {json.dumps(entry["name"], ensure_ascii=False)},')
+                f.write('\n      "completed_issues": ')
+                f.write(json.dumps(list(entry["completed_issues"]), ensure_ascii=False))
+                if entry["listed_issues"]:
+                    f.write(',\n      "listed_issues": ')
+                    f.write(json.dumps(list(entry["listed_issues"]), ensure_ascii=False))
+                f.write(',\n      "articles": [')
+                for a_idx, (_, art) in enumerate(articles.values()):
+                    f.write("," if a_idx else "")
+                    f.write("\n        ")
+                    f.write(json.dumps(art.to_dict(), ensure_ascii=False))
+                f.write("\n      ]\n    }")
+                del articles
+            f.write("\n  }\n}\n")
+        os.replace(tmp_path, dest)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return total
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field, asdict
 from typing import Any
 
+# 导出字段（JSON/CSV 的列顺序）
+ARTICLE_FIELDS = (
+    "journal", "year", "issue", "title", "authors", "institutions",
+    "abstract", "keywords", "funds", "clc_code", "url", "column", "pages",
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class Article:
     journal: str = ""
     year: str = ""
@@ -17,13 +24,107 @@ class Article:
     funds: list[str] = field(default_factory=list)
     clc_code: str = ""
     url: str = ""
+    column: str = ""
+    pages: str = ""
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
 
 
+# 在大量记录间重复出现的字段：驻留（sys.intern）后所有记录共享同一字符串对象
+_INTERNED_FIELDS = ("journal", "pykm", "year", "issue", "column")
+_LIST_FIELDS = ("authors", "institutions", "keywords", "funds")
+_DETAIL_FIELDS = ("authors", "institutions", "abstract", "keywords", "funds", "clc_code")
+_EMPTY: tuple[str, ...] = ()
+
+
+def _intern_all(values) -> tuple[str, ...]:
+    if not values:
+        return _EMPTY
+    return tuple(sys.intern(v) for v in values)
+
+
+@dataclass(slots=True)
+class ArticleRecord:
+    """进度层与导出层共用的紧凑论文记录。
+
+    使用 slots 存储；期刊、年份、刊期、栏目等分类字段以及作者、单位、关键词、
+    基金条目均驻留为共享字符串，列表字段存为元组。未知字段保存在 extra 中，
+    序列化时原样写回，保证进度文件向前兼容。
+    """
+
+    journal: str = ""
+    pykm: str = ""
+    year: str = ""
+    issue: str = ""
+    title: str = ""
+    url: str = ""
+    filename: str = ""
+    authors: tuple[str, ...] = _EMPTY
+    institutions: tuple[str, ...] = _EMPTY
+    abstract: str = ""
+    keywords: tuple[str, ...] = _EMPTY
+    funds: tuple[str, ...] = _EMPTY
+    clc_code: str = ""
+    column: str = ""
+    pages: str = ""
+    detail_crawled: bool = False
+    crawl_error: str = ""
+    updated_at: str = ""
+    extra: dict[str, Any] | None = None
+
+    def __post_init__(self) -> None:
+        for name in _INTERNED_FIELDS:
+            setattr(self, name, sys.intern(getattr(self, name) or ""))
+        for name in _LIST_FIELDS:
+            setattr(self, name, _intern_all(getattr(self, name)))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ArticleRecord:
+        known = {k: v for k, v in data.items() if k in _RECORD_FIELDS}
+        extra = {k: v for k, v in data.items() if k not in _RECORD_FIELDS}
+        return cls(**known, extra=extra or None)
+
+    def to_dict(self) -> dict[str, Any]:
+        """序列化为进度文件中的字典格式。"""
+        data: dict[str, Any] = {
+            "journal": self.journal,
+            "pykm": self.pykm,
+            "year": self.year,
+            "issue": self.issue,
+            "title": self.title,
+            "url": self.url,
+        }
+        if self.filename:
+            data["filename"] = self.filename
+        # 未爬取详情的记录只写出非空字段，避免进度文件膨胀
+        for name in _DETAIL_FIELDS:
+            value = getattr(self, name)
+            if self.detail_crawled or value:
+                data[name] = list(value) if isinstance(value, tuple) else value
+        data["column"] = self.column
+        if self.pages:
+            data["pages"] = self.pages
+        data["detail_crawled"] = self.detail_crawled
+        if self.crawl_error:
+            data["crawl_error"] = self.crawl_error
+        if self.updated_at:
+            data["updated_at"] = self.updated_at
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def key(self) -> str:
+        """去重键：优先 CNKI 文件名（跨会话稳定），缺失时回退到详情页 URL。"""
+        return self.filename or self.url
+
+
+_RECORD_FIELDS = frozenset(ArticleRecord.__dataclass_fields__) - {"extra"}
+
+
 @dataclass
 class JournalInfo:
     name: str
     url: str
-    pykm: str = ""
\ No newline at end of file
+    pykm: str = ""
@@ -1,12 +1,52 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import tempfile
+import threading
+from dataclasses import replace
+from datetime import datetime
 
+from .aggregates import Aggregates
+from .models import ArticleRecord
 from .utils import logger
 
 PROGRESS_FILE = "crawl_progress.json"
+# 后台写入模式下，变更最多延迟多少秒落盘
+MAX_STALENESS = 5.0
+
+
+def _decode(obj: dict):
+    """json.load 钩子：解析过程中即把论文字典转为 ArticleRecord，避免整份原始字典常驻内存。"""
+    if "url" in obj:
+        return ArticleRecord.from_dict(obj)
+    return obj
+
+
+def read_progress_file(filepath: str) -> dict:
+    """读取进度文件，论文条目解析为 ArticleRecord。"""
+    with open(filepath, "r", encoding="utf-8") as f:
+        return json.load(f, object_hook=_decode)
+
+
+def _encode(obj):
+    if isinstance(obj, ArticleRecord):
+        return obj.to_dict()
+    raise TypeError(f"无法序列化类型 {type(obj).__name__}")
+
+
+def progress_fingerprint(filepath: str) -> dict | None:
+    """进度文件指纹（绝对路径、修改时间、大小），文件不存在时为 None。"""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return {"path": os.path.abspath(filepath), "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _normalize_title(title: str) -> str:
+    return "".join(title.split())
 
 
 class CrawlProgress:
@@ -19,50 +59,166 @@ class CrawlProgress:
         "DXTS": {
           "name": "大学图书馆学报",
           "completed_issues": ["2025_No.01", "2025_No.02"],
+          "listed_issues": ["2025_No.03"],
           "articles": [{ "title": "...", "detail_crawled": true, ... }]
         }
       }
     }
+
+    内存中论文记录以 ArticleRecord 保存，写盘时再序列化为上述字典格式。
+    listed_issues 为列表模式（--depth list）已写入列表级记录的刊期，仅在使用过列表模式时出现。
+
+    background=True 时由后台线程写盘：变更立即作用于内存，save() 只登记待写；写入线程
+    在首个待写变更后至多 max_staleness 秒内把期间所有变更合并为一次原子写入。close()、
+    进程正常退出（atexit）与 Ctrl+C（调用方 try/finally 中 close）时写出剩余变更。
     """
 
-    def __init__(self, filepath: str = PROGRESS_FILE):
+    def __init__(
+        self,
+        filepath: str = PROGRESS_FILE,
+        aggregates: Aggregates | None = None,
+        background: bool = False,
+        max_staleness: float = MAX_STALENESS,
+    ):
         self._filepath = filepath
+        # 保护 _data 与统计：变更与后台线程取快照互斥
+        self._lock = threading.RLock()
         self._data: dict = self._load()
+        # pykm -> {文件名或 URL: 论文在 articles 列表中的下标}
+        self._index: dict[str, dict[str, int]] = {
+            pykm: self._build_index(journal_data.get("articles", []))
+            for pykm, journal_data in self._data["journals"].items()
+        }
+        # 可选的统计汇聚：add_article 入库时增量更新，随进度一起保存
+        self._aggregates = aggregates
+        if aggregates is not None and not aggregates.matches(progress_fingerprint(filepath)):
+            if aggregates.loaded:
+                logger.info("统计文件与进度文件 %s 不一致，重新计算", filepath)
+            aggregates.rebuild(self.get_all_articles())
+            aggregates.save(source=progress_fingerprint(filepath))
+
+        self._max_staleness = max_staleness
+        self._dirty = False
+        self._closed = False
+        self._cond = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+        if background:
+            self._writer = threading.Thread(target=self._write_loop, name="progress-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    @staticmethod
+    def _build_index(articles: list[ArticleRecord]) -> dict[str, int]:
+        index: dict[str, int] = {}
+        for i, art in enumerate(articles):
+            if art.url:
+                index[art.url] = i
+            if art.filename:
+                index[art.filename] = i
+        return index
 
     def _load(self) -> dict:
         if not os.path.exists(self._filepath):
             return {"target_years": [], "journals": {}}
         try:
-            with open(self._filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return read_progress_file(self._filepath)
         except (json.JSONDecodeError, IOError):
             logger.warning("进度文件损坏，重新开始")
             return {"target_years": [], "journals": {}}
 
     def save(self) -> None:
+        """保存进度。后台写入模式下只登记待写并立即返回，否则同步写盘。"""
+        if self._writer is None:
+            self.flush()
+            return
+        with self._cond:
+            if not self._dirty:
+                self._dirty = True
+                self._cond.notify()
+
+    def flush(self) -> None:
+        """立即把当前内存状态写盘。"""
+        # 写入串行化，保证后取的快照后落盘
+        with self._write_lock:
+            with self._lock:
+                data, aggregates = self._snapshot()
+                self._dirty = False
+            self._write(data, aggregates)
+
+    def close(self) -> None:
+        """停止后台写入线程并写出剩余变更。可重复调用。"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            pending = self._dirty
+            self._cond.notify()
+        if self._writer is not None:
+            self._writer.join()
+            atexit.unregister(self.close)
+            if pending or self._dirty:
+                self.flush()
+
+    def _snapshot(self) -> tuple[dict, dict | None]:
+        """在锁内复制出可在锁外序列化的结构（浅拷贝列表，论文记录只会被整体替换）。"""
+        data = {
+            "target_years": list(self._data["target_years"]),
+            "journals": {
+                pykm: {k: list(v) if isinstance(v, list) else v for k, v in journal.items()}
+                for pykm, journal in self._data["journals"].items()
+            },
+        }
+        aggregates = self._aggregates.to_dict() if self._aggregates is not None else None
+        return data, aggregates
+
+    def _write(self, data: dict, aggregates: dict | None) -> None:
         """原子写入进度文件（写临时文件 -> rename）。"""
         dir_name = os.path.dirname(self._filepath) or "."
         fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
         try:
             with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, ensure_ascii=False, indent=2)
+                json.dump(data, f, ensure_ascii=False, indent=2, default=_encode)
             os.replace(tmp_path, self._filepath)
         except Exception:
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
             raise
+        if aggregates is not None:
+            self._aggregates.save(aggregates, source=progress_fingerprint(self._filepath))
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # 攒批：等待 max_staleness 秒，其间的变更合并为一次写入（close 时提前结束）
+                self._cond.wait(self._max_staleness)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("后台写入进度失败，稍后重试: %s", e)
+                with self._cond:
+                    self._dirty = True
 
     def set_target_years(self, years: set[str]) -> None:
-        self._data["target_years"] = sorted(years)
+        with self._lock:
+            self._data["target_years"] = sorted(years)
 
     def ensure_journal(self, pykm: str, name: str) -> None:
         """确保期刊条目存在。"""
-        if pykm not in self._data["journals"]:
-            self._data["journals"][pykm] = {
-                "name": name,
-                "completed_issues": [],
-                "articles": [],
-            }
+        with self._lock:
+            if pykm not in self._data["journals"]:
+                self._data["journals"][pykm] = {
+                    "name": name,
+                    "completed_issues": [],
+                    "articles": [],
+                }
+                self._index[pykm] = {}
 
     def is_issue_completed(self, pykm: str, issue_key: str) -> bool:
         """检查刊期是否已完成。issue_key 格式: '2025_No.01'"""
@@ -71,52 +227,182 @@ class CrawlProgress:
 
     def mark_issue_completed(self, pykm: str, issue_key: str) -> None:
         """标记刊期已完成。"""
-        journal = self._data["journals"].get(pykm, {})
-        completed = journal.get("completed_issues", [])
-        if issue_key not in completed:
-            completed.append(issue_key)
+        with self._lock:
+            journal = self._data["journals"].get(pykm, {})
+            completed = journal.get("completed_issues", [])
+            if issue_key not in completed:
+                completed.append(issue_key)
         self.save()
         logger.info("刊期 %s 已标记完成", issue_key)
 
-    def is_article_crawled(self, pykm: str, url: str) -> bool:
-        """检查论文是否已爬取。"""
+    def is_issue_listed(self, pykm: str, issue_key: str) -> bool:
+        """检查刊期是否已在列表模式中写入列表级记录。"""
         journal = self._data["journals"].get(pykm, {})
-        for art in journal.get("articles", []):
-            if art.get("url") == url and art.get("detail_crawled"):
-                return True
-        return False
+        return issue_key in journal.get("listed_issues", [])
 
-    def add_article(self, pykm: str, article_data: dict) -> None:
-        """添加或更新论文记录，立即保存。"""
+    def mark_issue_listed(self, pykm: str, issue_key: str) -> None:
+        """标记刊期的列表级记录已写入（详情待后续 --enrich 补全）。"""
+        with self._lock:
+            journal = self._data["journals"].get(pykm)
+            if journal is None:
+                return
+            listed = journal.setdefault("listed_issues", [])
+            if issue_key not in listed:
+                listed.append(issue_key)
+        self.save()
+
+    def has_listed_issues(self) -> bool:
+        return any(j.get("listed_issues") for j in self._data["journals"].values())
+
+    def is_listed_record(self, record: ArticleRecord) -> bool:
+        """论文是否属于已列出的刊期（列表级记录可导出）。"""
+        return self.is_issue_listed(record.pykm, f"{record.year}_{record.issue}")
+
+    def add_listed_articles(self, pykm: str, records: list[ArticleRecord]) -> int:
+        """批量写入列表级记录：只添加尚无记录的论文，不覆盖已有（可能已爬详情的）记录。返回新增条数。"""
+        journal = self._data["journals"].get(pykm)
+        if not journal:
+            return 0
+        articles = journal["articles"]
+        index = self._index[pykm]
+        now = datetime.now().isoformat()
+
+        added = 0
+        with self._lock:
+            for record in records:
+                if record.filename in index or record.url in index:
+                    continue
+                if not record.updated_at:
+                    record.updated_at = now
+                index[record.url] = len(articles)
+                if record.filename:
+                    index[record.filename] = len(articles)
+                articles.append(record)
+                added += 1
+        if added:
+            self.save()
+        return added
+
+    def is_article_crawled(self, pykm: str, key: str) -> bool:
+        """检查论文是否已爬取。key 为 CNKI 文件名（推荐，跨会话稳定）或详情页 URL。"""
+        pos = self._index.get(pykm, {}).get(key)
+        if pos is None:
+            return False
+        return self._data["journals"][pykm]["articles"][pos].detail_crawled
+
+    def backfill_filenames(self, pykm: str, year: str, issue: str, papers: list[dict]) -> int:
+        """为缺少文件名的历史记录回填 CNKI 文件名，返回回填条数。
+
+        旧版进度只记录了会话加密的详情页 URL，重启后无法据此识别已爬论文。
+        获取到刊期论文列表后，按 URL（同一会话内）或标题匹配同刊期的旧记录，
+        补写列表中的稳定文件名并加入索引。
+        """
+        journal = self._data["journals"].get(pykm)
+        if not journal:
+            return 0
+        articles = journal["articles"]
+        index = self._index[pykm]
+
+        filled = 0
+        with self._lock:
+            by_title: dict[str, int] = {}
+            for i, art in enumerate(articles):
+                if not art.filename and art.year == year and art.issue == issue:
+                    by_title.setdefault(_normalize_title(art.title), i)
+            if not by_title:
+                return 0
+
+            for paper in papers:
+                filename = paper.get("filename", "")
+                if not filename or filename in index:
+                    continue
+                pos = index.get(paper.get("url", ""))
+                if pos is None or articles[pos].filename:
+                    pos = by_title.pop(_normalize_title(paper.get("title", "")), None)
+                else:
+                    # 按 URL 匹配到的记录也不能再被同名论文按标题匹配
+                    title = _normalize_title(articles[pos].title)
+                    if by_title.get(title) == pos:
+                        del by_title[title]
+                if pos is None:
+                    continue
+                # 整体替换记录：后台写线程的快照可能仍引用旧对象
+                articles[pos] = replace(articles[pos], filename=filename)
+                index[filename] = pos
+                filled += 1
+
+        if filled:
+            self.save()
+            logger.info("  已为 %d 条历史记录回填文件名", filled)
+        return filled
+
+    def add_article(self, pykm: str, article_data: dict | ArticleRecord) -> None:
+        """添加或更新论文记录并保存（后台写入模式下只更新内存并登记待写）。"""
         journal = self._data["journals"].get(pykm)
         if not journal:
             return
 
+        if isinstance(article_data, ArticleRecord):
+            record = article_data
+        else:
+            record = ArticleRecord.from_dict(article_data)
+        if not record.updated_at:
+            record.updated_at = datetime.now().isoformat()
+
         articles = journal["articles"]
-        url = article_data.get("url", "")
+        index = self._index[pykm]
 
-        # 查找是否已存在
-        for i, art in enumerate(articles):
-            if art.get("url") == url:
-                articles[i] = article_data
-                self.save()
-                return
+        with self._lock:
+            # 查找是否已存在（先按文件名，再按 URL）
+            pos = index.get(record.filename) if record.filename else None
+            if pos is None:
+                pos = index.get(record.url)
+            if pos is None:
+                pos = len(articles)
+                articles.append(record)
+                old = None
+            else:
+                old = articles[pos]
+                articles[pos] = record
 
-        articles.append(article_data)
+            if self._aggregates is not None:
+                self._aggregates.replace(old, record)
+
+            if record.url:
+                index[record.url] = pos
+            if record.filename:
+                index[record.filename] = pos
         self.save()
 
-    def get_articles(self, pykm: str) -> list[dict]:
+    def get_article(self, pykm: str, key: str) -> ArticleRecord | None:
+        """按 CNKI 文件名或详情页 URL 查找论文记录。"""
+        pos = self._index.get(pykm, {}).get(key)
+        if pos is None:
+            return None
+        return self._data["journals"][pykm]["articles"][pos]
+
+    def get_articles(self, pykm: str) -> list[ArticleRecord]:
         """获取期刊的所有论文记录。"""
         journal = self._data["journals"].get(pykm, {})
         return journal.get("articles", [])
 
-    def get_all_articles(self) -> list[dict]:
+    def get_all_articles(self) -> list[ArticleRecord]:
         """获取所有期刊的所有论文记录。"""
         articles = []
         for journal_data in self._data["journals"].values():
             articles.extend(journal_data.get("articles", []))
         return articles
 
+    def issue_article_counts(self, pykm: str) -> dict[str, tuple[int, int]]:
+        """按刊期统计论文记录数：{issue_key: (记录数, 已爬取数)}。"""
+        counts: dict[str, list[int]] = {}
+        for art in self.get_articles(pykm):
+            entry = counts.setdefault(f"{art.year}_{art.issue}", [0, 0])
+            entry[0] += 1
+            if art.detail_crawled:
+                entry[1] += 1
+        return {k: (v[0], v[1]) for k, v in counts.items()}
+
     def get_stats(self) -> dict:
         """获取统计信息。"""
         total = 0
@@ -124,6 +410,6 @@ class CrawlProgress:
         for journal_data in self._data["journals"].values():
             for art in journal_data.get("articles", []):
                 total += 1
-                if art.get("detail_crawled"):
+                if art.detail_crawled:
                     crawled += 1
         return {"total": total, "crawled": crawled, "remaining": total - crawled}
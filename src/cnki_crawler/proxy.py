@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import threading
+import time
+import urllib.request
+from collections import deque
+from dataclasses import dataclass, field
+
+from .utils import logger
+
+PROBE_URL = "https://navi.cnki.net/knavi/"
+PROBE_TIMEOUT = 15.0
+# 健康分低于阈值（且样本数足够）时隔离；隔离期满后探测，通过则恢复
+QUARANTINE_SCORE = 0.35
+QUARANTINE_SECONDS = 600.0
+MIN_SAMPLES = 5
+EWMA_ALPHA = 0.2
+# 延迟参考值（秒）：延迟等于该值时健康分减半
+LATENCY_REF = 5.0
+BUDGET_WINDOW = 3600.0
+
+
+@dataclass(slots=True)
+class ProxyState:
+    """单个代理的健康状态。error_rate / captcha_rate / latency 为 EWMA。"""
+
+    url: str
+    budget: int | None = None
+    latency: float = 0.0
+    error_rate: float = 0.0
+    captcha_rate: float = 0.0
+    requests: int = 0
+    quarantined_until: float = 0.0
+    recent: deque = field(default_factory=deque)
+
+    @property
+    def score(self) -> float:
+        """健康分 (0, 1]：成功率 × 非验证码率 × 延迟衰减。"""
+        return (1 - self.error_rate) * (1 - self.captcha_rate) / (1 + self.latency / LATENCY_REF)
+
+    def quarantined(self, now: float) -> bool:
+        return self.quarantined_until > now
+
+    def budget_wait(self, now: float) -> float:
+        """距离预算窗口内出现空位的秒数（无预算或有余量时为 0）。"""
+        while self.recent and self.recent[0] <= now - BUDGET_WINDOW:
+            self.recent.popleft()
+        if self.budget is None or len(self.recent) < self.budget:
+            return 0.0
+        return self.recent[0] + BUDGET_WINDOW - now
+
+
+class ProxyPool:
+    """代理池：每个浏览器工作者固定（sticky）使用一个代理，按健康分轮换。
+
+    代理文件每行一个代理，可选第二列为每小时请求预算，# 开头为注释:
+
+        http://10.0.0.1:3128
+        http://10.0.0.2:3128  600
+        socks5://127.0.0.1:1080
+
+    Chromium 的 --proxy-server 不支持认证，代理需免密（可用本地转发）。
+    """
+
+    def __init__(
+        self,
+        proxies: list[tuple[str, int | None]],
+        quarantine: float = QUARANTINE_SECONDS,
+        probe_url: str = PROBE_URL,
+    ):
+        if not proxies:
+            raise ValueError("代理池为空")
+        self._states = {url: ProxyState(url, budget) for url, budget in proxies}
+        self._quarantine = quarantine
+        self._probe_url = probe_url
+        self._assigned: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, filepath: str, **kwargs) -> ProxyPool:
+        proxies = []
+        with open(filepath, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                parts = line.split()
+                proxies.append((parts[0], int(parts[1]) if len(parts) > 1 else None))
+        logger.info("已加载 %d 个代理: %s", len(proxies), filepath)
+        return cls(proxies, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def acquire(self, worker: str) -> str | None:
+        """返回工作者绑定的代理；未绑定或已被隔离时改绑健康分最高、绑定数最少的可用代理。"""
+        self._retest_expired()
+        with self._lock:
+            now = time.monotonic()
+            current = self._assigned.get(worker)
+            if current and not self._states[current].quarantined(now):
+                return current
+            proxy = self._pick(now, exclude=current)
+            if proxy is None:
+                self._assigned.pop(worker, None)
+                logger.error("代理池中没有可用代理")
+                return None
+            self._assigned[worker] = proxy
+            logger.info("工作者 %s 绑定代理 %s", worker, proxy)
+            return proxy
+
+    def reassign(self, worker: str) -> str | None:
+        """放弃当前代理（如预算用尽），改绑其他可立即使用的代理；没有时保持原绑定并返回 None。"""
+        with self._lock:
+            now = time.monotonic()
+            current = self._assigned.get(worker)
+            candidates = [
+                s for s in self._states.values()
+                if s.url != current and not s.quarantined(now) and s.budget_wait(now) == 0
+            ]
+            if not candidates:
+                return None
+            proxy = self._rank(candidates)[0].url
+            self._assigned[worker] = proxy
+            logger.info("工作者 %s 改绑代理 %s", worker, proxy)
+            return proxy
+
+    def healthy(self, proxy: str) -> bool:
+        with self._lock:
+            return not self._states[proxy].quarantined(time.monotonic())
+
+    def budget_wait(self, proxy: str) -> float:
+        with self._lock:
+            return self._states[proxy].budget_wait(time.monotonic())
+
+    def record(
+        self,
+        proxy: str,
+        latency: float | None = None,
+        error: bool = False,
+        captcha: bool = False,
+        requests: int = 1,
+    ) -> None:
+        """记录一次操作结果（含 requests 个请求，均计入预算），更新健康分；健康分过低时隔离该代理。"""
+        with self._lock:
+            state = self._states[proxy]
+            now = time.monotonic()
+            state.requests += requests
+            state.recent.extend([now] * requests)
+            state.error_rate += EWMA_ALPHA * (float(error) - state.error_rate)
+            state.captcha_rate += EWMA_ALPHA * (float(captcha) - state.captcha_rate)
+            if latency is not None:
+                state.latency += EWMA_ALPHA * (latency - state.latency)
+            self._check_score(state, now)
+
+    def flag_captcha(self, proxy: str) -> None:
+        """把该代理最近一次记录改为触发了验证码（页面加载后才能检测验证码），不新增样本。"""
+        with self._lock:
+            state = self._states[proxy]
+            if not state.requests:
+                return
+            # 上次更新为 rate += α(0 - rate)，改记为 1 相当于再加 α
+            state.captcha_rate = min(1.0, state.captcha_rate + EWMA_ALPHA)
+            self._check_score(state, time.monotonic())
+
+    def _check_score(self, state: ProxyState, now: float) -> None:
+        if state.requests >= MIN_SAMPLES and state.score < QUARANTINE_SCORE and not state.quarantined(now):
+            state.quarantined_until = now + self._quarantine
+            logger.warning(
+                "代理 %s 健康分 %.2f（错误率 %.0f%%，验证码率 %.0f%%，延迟 %.1fs），隔离 %.0f 秒",
+                state.url, state.score, state.error_rate * 100, state.captcha_rate * 100,
+                state.latency, self._quarantine,
+            )
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    "proxy": s.url,
+                    "score": round(s.score, 3),
+                    "requests": s.requests,
+                    "latency": round(s.latency, 2),
+                    "error_rate": round(s.error_rate, 3),
+                    "captcha_rate": round(s.captcha_rate, 3),
+                    "quarantined": s.quarantined(now),
+                }
+                for s in self._states.values()
+            ]
+
+    def _rank(self, states: list[ProxyState]) -> list[ProxyState]:
+        load: dict[str, int] = {}
+        for url in self._assigned.values():
+            load[url] = load.get(url, 0) + 1
+        return sorted(states, key=lambda s: (load.get(s.url, 0), -s.score))
+
+    def _pick(self, now: float, exclude: str | None = None) -> str | None:
+        candidates = [s for s in self._states.values() if s.url != exclude and not s.quarantined(now)]
+        if not candidates and exclude and not self._states[exclude].quarantined(now):
+            candidates = [self._states[exclude]]
+        return self._rank(candidates)[0].url if candidates else None
+
+    def _retest_expired(self) -> None:
+        """探测隔离期已满的代理：通过则重置统计恢复使用，否则延长隔离。
+
+        探测是网络请求，在锁外进行；探测期间代理保持隔离，其他工作者不会重复探测。
+        """
+        with self._lock:
+            now = time.monotonic()
+            due = [s for s in self._states.values() if s.quarantined_until and not s.quarantined(now)]
+            for state in due:
+                state.quarantined_until = now + self._quarantine
+        for state in due:
+            ok = probe(state.url, self._probe_url)
+            with self._lock:
+                if ok:
+                    logger.info("代理 %s 复测通过，恢复使用", state.url)
+                    state.error_rate = state.captcha_rate = state.latency = 0.0
+                    state.requests = 0
+                    state.quarantined_until = 0.0
+                else:
+                    logger.info("代理 %s 复测失败，继续隔离", state.url)
+                    state.quarantined_until = time.monotonic() + self._quarantine
+
+
+def probe(proxy: str, url: str = PROBE_URL, timeout: float = PROBE_TIMEOUT) -> bool:
+    """经代理请求 url，返回是否成功。urllib 不支持 socks，socks 代理视为通过。"""
+    if proxy.startswith("socks"):
+        return True
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({"http": proxy, "https": proxy}))
+    try:
+        with opener.open(url, timeout=timeout) as resp:
+            return resp.status < 500
+    except Exception as e:
+        logger.debug("代理探测失败 %s: %s", proxy, e)
+        return False
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from .utils import logger
+
+REGISTRY_FILE = "journal_registry.json"
+STABLE_DETAIL_TEMPLATE = "https://navi.cnki.net/knavi/journals/{pykm}/detail?uniplatform=NZKPT&language=CHS"
+
+
+class JournalRegistry:
+    """期刊注册表：刊名 -> pykm、稳定详情页 URL、最近验证时间。
+
+    结构:
+    {
+      "中国图书馆学报": {
+        "pykm": "ZGTS",
+        "url": "https://navi.cnki.net/knavi/journals/ZGTS/detail?...",
+        "verified_at": "2025-06-01T12:00:00"
+      },
+      "情报资料工作 ": {
+        "pykm": "QBZL",
+        "candidate": "情报资料工作",
+        "verified": false,
+        "checked_at": "2025-06-01T12:00:00"
+      }
+    }
+
+    刊名无完全匹配、仅有唯一检索结果时登记为未确认（verified=false）：get() 不返回该条目，
+    下次 resolve 时重新检索，避免把改名或拼错的期刊长期当作另一本期刊爬取。
+    """
+
+    def __init__(self, filepath: str = REGISTRY_FILE):
+        self._filepath = filepath
+        self._data: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        if not os.path.exists(self._filepath):
+            return {}
+        try:
+            with open(self._filepath, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            logger.warning("期刊注册表损坏，忽略: %s", self._filepath)
+            return {}
+
+    def save(self) -> None:
+        """原子写入注册表文件。"""
+        dir_name = os.path.dirname(self._filepath) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self._filepath)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def get(self, name: str) -> dict | None:
+        """返回已确认的条目；未登记或未确认时返回 None。"""
+        entry = self._data.get(name)
+        if entry and entry.get("pykm") and entry.get("verified", True):
+            return entry
+        return None
+
+    def unverified(self, name: str) -> dict | None:
+        entry = self._data.get(name)
+        if entry and entry.get("verified", True) is False:
+            return entry
+        return None
+
+    def update(self, name: str, pykm: str) -> None:
+        """登记（或刷新）期刊的 pykm，并生成稳定详情页 URL。"""
+        self._data[name] = {
+            "pykm": pykm,
+            "url": STABLE_DETAIL_TEMPLATE.format(pykm=pykm),
+            "verified_at": datetime.now().isoformat(),
+        }
+
+    def update_unverified(self, name: str, pykm: str, candidate: str) -> None:
+        """登记模糊匹配的候选 pykm（不用于爬取，下次 resolve 时重新检索）。"""
+        self._data[name] = {
+            "pykm": pykm,
+            "candidate": candidate,
+            "verified": False,
+            "checked_at": datetime.now().isoformat(),
+        }
+
+    def missing(self, names: list[str]) -> list[str]:
+        """返回尚未登记 pykm 或登记未确认的刊名。"""
+        return [n for n in names if self.get(n) is None]
+
+    def __len__(self) -> int:
+        return len(self._data)
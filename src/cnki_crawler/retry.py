@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, asdict, fields
+from typing import Iterable
+
+from .exporter import load_failed_items, save_failed_items
+from .utils import logger
+
+DEAD_LETTER_FILE = "failed_items.json"
+
+
+@dataclass
+class RetryItem:
+    """待重试的论文。字段足以在不回查进度与论文列表的情况下重新爬取。"""
+
+    journal: str
+    pykm: str
+    year: str
+    issue: str
+    title: str
+    url: str
+    filename: str = ""
+    column: str = ""
+    pages: str = ""
+    attempts: int = 0
+    last_error: str = ""
+
+    @property
+    def issue_key(self) -> str:
+        return f"{self.year}_{self.issue}"
+
+    @property
+    def key(self) -> str:
+        return self.filename or self.url
+
+    def to_paper(self) -> dict:
+        """还原为论文列表条目格式（供 _fetch_article 使用）。"""
+        return {
+            "title": self.title,
+            "url": self.url,
+            "filename": self.filename,
+            "column": self.column,
+            "pages": self.pages,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> RetryItem:
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+class RetryQueue:
+    """失败论文的延迟重试队列（指数退避）。
+
+    第 n 次失败后等待 base_delay * 2^(n-1) 秒再重试；累计失败 max_attempts 次后
+    移入死信列表，由 flush_dead_letters() 写入死信文件（与已有死信合并去重）。
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 60.0,
+        dead_letter_path: str = DEAD_LETTER_FILE,
+    ):
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._dead_letter_path = dead_letter_path
+        self._heap: list[tuple[float, int, RetryItem]] = []
+        self._seq = itertools.count()
+        self._outstanding: dict[tuple[str, str], int] = {}
+        self._dead: list[RetryItem] = []
+        self._dead_issues: set[tuple[str, str]] = set()
+        self._deferred_issues: set[tuple[str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: RetryItem, error: str) -> None:
+        """记录一次失败：未达上限则按退避时间入队，否则移入死信。"""
+        item.attempts += 1
+        item.last_error = error
+        issue = (item.pykm, item.issue_key)
+
+        if item.attempts >= self._max_attempts:
+            self._dead.append(item)
+            self._dead_issues.add(issue)
+            logger.warning("  已失败 %d 次，放弃: %s", item.attempts, item.title[:40])
+            return
+
+        delay = self._base_delay * 2 ** (item.attempts - 1)
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), item))
+        self._outstanding[issue] = self._outstanding.get(issue, 0) + 1
+        logger.info("  %.0f 秒后重试（第 %d 次）: %s", delay, item.attempts + 1, item.title[:40])
+
+    def pop_due(self) -> list[RetryItem]:
+        """取出所有已到重试时间的条目。"""
+        now = time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(self._pop())
+        return due
+
+    def pop_next(self, deadline: float | None = None) -> RetryItem | None:
+        """等待并取出下一个条目。队列为空、或下一个条目的重试时间晚于 deadline
+        （time.monotonic()）时返回 None，不等待。"""
+        if not self._heap:
+            return None
+        if deadline is not None and self._heap[0][0] > deadline:
+            return None
+        wait = self._heap[0][0] - time.monotonic()
+        if wait > 0:
+            logger.info("等待 %.0f 秒后处理重试队列（剩余 %d 篇）", wait, len(self._heap))
+            time.sleep(wait)
+        return self._pop()
+
+    def _pop(self) -> RetryItem:
+        _, _, item = heapq.heappop(self._heap)
+        issue = (item.pykm, item.issue_key)
+        self._outstanding[issue] -= 1
+        if not self._outstanding[issue]:
+            del self._outstanding[issue]
+        return item
+
+    def defer_issue(self, pykm: str, issue_key: str) -> None:
+        """登记已遍历完、仅因失败条目未完成的刊期，待其条目全部重试成功后再标记完成。"""
+        self._deferred_issues.add((pykm, issue_key))
+
+    def settle_issue(self, pykm: str, issue_key: str) -> bool:
+        """若登记过的刊期已无待重试条目且无死信，注销并返回 True（调用方据此标记完成）。"""
+        issue = (pykm, issue_key)
+        if issue not in self._deferred_issues:
+            return False
+        if issue in self._outstanding or issue in self._dead_issues:
+            return False
+        self._deferred_issues.discard(issue)
+        return True
+
+    def flush_dead_letters(self, replace: bool = False, pending: Iterable[RetryItem] = ()) -> None:
+        """写出死信文件。仍在队列中的条目（如提前终止）一并写入。
+
+        replace=False 时与已有死信合并去重；replace=True 时覆盖（--retry-failed 模式，
+        成功的条目借此从死信文件中移除）。pending 为尚未处理完的条目，原样写回；
+        同一论文在本队列中另有失败记录时以队列中的为准。
+        """
+        while self._heap:
+            self._dead.append(self._pop())
+        pending = list(pending)
+        if not self._dead and not pending and not replace:
+            return
+        merged: dict[str, dict] = {}
+        if not replace:
+            merged = {RetryItem.from_dict(d).key: d for d in load_failed_items(self._dead_letter_path)}
+        for item in (*pending, *self._dead):
+            merged[item.key] = asdict(item)
+        save_failed_items(list(merged.values()), self._dead_letter_path)
+        self._dead.clear()
+
+
+def load_dead_letters(filepath: str = DEAD_LETTER_FILE) -> list[RetryItem]:
+    """读取死信文件，重置重试计数。"""
+    items = [RetryItem.from_dict(d) for d in load_failed_items(filepath)]
+    for item in items:
+        item.attempts = 0
+    return items
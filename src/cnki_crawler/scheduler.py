@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+from .models import JournalInfo
+from .utils import logger
+
+ORDERS = ("sequential", "newest", "yield", "round-robin")
+
+# 代价模型初值（秒）：刊期列表请求含 1-2 秒间隔；每篇详情含 3-6 秒间隔与页面加载
+DEFAULT_UNIT_OVERHEAD = 4.0
+DEFAULT_ARTICLE_COST = 7.0
+DEFAULT_ISSUE_SIZE = 15
+EWMA_ALPHA = 0.3
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)([hms])")
+
+
+def parse_duration(text: str) -> float:
+    """解析时长：'3h'、'90m'、'1h30m'、'45s'，纯数字按秒计。返回秒数。"""
+    text = text.strip().lower()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if not parts or "".join(n + u for n, u in parts) != text:
+        raise ValueError(f"无法解析时长: {text!r}（示例: 3h、90m、1h30m）")
+    scale = {"h": 3600, "m": 60, "s": 1}
+    return sum(float(n) * scale[u] for n, u in parts)
+
+
+def format_duration(seconds: float) -> str:
+    seconds = max(int(seconds), 0)
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}h{m:02d}m" if h else f"{m}m{s:02d}s"
+
+
+@dataclass
+class WorkUnit:
+    """调度单元：一个待爬取的刊期。expected 为预计待爬论文数。"""
+
+    journal: JournalInfo
+    pykm: str
+    year: str
+    issue: str
+    issue_id: str
+    value: str
+    seq: int = 0
+    expected: float = DEFAULT_ISSUE_SIZE
+
+    @property
+    def issue_key(self) -> str:
+        return f"{self.year}_{self.issue}"
+
+
+class CrawlScheduler:
+    """按优先级排列刊期，并在时间预算内执行。
+
+    排序策略:
+      sequential   按期刊 CSV 顺序、刊期列表顺序（默认，与旧行为一致）
+      newest       最新刊期优先
+      yield        预计待爬论文数最多的刊期优先（每次列表请求带来的论文最多）
+      round-robin  各期刊轮流取一个刊期，分散对单刊的访问
+
+    单元代价按「列表开销 + 每篇代价 × 预计篇数」估计，两项参数随实际耗时以 EWMA 更新。
+    设定预算时，若剩余时间不足以完成下一单元的预计代价，则在刊期边界处停止。
+    """
+
+    def __init__(
+        self,
+        units: list[WorkUnit],
+        order: str = "sequential",
+        budget: float | None = None,
+        started: float | None = None,
+    ):
+        if order not in ORDERS:
+            raise ValueError(f"未知排序策略: {order}")
+        self._order = order
+        self._units = _order_units(units, order)
+        self._budget = budget
+        # 预算起点（time.monotonic()），默认为创建时刻
+        self._started = started if started is not None else time.monotonic()
+        self._unit_overhead = DEFAULT_UNIT_OVERHEAD
+        self._article_cost = DEFAULT_ARTICLE_COST
+        self._done = 0
+        self.stopped_by_budget = False
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def extend(self, units: list[WorkUnit]) -> None:
+        """追加单元（排在已有单元之后，组内按排序策略排列）。用于 sequential 下逐个期刊识别、随即执行。"""
+        self._units.extend(_order_units(units, self._order))
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    @property
+    def retry_deadline(self) -> float | None:
+        """最后一篇重试可以开始的时刻（time.monotonic()）：预算终点减去每篇预计代价。未设预算时为 None。"""
+        if self._budget is None:
+            return None
+        return self._started + self._budget - self._article_cost
+
+    @property
+    def remaining_budget(self) -> float | None:
+        if self._budget is None:
+            return None
+        return self._budget - self.elapsed
+
+    def estimate(self, unit: WorkUnit) -> float:
+        return self._unit_overhead + self._article_cost * unit.expected
+
+    def eta(self) -> float:
+        """剩余全部单元的预计耗时（秒）。"""
+        return sum(self.estimate(u) for u in self._units[self._done:])
+
+    def __iter__(self) -> Iterator[WorkUnit]:
+        while self._done < len(self._units):
+            unit = self._units[self._done]
+            remaining = self.remaining_budget
+            if remaining is not None and remaining < self.estimate(unit):
+                self.stopped_by_budget = True
+                logger.warning(
+                    "时间预算不足（剩余 %s，下一刊期预计 %s），在刊期边界停止；未完成 %d 个刊期",
+                    format_duration(remaining), format_duration(self.estimate(unit)),
+                    len(self._units) - self._done,
+                )
+                return
+            yield unit
+            self._done += 1
+
+    def record(self, unit: WorkUnit, elapsed: float, fetched: int) -> None:
+        """记录单元实际耗时，更新代价模型并输出 ETA。"""
+        if fetched > 0:
+            per_article = max(elapsed - self._unit_overhead, 0.0) / fetched
+            self._article_cost += EWMA_ALPHA * (per_article - self._article_cost)
+        else:
+            self._unit_overhead += EWMA_ALPHA * (elapsed - self._unit_overhead)
+
+        msg = "调度进度 %d/%d，本刊期 %d 篇 / %s，预计剩余 %s"
+        args: list = [self._done + 1, len(self._units), fetched, format_duration(elapsed),
+                      format_duration(self.eta() - self.estimate(unit))]
+        if self._budget is not None:
+            msg += "，预算剩余 %s"
+            args.append(format_duration(self.remaining_budget or 0))
+        logger.info(msg, *args)
+
+
+def _order_units(units: list[WorkUnit], order: str) -> list[WorkUnit]:
+    if order == "newest":
+        return sorted(units, key=lambda u: (u.year, u.issue_id or u.issue), reverse=True)
+    if order == "yield":
+        return sorted(units, key=lambda u: (-u.expected, u.seq))
+    if order == "round-robin":
+        queues: dict[str, list[WorkUnit]] = {}
+        for u in sorted(units, key=lambda u: u.seq):
+            queues.setdefault(u.pykm, []).append(u)
+        result: list[WorkUnit] = []
+        lanes = list(queues.values())
+        for i in range(max((len(q) for q in lanes), default=0)):
+            result.extend(q[i] for q in lanes if i < len(q))
+        return result
+    return sorted(units, key=lambda u: u.seq)
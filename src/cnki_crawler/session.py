@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+
+from .utils import logger
+
+SESSION_FILE = "browser_session.enc"
+SESSION_KEY_ENV = "CNKI_CRAWLER_SESSION_KEY"
+SESSION_KEY_FILE = os.path.join("~", ".config", "cnki_crawler", "session.key")
+# 快照整体有效期：会话 Cookie（JSESSIONID、SID_navi 等）没有过期时间，超过此时长不再恢复
+SESSION_MAX_AGE = 24 * 3600
+
+STORAGE_ORIGINS = ("https://navi.cnki.net", "https://kns.cnki.net")
+_COOKIE_KEYS = ("name", "value", "domain", "path", "expires", "httpOnly", "secure", "sameSite")
+
+
+def portable_cookies(cookies) -> list[dict]:
+    """把 cookies(all_info=True) 的结果整理为可直接 set.cookies 的字典（会话 Cookie 去掉 expires）。"""
+    result = []
+    for cookie in cookies:
+        item = {k: cookie[k] for k in _COOKIE_KEYS if k in cookie}
+        if item.get("expires") is not None and item["expires"] <= 0:
+            del item["expires"]
+        result.append(item)
+    return result
+
+
+class SessionStore:
+    """浏览器会话快照：Cookie 与 CNKI 各站点的 localStorage，Fernet 加密后落盘。
+
+    密钥取自环境变量 CNKI_CRAWLER_SESSION_KEY，否则读取（首次自动生成）权限为 0600 的
+    密钥文件 ~/.config/cnki_crawler/session.key。未安装 cryptography 时不做快照。
+
+    快照明文结构:
+    {
+      "saved_at": 1718000000.0,
+      "cookies": [{"name": "Ecp_ClientId", "value": "...", "domain": ".cnki.net", ...}],
+      "local_storage": {"https://navi.cnki.net": {"key": "value"}}
+    }
+    """
+
+    def __init__(self, filepath: str = SESSION_FILE, key_file: str = SESSION_KEY_FILE):
+        self._filepath = filepath
+        self._key_file = os.path.expanduser(key_file)
+        self._fernet = self._load_fernet()
+
+    @property
+    def enabled(self) -> bool:
+        return self._fernet is not None
+
+    def _load_fernet(self):
+        try:
+            from cryptography.fernet import Fernet
+        except ImportError:
+            logger.info("未安装 cryptography，不保存浏览器会话快照")
+            return None
+
+        key = os.environ.get(SESSION_KEY_ENV)
+        if key:
+            return Fernet(key.encode())
+        if not os.path.exists(self._key_file):
+            os.makedirs(os.path.dirname(self._key_file), exist_ok=True)
+            fd = os.open(self._key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(Fernet.generate_key())
+            logger.info("已生成会话快照密钥: %s", self._key_file)
+        with open(self._key_file, "rb") as f:
+            return Fernet(f.read().strip())
+
+    def save(self, tab) -> None:
+        """从标签页读取 Cookie 与 localStorage，加密后原子写入快照文件。"""
+        if not self.enabled:
+            return
+        snapshot = {
+            "saved_at": time.time(),
+            "cookies": portable_cookies(tab.cookies(all_domains=True, all_info=True)),
+            "local_storage": _read_local_storage(tab),
+        }
+        token = self._fernet.encrypt(json.dumps(snapshot, ensure_ascii=False).encode("utf-8"))
+
+        dir_name = os.path.dirname(self._filepath) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(token)
+            os.replace(tmp_path, self._filepath)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        logger.info("已保存浏览器会话快照（%d 个 Cookie）", len(snapshot["cookies"]))
+
+    def restore(self, tab) -> bool:
+        """解密快照并把未过期的 Cookie 与 localStorage 写入标签页。无可用快照时返回 False。"""
+        snapshot = self._load()
+        if snapshot is None:
+            return False
+        age = time.time() - snapshot.get("saved_at", 0)
+        if age > SESSION_MAX_AGE:
+            logger.info("会话快照已超过 %d 小时，不再恢复", SESSION_MAX_AGE // 3600)
+            return False
+
+        now = time.time()
+        cookies = [c for c in snapshot.get("cookies", []) if c.get("expires", now + 1) > now]
+        if cookies:
+            tab.set.cookies(cookies)
+        _write_local_storage(tab, snapshot.get("local_storage", {}))
+        logger.info("已恢复浏览器会话快照（%d 个 Cookie，%.0f 分钟前保存）", len(cookies), age / 60)
+        return True
+
+    def _load(self) -> dict | None:
+        if not self.enabled or not os.path.exists(self._filepath):
+            return None
+        from cryptography.fernet import InvalidToken
+
+        try:
+            with open(self._filepath, "rb") as f:
+                return json.loads(self._fernet.decrypt(f.read()))
+        except (InvalidToken, ValueError, IOError):
+            logger.warning("会话快照无法解密或已损坏，忽略: %s", self._filepath)
+            return None
+
+
+def _storage_id(origin: str) -> dict:
+    return {"securityOrigin": origin, "isLocalStorage": True}
+
+
+def _read_local_storage(tab) -> dict[str, dict[str, str]]:
+    storage: dict[str, dict[str, str]] = {}
+    try:
+        tab.run_cdp("DOMStorage.enable")
+    except Exception as e:
+        logger.debug("启用 DOMStorage 失败: %s", e)
+        return storage
+    for origin in STORAGE_ORIGINS:
+        try:
+            entries = tab.run_cdp("DOMStorage.getDOMStorageItems", storageId=_storage_id(origin))["entries"]
+        except Exception as e:
+            logger.debug("读取 localStorage 失败 (%s): %s", origin, e)
+            continue
+        if entries:
+            storage[origin] = {k: v for k, v in entries}
+    return storage
+
+
+# 在目标站点的文档创建时写入 localStorage（已有的键不覆盖，每个站点只写一次）。恢复时各站点
+# 尚未加载，DOMStorage.setDOMStorageItem 对未打开过的 origin 不生效，因此改为注入脚本。
+_RESTORE_STORAGE_JS = """
+(() => {
+    const items = %s[location.origin];
+    if (!items) return;
+    try {
+        if (sessionStorage.getItem('__cnkiStorageRestored')) return;
+        sessionStorage.setItem('__cnkiStorageRestored', '1');
+        for (const [key, value] of Object.entries(items)) {
+            if (localStorage.getItem(key) === null) localStorage.setItem(key, value);
+        }
+    } catch (e) {}
+})();
+"""
+
+
+def _write_local_storage(tab, storage: dict[str, dict[str, str]]) -> None:
+    if not storage:
+        return
+    source = _RESTORE_STORAGE_JS % json.dumps(storage, ensure_ascii=False)
+    try:
+        tab.run_cdp("Page.addScriptToEvaluateOnNewDocument", source=source)
+    except Exception as e:
+        logger.debug("注入 localStorage 恢复脚本失败: %s", e)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from cnki_crawler.article import DETAIL_FIELDS, parse_article_detail
+
+FIXTURES = Path(__file__).parent / "fixtures"
+ABSTRACT = '面向"人工智能+"行动，高质量数据集成为关键基础设施。图书馆可在数据治理、标注与服务中发挥作用。'
+
+
+@pytest.fixture
+def detail_html() -> str:
+    return (FIXTURES / "detail.html").read_text(encoding="utf-8")
+
+
+def test_parse_full_page(detail_html):
+    detail = parse_article_detail(detail_html)
+    assert detail == {
+        "title": '"人工智能+"背景下的高质量数据集建设：图书馆的机遇与挑战',
+        "authors": ["张晓林", "李 明"],
+        "institutions": ["上海科技大学", "中国科学院文献情报中心"],
+        "abstract": ABSTRACT,
+        "keywords": ["人工智能+", "高质量数据集", "图书馆"],
+        "funds": ['国家社会科学基金重大项目"数据要素与图书馆"(项目编号:23&ZD224)的研究成果'],
+        "clc_code": "TP18;TP311.13;G250.7",
+    }
+
+
+@pytest.mark.parametrize("field", DETAIL_FIELDS)
+def test_single_field_matches_full_parse(detail_html, field):
+    assert parse_article_detail(detail_html, [field]) == {field: parse_article_detail(detail_html)[field]}
+
+
+@pytest.mark.parametrize("tag", ["span", "div"])
+def test_abstract_any_tag(detail_html, tag):
+    html = detail_html.replace('<p id="ChDivSummary" name="ChDivSummary">', f"<{tag} id='ChDivSummary'>")
+    html = html.replace("发挥作用。</p>", f"发挥作用。</{tag}>")
+    assert parse_article_detail(html, ["abstract"]) == {"abstract": ABSTRACT}
+
+
+def test_single_quoted_class(detail_html):
+    html = detail_html.replace('<p class="keywords">', "<p class='keywords'>")
+    assert parse_article_detail(html, ["keywords"])["keywords"] == ["人工智能+", "高质量数据集", "图书馆"]
+
+
+def test_missing_region_falls_back_to_full_page(detail_html):
+    # 标题区结构变化（class 改名）时仍能从整页解析出其余字段
+    html = detail_html.replace("class='wx-tit'", "class='wx-title'")
+    detail = parse_article_detail(html, ["abstract", "keywords", "title"])
+    assert detail["abstract"] == ABSTRACT
+    assert detail["keywords"] == ["人工智能+", "高质量数据集", "图书馆"]
+    assert detail["title"] == ""
+
+
+def test_missing_optional_region_skips_full_parse(detail_html, monkeypatch):
+    import cnki_crawler.article as article
+
+    start = detail_html.index('<div class="row">\n        <span class="rowtit">基金资助')
+    end = detail_html.index("</div>", start) + len("</div>")
+    html = detail_html[:start] + detail_html[end:]
+    parsed = []
+
+    def recording_soup(markup, *args):
+        parsed.append(markup)
+        return BeautifulSoup(markup, *args)
+
+    monkeypatch.setattr(article, "BeautifulSoup", recording_soup)
+
+    detail = parse_article_detail(html)
+    assert detail["funds"] == []
+    assert detail["abstract"] == ABSTRACT
+    assert detail["clc_code"] == "TP18;TP311.13;G250.7"
+    # 只解析截取的区域片段，不含页面其余部分
+    [markup] = parsed
+    assert "<head>" not in markup and "toggleSummary" not in markup
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import pytest
+
+import cnki_crawler.main as main_module
+from cnki_crawler.daemon import CrawlDaemon
+from cnki_crawler.exporter import load_failed_items
+from cnki_crawler.retry import RetryItem
+
+
+def test_submit_rejects_bad_budget():
+    daemon = CrawlDaemon("127.0.0.1", 0)
+    with pytest.raises(ValueError):
+        daemon.submit({"years": "2025", "budget": "3x"})
+    assert daemon.list_jobs() == []
+
+
+def test_run_job_uses_payload_paths_and_retry_options(tmp_path, monkeypatch):
+    captured = {}
+
+    def fake_load_journals(csv_path, registry_path, pykm_cache):
+        captured.update(csv_path=csv_path, registry_path=registry_path, pykm_cache=pykm_cache)
+        return []
+
+    monkeypatch.setattr(main_module, "load_journals", fake_load_journals)
+    monkeypatch.setattr(main_module, "crawl", lambda *args, **kwargs: captured.update(kwargs))
+    daemon = CrawlDaemon("127.0.0.1", 0)
+    monkeypatch.setattr(daemon, "_ensure_browser", lambda: None)
+
+    daemon._run_job({
+        "years": "2025",
+        "journals_csv": str(tmp_path / "journals.csv"),
+        "registry_file": str(tmp_path / "registry.json"),
+        "pykm_cache": str(tmp_path / "paper_urls.json"),
+        "failed_file": str(tmp_path / "dead.json"),
+        "max_attempts": 1,
+        "retry_delay": 0,
+    })
+
+    assert captured["registry_path"] == str(tmp_path / "registry.json")
+    assert captured["pykm_cache"] == str(tmp_path / "paper_urls.json")
+    queue = captured["retry_queue"]
+    queue.push(RetryItem(
+        journal="图书馆杂志", pykm="TSGJ", year="2025", issue="01", title="论文甲",
+        url="https://kns.cnki.net/a", filename="TSGJ202501001",
+    ), "超时")  # max_attempts=1：首次失败即进入死信
+    assert len(queue) == 0
+    queue.flush_dead_letters()
+    assert [d["title"] for d in load_failed_items(str(tmp_path / "dead.json"))] == ["论文甲"]
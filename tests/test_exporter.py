@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import csv
+import json
+
+import pytest
+
+from cnki_crawler.exporter import export_csv, export_json, export_normalized, load_normalized
+from cnki_crawler.models import ARTICLE_FIELDS, ArticleRecord
+
+
+@pytest.fixture
+def records() -> list[ArticleRecord]:
+    return [
+        ArticleRecord(
+            journal="图书馆杂志", pykm="TSGJ", year="2025", issue="01", title="论文甲",
+            url="https://kns.cnki.net/a", filename="TSGJ202501001", authors=("张三", "李四"),
+            institutions=("上海图书馆",), abstract="摘要", keywords=("数字人文",),
+            funds=("国家社会科学基金",), clc_code="G250", column="研究论文", pages="4-12",
+            detail_crawled=True,
+        ),
+        ArticleRecord(
+            journal="图书馆杂志", pykm="TSGJ", year="2025", issue="01", title="论文乙",
+            url="https://kns.cnki.net/b", authors=("李四",), column="综述",
+        ),
+    ]
+
+
+def test_json_and_csv_include_list_fields(tmp_path, records):
+    path = export_json(records, "图书馆杂志", "TSGJ", "2025", str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        articles = json.load(f)["articles"]
+    assert [(a["column"], a["pages"]) for a in articles] == [("研究论文", "4-12"), ("综述", "")]
+
+    path = export_csv(records, str(tmp_path))
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == list(ARTICLE_FIELDS)
+    assert (rows[0]["column"], rows[0]["pages"], rows[0]["authors"]) == ("研究论文", "4-12", "张三;李四")
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_normalized_round_trip(tmp_path, records, compress):
+    path = export_normalized(records, str(tmp_path), compress=compress)
+    loaded = list(load_normalized(path))
+    expected = [
+        {name: list(v) if isinstance(v, tuple) else v for name in ARTICLE_FIELDS for v in [getattr(r, name)]}
+        for r in records
+    ]
+    assert [a.to_dict() for a in loaded] == expected
+
+
+def test_legacy_pages_extra_becomes_field():
+    record = ArticleRecord.from_dict({"title": "论文甲", "pages": "4-12", "doi": "10.1/x"})
+    assert record.pages == "4-12"
+    assert record.extra == {"doi": "10.1/x"}
+    assert record.to_dict()["pages"] == "4-12"
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from cnki_crawler.article import EXTRACT_JS, parse_article_detail
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="module")
+def tab():
+    """无头 Chromium 标签页；可用环境变量 CHROME_PATH 指定浏览器，无法启动时跳过。"""
+    drission = pytest.importorskip("DrissionPage")
+    opts = drission.ChromiumOptions(read_file=False)
+    opts.auto_port()
+    opts.headless(True)
+    opts.set_argument("--no-sandbox")
+    if os.environ.get("CHROME_PATH"):
+        opts.set_browser_path(os.environ["CHROME_PATH"])
+    try:
+        browser = drission.Chromium(opts)
+    except Exception as e:
+        pytest.skip(f"无法启动 Chromium: {e}")
+    yield browser.latest_tab
+    browser.quit()
+
+
+def test_js_extractor_matches_html_parser(tab):
+    from cnki_crawler.browser import CAPTCHA_HTML_INDICATORS, CAPTCHA_URL_INDICATORS
+
+    path = FIXTURES / "detail.html"
+    tab.get(path.as_uri())
+    result = json.loads(tab.run_js(EXTRACT_JS, list(CAPTCHA_URL_INDICATORS), list(CAPTCHA_HTML_INDICATORS)))
+
+    assert result["captcha"] is False
+    assert result["complete"] is True
+    assert result["detail"] == parse_article_detail(path.read_text(encoding="utf-8"))
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from cnki_crawler.intercept import CAPTCHA_HOSTS, InterceptProfile, TrafficStats
+
+
+def test_traffic_by_host_and_kind():
+    stats = TrafficStats()
+    stats.add([
+        ["https://kns.cnki.net/kcms2/article/abstract?v=1", "document", 40960],
+        ["https://kns.cnki.net/static/app.css", "link", 10240],
+        ["https://hm.baidu.com/hm.js", "script", 2048],
+    ])
+    assert stats.requests["kns.cnki.net", "document"] == 1
+    assert stats.bytes["hm.baidu.com", "script"] == 2048
+    assert stats.summary()[0].startswith("kns.cnki.net: 2 个请求，50 KB")
+
+
+def test_navigation_timing_skips_phases_not_reached():
+    stats = TrafficStats()
+    assert stats.timing_summary() is None
+    stats.add([], [120.0, 300.0, 900.0])
+    stats.add([], [80.0, 200.0, 0])
+    stats.add([], None)
+    assert stats.timing_pages == {"response": 2, "domcontentloaded": 2, "load": 1}
+    assert stats.timing_summary() == (
+        "response 100 ms（2 个页面），domcontentloaded 250 ms（2 个页面），load 900 ms（1 个页面）"
+    )
+
+
+def test_profile_never_blocks_captcha_hosts():
+    profile = InterceptProfile("custom", {"*.qq.com": ["*"], "*.cnki.net": ["font"]})
+    assert all("qq.com" not in p for p in profile.patterns)
+    assert "*://*.cnki.net/*.woff2" in profile.patterns
+    assert profile.allow == CAPTCHA_HOSTS
+
+
+def test_unknown_resource_class():
+    with pytest.raises(ValueError):
+        InterceptProfile("bad", {"*.cnki.net": ["video"]})
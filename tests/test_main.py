@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import asdict
+
+import pytest
+
+import cnki_crawler.main as main_module
+from cnki_crawler.exporter import load_failed_items, save_failed_items
+from cnki_crawler.main import _record_failure, retry_failed
+from cnki_crawler.models import ArticleRecord
+from cnki_crawler.progress import CrawlProgress
+from cnki_crawler.retry import RetryItem, RetryQueue
+
+
+def test_record_failure_keeps_listed_fields(tmp_path):
+    progress = CrawlProgress(str(tmp_path / "progress.json"))
+    progress.ensure_journal("TSGJ", "图书馆杂志")
+    progress.add_listed_articles("TSGJ", [ArticleRecord(
+        journal="图书馆杂志", pykm="TSGJ", year="2025", issue="01", title="论文甲",
+        url="https://kns.cnki.net/a", filename="TSGJ202501001", authors=("张三", "李四"),
+        column="研究论文", pages="4-12",
+    )])
+    queue = RetryQueue(dead_letter_path=str(tmp_path / "failed.json"))
+
+    _record_failure(progress, queue, RetryItem(
+        journal="图书馆杂志", pykm="TSGJ", year="2025", issue="01", title="论文甲",
+        url="https://kns.cnki.net/a", filename="TSGJ202501001", column="研究论文", pages="4-12",
+    ), "超时")
+
+    [record] = progress.get_articles("TSGJ")
+    assert record.authors == ("张三", "李四")
+    assert (record.pages, record.column, record.crawl_error) == ("4-12", "研究论文", "超时")
+    assert not record.detail_crawled
+    assert len(queue) == 1
+    progress.close()
+
+
+def test_record_failure_without_existing_record(tmp_path):
+    progress = CrawlProgress(str(tmp_path / "progress.json"))
+    progress.ensure_journal("TSGJ", "图书馆杂志")
+    queue = RetryQueue(dead_letter_path=str(tmp_path / "failed.json"))
+
+    _record_failure(progress, queue, RetryItem(
+        journal="图书馆杂志", pykm="TSGJ", year="2025", issue="01", title="论文甲",
+        url="https://kns.cnki.net/a", pages="4-12",
+    ), "超时")
+
+    [record] = progress.get_articles("TSGJ")
+    assert (record.title, record.pages, record.crawl_error) == ("论文甲", "4-12", "超时")
+    assert record.updated_at
+    progress.close()
+
+
+def _item(n: int) -> RetryItem:
+    return RetryItem(
+        journal="图书馆杂志", pykm="TSGJ", year="2025", issue="01", title=f"论文{n}",
+        url=f"https://kns.cnki.net/{n}", filename=f"TSGJ20250100{n}",
+    )
+
+
+def test_cli_retry_options_reach_crawl(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "journals.csv").write_text(
+        "source,url\n图书馆杂志,https://navi.cnki.net/knavi/detail?p=x\n", encoding="utf-8",
+    )
+    captured = {}
+    monkeypatch.setattr(main_module, "crawl", lambda *args, **kwargs: captured.update(kwargs))
+    monkeypatch.setattr(sys, "argv", [
+        "cnki_crawler", "--year", "2025", "--max-attempts", "2", "--retry-delay", "0",
+        "--failed-file", "dead.json",
+    ])
+    main_module.main()
+
+    queue = captured["retry_queue"]
+    item = _item(1)
+    queue.push(item, "超时")
+    assert queue.pop_due() == [item]  # --retry-delay 0
+    queue.push(item, "超时")  # 第 2 次失败即达到 --max-attempts
+    assert len(queue) == 0
+    queue.flush_dead_letters()
+    assert [d["title"] for d in load_failed_items(str(tmp_path / "dead.json"))] == ["论文1"]
+
+
+class _Client:
+    submitted: list[dict] = []
+
+    def __init__(self, base_url):
+        pass
+
+    def submit(self, payload):
+        self.submitted.append(payload)
+        return {"id": "job-1", "queued_ahead": 0}
+
+
+def test_daemon_payload_uses_client_paths_and_retry_options(tmp_path, monkeypatch):
+    import cnki_crawler.client as client_module
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(client_module, "DaemonClient", _Client)
+    monkeypatch.setattr(_Client, "submitted", [])
+    monkeypatch.setattr(sys, "argv", [
+        "cnki_crawler", "--year", "2025", "--daemon", "http://127.0.0.1:8765", "--detach",
+        "--max-attempts", "5", "--retry-delay", "10", "--failed-file", "dead.json", "--budget", "2h",
+    ])
+    main_module.main()
+
+    [payload] = _Client.submitted
+    for key in ("journals_csv", "output_dir", "progress_file", "registry_file", "pykm_cache"):
+        assert payload[key].startswith(str(tmp_path))
+    assert payload["failed_file"] == str(tmp_path / "dead.json")
+    assert (payload["max_attempts"], payload["retry_delay"], payload["budget"]) == (5, 10.0, "2h")
+
+
+def test_daemon_rejects_bad_budget_before_submit(monkeypatch):
+    import cnki_crawler.client as client_module
+
+    monkeypatch.setattr(client_module, "DaemonClient", _Client)
+    monkeypatch.setattr(_Client, "submitted", [])
+    monkeypatch.setattr(sys, "argv", [
+        "cnki_crawler", "--year", "2025", "--daemon", "http://127.0.0.1:8765", "--budget", "3x",
+    ])
+    with pytest.raises(SystemExit):
+        main_module.main()
+    assert _Client.submitted == []
+
+
+def test_crawl_keeps_empty_retry_queue(tmp_path):
+    # 空 RetryQueue 为假值，crawl 不能把它替换为默认队列
+    path = str(tmp_path / "dead.json")
+    queue = RetryQueue(max_attempts=1, dead_letter_path=path)
+    queue.push(_item(1), "超时")
+    assert not queue
+
+    main_module.crawl(
+        [], {"2025"}, output_dir=str(tmp_path / "output"), browser=object(),
+        progress_file=str(tmp_path / "progress.json"), retry_queue=queue, save_interval=0,
+    )
+    assert [d["title"] for d in load_failed_items(path)] == ["论文1"]
+
+
+class _Browser:
+    is_alive = True
+
+    def __init__(self, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _dead_letters(tmp_path, items) -> str:
+    path = str(tmp_path / "failed.json")
+    save_failed_items([asdict(i) for i in items], path)
+    return path
+
+
+def test_retry_failed_keeps_file_when_browser_fails(tmp_path, monkeypatch):
+    import cnki_crawler.browser
+
+    def fail(**kwargs):
+        raise RuntimeError("浏览器无法启动")
+
+    monkeypatch.setattr(cnki_crawler.browser, "CnkiBrowser", fail)
+    path = _dead_letters(tmp_path, [_item(1), _item(2)])
+    with pytest.raises(RuntimeError):
+        retry_failed(path, output_dir=str(tmp_path / "output"),
+                     progress_file=str(tmp_path / "progress.json"), save_interval=0)
+    assert [d["title"] for d in load_failed_items(path)] == ["论文1", "论文2"]
+
+
+def test_retry_failed_writes_back_unhandled_items(tmp_path, monkeypatch):
+    import cnki_crawler.browser
+
+    monkeypatch.setattr(cnki_crawler.browser, "CnkiBrowser", _Browser)
+    monkeypatch.setattr(main_module, "random_delay", lambda *args: None)
+    fetched = []
+
+    def fetch(browser, journal, pykm, year, issue, paper, next_url=None):
+        fetched.append(paper["title"])
+        if paper["title"] == "论文3":
+            raise KeyboardInterrupt
+        return {"journal": journal, "pykm": pykm, "year": year, "issue": issue, "title": paper["title"],
+                "url": paper["url"], "filename": paper["filename"], "detail_crawled": True}
+
+    monkeypatch.setattr(main_module, "_fetch_article", fetch)
+    progress_file = str(tmp_path / "progress.json")
+    progress = CrawlProgress(progress_file)
+    progress.ensure_journal("TSGJ", "图书馆杂志")
+    # 论文 2 已在之后的正常运行中爬取成功，死信文件未清理
+    progress.add_article("TSGJ", {**asdict(_item(2)), "detail_crawled": True})
+    progress.close()
+
+    path = _dead_letters(tmp_path, [_item(n) for n in range(1, 5)])
+    with pytest.raises(KeyboardInterrupt):
+        retry_failed(path, output_dir=str(tmp_path / "output"), progress_file=progress_file, save_interval=0)
+
+    assert fetched == ["论文1", "论文3"]
+    assert [d["title"] for d in load_failed_items(path)] == ["论文3", "论文4"]
+
+
+def test_drain_retries_stops_at_deadline(tmp_path):
+    progress = CrawlProgress(str(tmp_path / "progress.json"))
+    queue = RetryQueue(base_delay=60, dead_letter_path=str(tmp_path / "dead.json"))
+    queue.push(_item(1), "超时")
+    queue.push(_item(2), "超时")
+
+    started = time.monotonic()
+    main_module._drain_retries(_Browser(), progress, queue, deadline=started + 5)
+    # 下一篇要 60 秒后才重试，超出预算：不等待，条目留在队列中
+    assert time.monotonic() - started < 1
+    assert len(queue) == 2
+
+    main_module._drain_retries(_Browser(), progress, queue, deadline=started - 1)
+    assert len(queue) == 2
+    progress.close()
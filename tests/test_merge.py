@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+
+import cnki_crawler.merge as merge_module
+from cnki_crawler.merge import merge_progress
+
+
+def _article(filename: str, title: str, detail_crawled: bool = False, updated_at: str = "") -> dict:
+    return {
+        "journal": "图书馆杂志", "pykm": "TSGJ", "year": "2025", "issue": "01",
+        "title": title, "url": f"https://kns.cnki.net/{filename}", "filename": filename,
+        "abstract": "摘要" * 40, "detail_crawled": detail_crawled, "updated_at": updated_at,
+    }
+
+
+def _write(path, completed: list[str], articles: list[dict]) -> str:
+    path.write_text(json.dumps({
+        "target_years": ["2025"],
+        "journals": {"TSGJ": {"name": "图书馆杂志", "completed_issues": completed, "articles": articles}},
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    return str(path)
+
+
+def test_merge_across_chunks(tmp_path, monkeypatch):
+    # 缩小读取块，使每条论文记录都跨越多个块边界
+    monkeypatch.setattr(merge_module, "_CHUNK", 7)
+    first = _write(tmp_path / "a.json", ["2025-01"], [
+        _article("A1", "详情优先", detail_crawled=True, updated_at="2025-01-01"),
+        _article("A2", "较新", updated_at="2025-03-01"),
+        _article("A3", "先给出"),
+        _article("A4", "仅在第一个文件"),
+    ])
+    second = _write(tmp_path / "b.json", ["2025-02", "2025-01"], [
+        _article("A1", "未爬详情", updated_at="2025-05-01"),
+        _article("A2", "较旧", updated_at="2025-02-01"),
+        _article("A3", "后给出"),
+    ])
+    dest = tmp_path / "merged.json"
+
+    stats = merge_progress([first, second], str(dest))
+
+    assert (stats["articles_in"], stats["articles_out"], stats["duplicates"]) == (7, 4, 3)
+    journal = json.loads(dest.read_text(encoding="utf-8"))["journals"]["TSGJ"]
+    assert journal["completed_issues"] == ["2025-01", "2025-02"]
+    titles = {a["filename"]: a["title"] for a in journal["articles"]}
+    assert titles == {"A1": "详情优先", "A2": "较新", "A3": "后给出", "A4": "仅在第一个文件"}
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from cnki_crawler.models import ArticleRecord
+from cnki_crawler.progress import CrawlProgress
+
+
+def _progress(tmp_path) -> CrawlProgress:
+    progress = CrawlProgress(str(tmp_path / "progress.json"))
+    progress.ensure_journal("TSGJ", "图书馆杂志")
+    return progress
+
+
+def _legacy(title: str, url: str) -> ArticleRecord:
+    return ArticleRecord(journal="图书馆杂志", year="2024", issue="01", title=title, url=url, detail_crawled=True)
+
+
+def test_backfill_replaces_records(tmp_path):
+    progress = _progress(tmp_path)
+    progress.add_article("TSGJ", _legacy("论文甲", "https://kns.cnki.net/old-a"))
+    progress.add_article("TSGJ", _legacy("论文乙", "https://kns.cnki.net/old-b"))
+    before = list(progress.get_articles("TSGJ"))
+
+    filled = progress.backfill_filenames("TSGJ", "2024", "01", [
+        {"filename": "TSGJ202401001", "title": "论文甲", "url": "https://kns.cnki.net/new-a"},
+        {"filename": "TSGJ202401002", "title": "论文乙", "url": "https://kns.cnki.net/new-b"},
+    ])
+
+    after = progress.get_articles("TSGJ")
+    assert filled == 2
+    assert [a.filename for a in after] == ["TSGJ202401001", "TSGJ202401002"]
+    # 旧对象不被原地修改（后台写线程的快照可能仍引用它们）
+    assert [a.filename for a in before] == ["", ""]
+    assert progress.is_article_crawled("TSGJ", "TSGJ202401001")
+    progress.close()
+
+
+def test_backfill_url_match_consumes_title(tmp_path):
+    progress = _progress(tmp_path)
+    progress.add_article("TSGJ", _legacy("卷首语", "https://kns.cnki.net/a"))
+
+    filled = progress.backfill_filenames("TSGJ", "2024", "01", [
+        {"filename": "TSGJ202401001", "title": "卷首语", "url": "https://kns.cnki.net/a"},
+        {"filename": "TSGJ202401009", "title": "卷首语", "url": "https://kns.cnki.net/z"},
+    ])
+
+    assert filled == 1
+    assert [a.filename for a in progress.get_articles("TSGJ")] == ["TSGJ202401001"]
+    progress.close()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cnki_crawler.proxy import EWMA_ALPHA, MIN_SAMPLES, ProxyPool
+
+PROBE_URL = "http://probe.invalid/knavi/"
+
+
+class _ProxyStandIn:
+    """本地 HTTP 代理替身：对任意绝对 URL 的 GET 返回 status；gate 未放行前阻塞响应。"""
+
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.entered.set()
+                stand_in.gate.wait(10)
+                self.send_response(stand_in.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.gate.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    server = _ProxyStandIn()
+    yield server
+    server.close()
+
+
+def _quarantine(pool: ProxyPool, proxy: str) -> None:
+    for _ in range(MIN_SAMPLES):
+        pool.record(proxy, error=True)
+    assert not pool.healthy(proxy)
+
+
+def test_flag_captcha_amends_last_sample():
+    flagged = ProxyPool([("http://a", None)])
+    flagged.record("http://a", latency=1.0)
+    flagged.flag_captcha("http://a")
+
+    direct = ProxyPool([("http://a", None)])
+    direct.record("http://a", latency=1.0, captcha=True)
+
+    assert flagged.stats() == direct.stats()
+    assert flagged.stats()[0]["requests"] == 1
+    assert flagged.stats()[0]["captcha_rate"] == pytest.approx(EWMA_ALPHA)
+
+
+def test_batched_requests_count_against_budget():
+    pool = ProxyPool([("http://a", 3)])
+    pool.record("http://a", latency=0.5, requests=2)
+    assert pool.budget_wait("http://a") == 0
+    pool.record("http://a", latency=0.5)
+    assert pool.budget_wait("http://a") > 0
+    assert pool.stats()[0]["requests"] == 3
+
+
+def test_retest_restores_proxy_without_holding_lock(stand_in):
+    pool = ProxyPool([(stand_in.url, None)], quarantine=0.05, probe_url=PROBE_URL)
+    _quarantine(pool, stand_in.url)
+    time.sleep(0.1)
+
+    stand_in.gate.clear()
+    result = {}
+    worker = threading.Thread(target=lambda: result.setdefault("proxy", pool.acquire("w1")))
+    worker.start()
+    assert stand_in.entered.wait(5)
+
+    # 探测进行中：其他调用不被阻塞，代理仍视为隔离
+    started = time.monotonic()
+    assert not pool.healthy(stand_in.url)
+    pool.stats()
+    assert time.monotonic() - started < 1
+
+    stand_in.gate.set()
+    worker.join(5)
+    assert result["proxy"] == stand_in.url
+    assert pool.healthy(stand_in.url)
+    assert pool.stats()[0]["requests"] == 0
+
+
+def test_failed_retest_extends_quarantine(stand_in):
+    stand_in.status = 502
+    pool = ProxyPool([(stand_in.url, None)], quarantine=0.05, probe_url=PROBE_URL)
+    _quarantine(pool, stand_in.url)
+    time.sleep(0.1)
+
+    assert pool.acquire("w1") is None
+    assert stand_in.entered.is_set()
+    assert not pool.healthy(stand_in.url)
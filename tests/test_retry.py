@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict
+
+from cnki_crawler.exporter import load_failed_items, save_failed_items
+from cnki_crawler.retry import RetryItem, RetryQueue, load_dead_letters
+
+
+def _item(n: int, issue: str = "01") -> RetryItem:
+    return RetryItem(
+        journal="图书馆杂志", pykm="TSGJ", year="2025", issue=issue, title=f"论文{n}",
+        url=f"https://kns.cnki.net/{n}", filename=f"TSGJ2025{issue}00{n}",
+    )
+
+
+def _queue(tmp_path, **kwargs) -> RetryQueue:
+    return RetryQueue(dead_letter_path=str(tmp_path / "failed.json"), **kwargs)
+
+
+def test_backoff_doubles_per_attempt(tmp_path):
+    queue = _queue(tmp_path, max_attempts=5, base_delay=0.05)
+    item = _item(1)
+    queue.push(item, "超时")
+    assert queue.pop_due() == []
+    time.sleep(0.06)
+    assert queue.pop_due() == [item]
+
+    # 第 2 次失败等待 0.1 秒
+    queue.push(item, "超时")
+    time.sleep(0.06)
+    assert queue.pop_due() == []
+    time.sleep(0.05)
+    assert queue.pop_due() == [item]
+    assert (item.attempts, item.last_error) == (2, "超时")
+
+
+def test_pop_next_waits_in_due_order(tmp_path):
+    queue = _queue(tmp_path, base_delay=0.05)
+    first, second = _item(1), _item(2)
+    second.attempts = 1  # 再失败一次后等待 0.1 秒
+    queue.push(second, "超时")
+    queue.push(first, "超时")
+
+    started = time.monotonic()
+    assert queue.pop_next() is first
+    assert time.monotonic() - started >= 0.04
+    assert queue.pop_next() is second
+    assert queue.pop_next() is None
+
+
+def test_dead_letter_after_max_attempts(tmp_path):
+    queue = _queue(tmp_path, max_attempts=2, base_delay=0)
+    item = _item(1)
+    queue.push(item, "超时")
+    queue.push(queue.pop_due()[0], "验证码")
+    assert len(queue) == 0
+
+    queue.flush_dead_letters()
+    [dead] = load_failed_items(str(tmp_path / "failed.json"))
+    assert (dead["title"], dead["attempts"], dead["last_error"]) == ("论文1", 2, "验证码")
+
+
+def test_settle_issue_waits_for_outstanding_and_dead(tmp_path):
+    queue = _queue(tmp_path, max_attempts=2, base_delay=0)
+    queue.defer_issue("TSGJ", "2025_01")
+    queue.push(_item(1), "超时")
+    assert not queue.settle_issue("TSGJ", "2025_01")
+    queue.pop_due()
+    assert queue.settle_issue("TSGJ", "2025_01")
+    assert not queue.settle_issue("TSGJ", "2025_01")
+
+    queue.defer_issue("TSGJ", "2025_02")
+    dead = _item(2, issue="02")
+    dead.attempts = 1
+    queue.push(dead, "超时")
+    assert not queue.settle_issue("TSGJ", "2025_02")
+
+
+def test_flush_merges_queued_and_existing(tmp_path):
+    path = str(tmp_path / "failed.json")
+    save_failed_items([asdict(_item(1)), asdict(_item(2))], path)
+    queue = _queue(tmp_path, base_delay=60)
+    queue.push(_item(2), "超时")
+    queue.push(_item(3), "超时")
+    queue.flush_dead_letters()
+
+    items = load_dead_letters(path)
+    assert [i.title for i in items] == ["论文1", "论文2", "论文3"]
+    assert all(i.attempts == 0 for i in items)
+    assert items[1].last_error == "超时"
+
+
+def test_flush_replace_keeps_pending(tmp_path):
+    path = str(tmp_path / "failed.json")
+    save_failed_items([asdict(_item(n)) for n in (1, 2, 3)], path)
+    queue = _queue(tmp_path, max_attempts=1)
+    queue.push(_item(3), "验证码")
+    queue.flush_dead_letters(replace=True, pending=[_item(2), _item(3)])
+
+    dead = load_failed_items(path)
+    assert [d["title"] for d in dead] == ["论文2", "论文3"]
+    assert dead[1]["last_error"] == "验证码"
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import cnki_crawler.scheduler as scheduler_module
+from cnki_crawler.models import JournalInfo
+from cnki_crawler.scheduler import (
+    DEFAULT_ARTICLE_COST,
+    DEFAULT_UNIT_OVERHEAD,
+    CrawlScheduler,
+    WorkUnit,
+    format_duration,
+    parse_duration,
+)
+
+
+def _unit(pykm: str, year: str, issue: str, seq: int, expected: float = 10) -> WorkUnit:
+    journal = JournalInfo(name=pykm, url="", pykm=pykm)
+    return WorkUnit(journal, pykm, year, issue, issue_id="", value=f"{year}_{issue}", seq=seq, expected=expected)
+
+
+@pytest.fixture
+def units() -> list[WorkUnit]:
+    return [
+        _unit("A", "2024", "01", 0, expected=5),
+        _unit("A", "2025", "01", 1, expected=20),
+        _unit("A", "2025", "02", 2, expected=10),
+        _unit("B", "2024", "06", 3, expected=30),
+        _unit("B", "2025", "03", 4, expected=1),
+    ]
+
+
+def _order(scheduler: CrawlScheduler) -> list[int]:
+    return [u.seq for u in scheduler]
+
+
+@pytest.mark.parametrize("order, expected", [
+    ("sequential", [0, 1, 2, 3, 4]),
+    ("newest", [4, 2, 1, 3, 0]),
+    ("yield", [3, 1, 2, 0, 4]),
+    ("round-robin", [0, 3, 1, 4, 2]),
+])
+def test_orders(units, order, expected):
+    assert _order(CrawlScheduler(list(reversed(units)), order=order)) == expected
+
+
+def test_extend_keeps_executed_units(units):
+    scheduler = CrawlScheduler(units[:2], order="newest")
+    assert _order(scheduler) == [1, 0]
+    scheduler.extend(units[2:])
+    assert _order(scheduler) == [4, 2, 3]
+    assert len(scheduler) == 5
+
+
+def test_unknown_order():
+    with pytest.raises(ValueError):
+        CrawlScheduler([], order="random")
+
+
+def test_budget_stops_at_unit_boundary(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(scheduler_module, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    # 每单元预计 4 + 7 × 10 = 74 秒；预算 100 秒时第一个单元用去 60 秒后不够再开始下一个
+    scheduler = CrawlScheduler([_unit("A", "2025", f"{i:02d}", i) for i in range(3)], budget=100)
+    executed = []
+    for unit in scheduler:
+        executed.append(unit.seq)
+        clock[0] += 60
+    assert executed == [0]
+    assert scheduler.stopped_by_budget
+
+
+def test_budget_counts_from_started():
+    scheduler = CrawlScheduler([_unit("A", "2025", "01", 0)], budget=100, started=time.monotonic() - 50)
+    assert _order(scheduler) == []
+    assert scheduler.stopped_by_budget
+
+
+def test_eta_and_cost_model(units):
+    scheduler = CrawlScheduler(units)
+    expected_total = sum(u.expected for u in units)
+    assert scheduler.eta() == pytest.approx(5 * DEFAULT_UNIT_OVERHEAD + DEFAULT_ARTICLE_COST * expected_total)
+
+    iterator = iter(scheduler)
+    first = next(iterator)
+    # 5 篇共 4 + 5 × 3 秒：每篇代价向 3 秒靠拢
+    scheduler.record(first, DEFAULT_UNIT_OVERHEAD + 15, 5)
+    assert scheduler.estimate(units[1]) < DEFAULT_UNIT_OVERHEAD + DEFAULT_ARTICLE_COST * 20
+
+    # 列表请求（0 篇）只更新单元开销
+    before = scheduler.estimate(units[1])
+    scheduler.record(next(iterator), DEFAULT_UNIT_OVERHEAD + 10, 0)
+    assert scheduler.estimate(units[1]) == pytest.approx(before + 3)
+
+
+def test_retry_deadline():
+    assert CrawlScheduler([]).retry_deadline is None
+    scheduler = CrawlScheduler([], budget=600, started=1000.0)
+    assert scheduler.retry_deadline == pytest.approx(1600 - DEFAULT_ARTICLE_COST)
+
+
+@pytest.mark.parametrize("text, seconds", [
+    ("3h", 10800), ("90m", 5400), ("1h30m", 5400), ("45s", 45), ("120", 120), (" 2H ", 7200),
+])
+def test_parse_duration(text, seconds):
+    assert parse_duration(text) == seconds
+
+
+@pytest.mark.parametrize("text", ["", "3d", "1h 30m", "h"])
+def test_parse_duration_rejects(text):
+    with pytest.raises(ValueError):
+        parse_duration(text)
+
+
+def test_format_duration():
+    assert format_duration(5400) == "1h30m"
+    assert format_duration(75) == "1m15s"
+    assert format_duration(-5) == "0m00s"